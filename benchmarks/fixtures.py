@@ -0,0 +1,261 @@
+# benchmarks/fixtures.py
+"""
+HTML-фикстуры для бенчмарков парсеров.
+
+Два источника страниц:
+  - сохраненные страницы в benchmarks/pages (<тип страницы>_<имя>.html), записанные
+    командой record через прокси рендеринга - в том виде, в котором их получает парсер;
+  - синтетические страницы заданного размера, повторяющие разметку, которую
+    ожидают схемы config/extraction.yaml, с "шумом" вокруг нужных секций.
+
+Запись страниц токена (из корня репозитория):
+    python -m benchmarks.fixtures record --dropstab toncoin --cryptorank toncoin
+"""
+
+import os
+import glob
+import html
+import random
+import argparse
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "pages")
+
+PAGE_KINDS = ("dropstab_vesting", "dropstab_fundraising", "cryptorank_vesting", "cryptorank_ico")
+
+# Число записей (карточек/строк таблиц) на странице для каждого размера
+SIZES = {
+    "small": 10,
+    "medium": 100,
+    "large": 1000,
+}
+
+_VESTING_CARD = (
+    "group space-y-4 rounded-2xl shadow-md hover:bg-gray-100 active:bg-gray-300/50 dark:bg-zinc-800 "
+    "dark:shadow-black dark:hover:bg-zinc-700 dark:active:bg-zinc-500/50"
+)
+_ROUND_CARD = (
+    "group relative flex flex-col gap-y-4 rounded-2xl p-4 shadow-md hover:bg-gray-100 active:bg-gray-200 "
+    "dark:bg-zinc-800 dark:shadow-black dark:hover:bg-zinc-700 dark:active:bg-zinc-600"
+)
+
+
+def _noise(n: int, rnd: random.Random) -> str:
+    """
+    Разметка, не относящаяся к данным (навигация, графики, подвал страницы).
+    """
+    blocks = []
+    for i in range(n):
+        blocks.append(
+            f'<div class="flex items-center gap-2 text-sm"><a href="/coins/c{i}">Coin {i}</a>'
+            f'<span class="text-gray-500">{rnd.randint(1, 999)}.{rnd.randint(0, 99)}%</span>'
+            f'<svg viewBox="0 0 10 10"><path d="M0 0L{i % 10} 10"></path></svg></div>'
+        )
+    return "".join(blocks)
+
+
+def dropstab_vesting(n: int, rnd: random.Random) -> str:
+    cards = [
+        f'<div class="{_VESTING_CARD}"><div class="flex">'
+        f'<span class="truncate text-left text-lg font-bold"> Allocation {i} </span>'
+        f'<span class="font-semibold">{rnd.randint(0, 100)}.{i % 10}%</span>'
+        f'<span class="font-medium text-gray-600 dark:text-zinc-300">of</span>'
+        f'<span class="font-medium text-gray-600 dark:text-zinc-300">{rnd.randint(1, 900)}M</span></div>'
+        f'<div class="text-sm font-semibold">${rnd.randint(1, 99)}.5M</div></div>'
+        for i in range(n)
+    ]
+    return f'<div><header>{_noise(n, rnd)}</header>{"".join(cards)}<footer>{_noise(n, rnd)}</footer></div>'
+
+
+def dropstab_fundraising(n: int, rnd: random.Random) -> str:
+    cards = [
+        f'<div class="{_ROUND_CARD}"><h2> Round {i}</h2><p>'
+        f'<span class="text-gray-900 dark:text-white">Jan {i % 28 + 1}, 2022</span> · '
+        f'<span class="text-gray-900 dark:text-white">${rnd.randint(1, 50)}M</span></p></div>'
+        for i in range(n)
+    ]
+    rows = [
+        f'<tr class="group tableRow"><td>{i}</td><td><a>Fund {i}</a></td>'
+        f'<td>{rnd.randint(1, 4)}</td><td>Venture</td><td>Seed</td></tr>'
+        for i in range(n)
+    ]
+    return (
+        f'<section>{_noise(n, rnd)}{"".join(cards)}'
+        f'<table><tbody>{"".join(rows)}</tbody></table>{_noise(n, rnd)}</section>'
+    )
+
+
+def cryptorank_vesting(n: int, rnd: random.Random) -> str:
+    entries = [
+        f'<div class="sc-2ecfa897-0 e{i}"><p class="sc-56567222-0 t">Unlocked tokens</p>'
+        f'<span class="sc-56567222-0 sc-92cddc74-0"> {rnd.randint(0, 99)}.5% </span>'
+        f'<p class="sc-56567222-0 ebjuzh">{i}M TKN ~ ${i}.2M</p></div>'
+        for i in range(n)
+    ]
+    rows = [
+        f'<tr><td>Allocation {i}</td><td>{i % 100}%</td><td>{i % 50}%</td><td> {100 - i % 100}% </td></tr>'
+        for i in range(n)
+    ]
+    return (
+        f'<section>{_noise(n, rnd)}'
+        f'<div class="sc-2328569c-0 a"><h2>Total Distribution Progress</h2>{"".join(entries)}</div>'
+        f'<div class="sc-2328569c-0 b"><div><h2>Token Allocation</h2></div>'
+        f'<table><thead><tr><td>Name</td></tr></thead><tbody>{"".join(rows)}</tbody></table></div>'
+        f'{_noise(n, rnd)}</section>'
+    )
+
+
+def cryptorank_ico(n: int, rnd: random.Random) -> str:
+    entries = []
+    for i in range(n):
+        platform = '<div class="platform"><p class="jvlrjM">Binance</p></div>' if i % 3 == 0 else ''
+        entries.append(
+            f'<div class="sc-x kDrqot"><p class="a eqjvBs">IEO {i}</p><p class="fxIPVd">Mar {i % 28 + 1}</p>'
+            f'<p class="bYpygy">${rnd.randint(1, 90)}M</p>'
+            f'<div class="priceBox"><p class="jvlrjM">$0.0{i % 10}</p></div>'
+            f'<div class="roiBox"><p class="jvlrjM">{i % 20}x</p></div>'
+            f'<div class="athRoi"><p class="jvlrjM"></p></div>{platform}</div>'
+        )
+    rows = [
+        f'<tr><td><p class="ktClAm">Fund {i}</p></td><td><p class="ktClAm">{i % 3 + 1}</p></td>'
+        f'<td><p class="ktClAm">VC</p></td><td><button> Seed </button><button>A</button></td></tr>'
+        for i in range(n)
+    ]
+    return (
+        f'<section>{_noise(n, rnd)}<div class="sc-1 cards"><div><h2>Funding Rounds</h2></div>{"".join(entries)}</div>'
+        f'<h2>Investors and Backers</h2><div><table><tbody>{"".join(rows)}</tbody></table></div>'
+        f'{_noise(n, rnd)}</section>'
+    )
+
+
+_GENERATORS = {
+    "dropstab_vesting": dropstab_vesting,
+    "dropstab_fundraising": dropstab_fundraising,
+    "cryptorank_vesting": cryptorank_vesting,
+    "cryptorank_ico": cryptorank_ico,
+}
+
+
+def synthetic_page(kind: str, size: str, seed: int = 0) -> str:
+    """
+    Генерирует синтетическую страницу (детерминированно для одного seed).
+
+    Args:
+        kind (str): Тип страницы.
+        size (str): Размер из SIZES.
+        seed (int): Зерно генератора.
+
+    Returns:
+        str: HTML страницы.
+    """
+    return _GENERATORS[kind](SIZES[size], random.Random(seed))
+
+
+def page_kind(path: str):
+    name = os.path.basename(path)
+    for kind in PAGE_KINDS:
+        if name.startswith(kind):
+            return kind
+    return None
+
+
+def load_fixtures(pages_dir: str = PAGES_DIR, sizes: list = None, recorded: bool = True,
+                  synthetic: bool = True) -> list:
+    """
+    Собирает фикстуры: сохраненные страницы и синтетические страницы нужных размеров.
+
+    Args:
+        pages_dir (str): Каталог сохраненных страниц.
+        sizes (list): Размеры синтетических страниц (по умолчанию все SIZES).
+        recorded (bool): Добавлять сохраненные страницы.
+        synthetic (bool): Добавлять синтетические страницы.
+
+    Returns:
+        list of tuple: (имя фикстуры, тип страницы, HTML).
+    """
+    fixtures = []
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html"))) if recorded else []
+    for path in paths:
+        kind = page_kind(path)
+        if kind:
+            with open(path, encoding="utf-8") as f:
+                fixtures.append((f"recorded/{os.path.basename(path)[:-5]}", kind, f.read()))
+
+    if synthetic:
+        for kind in PAGE_KINDS:
+            for size in sizes or SIZES:
+                fixtures.append((f"synthetic/{kind}/{size}", kind, synthetic_page(kind, size)))
+    return fixtures
+
+
+def record(dropstab: str = None, cryptorank: str = None, pages_dir: str = PAGES_DIR) -> list:
+    """
+    Сохраняет страницы токена через прокси рендеринга в каталог фикстур.
+
+    Args:
+        dropstab (str): Идентификатор токена на dropstab.com.
+        cryptorank (str): Идентификатор токена на cryptorank.io.
+        pages_dir (str): Каталог сохраненных страниц.
+
+    Returns:
+        list: Пути записанных файлов.
+    """
+    from src.crypto_crew.tools.get_vesting_tool import DropstabVestingFetcher
+    from src.crypto_crew.tools.get_fundraising_tool import DropstabFundraisingFetcher, CryptoRankFundraisingFetcher
+    from src.crypto_crew.tools.render_proxy import render_page
+    import json
+
+    pages = {}
+    if dropstab:
+        pages[f"dropstab_vesting_{dropstab}"] = lambda: DropstabVestingFetcher().get_html(dropstab)
+        pages[f"dropstab_fundraising_{dropstab}"] = lambda: DropstabFundraisingFetcher().get_html(dropstab)
+    if cryptorank:
+        pages[f"cryptorank_vesting_{cryptorank}"] = lambda: html.unescape(json.loads(render_page(
+            None,
+            {"goto": f"https://cryptorank.io/price/{cryptorank}/vesting", "sel": "#root-container > section",
+             "timeout": 30000},
+            source="cryptorank", page="vesting"
+        )).get("data", ""))
+        pages[f"cryptorank_ico_{cryptorank}"] = lambda: html.unescape(
+            CryptoRankFundraisingFetcher().fetch_fundraising_page(cryptorank)
+        )
+
+    os.makedirs(pages_dir, exist_ok=True)
+    written = []
+    for name, fetch in pages.items():
+        path = os.path.join(pages_dir, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(fetch())
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML-фикстуры для бенчмарков парсеров")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Сохранить страницы токена через прокси рендеринга")
+    record_parser.add_argument("--dropstab", help="Идентификатор токена на dropstab.com")
+    record_parser.add_argument("--cryptorank", help="Идентификатор токена на cryptorank.io")
+    record_parser.add_argument("--pages-dir", default=PAGES_DIR)
+
+    synth_parser = subparsers.add_parser("synthetic", help="Записать синтетические страницы в файлы")
+    synth_parser.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        if not (args.dropstab or args.cryptorank):
+            parser.error("укажите --dropstab и/или --cryptorank")
+        for path in record(args.dropstab, args.cryptorank, args.pages_dir):
+            print(path)
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        for kind in PAGE_KINDS:
+            for size in SIZES:
+                path = os.path.join(args.out, f"{kind}_{size}.html")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(synthetic_page(kind, size))
+                print(path)
+
+
+if __name__ == "__main__":
+    main()
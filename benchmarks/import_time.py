@@ -0,0 +1,165 @@
+# benchmarks/import_time.py
+"""
+Бюджет времени импорта точек входа.
+
+Каждый модуль импортируется в отдельном процессе с `python -X importtime`
+(несколько раз, берется медиана). Отчет показывает суммарное время импорта
+и самые тяжелые пакеты верхнего уровня. Проверяется бюджет в миллисекундах
+и список модулей, которые точка входа не должна загружать при импорте
+(crewai_tools, bs4, pandas и т.д. загружаются только на этапе, где они нужны).
+
+Превышение бюджета или импорт запрещенного модуля - код выхода 1.
+
+Запуск из корня репозитория:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules src.crypto_crew.batch --runs 5 --top 15
+    python -m benchmarks.import_time --budget-scale 2   # медленная машина
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модуль -> (бюджет, мс; модули, которые не должны загружаться при импорте)
+ENTRY_POINTS = {
+    "src.crypto_crew.tools.get_metadata": (
+        300, ("pandas", "crewai", "crewai_tools", "langchain", "langchain_openai", "bs4")
+    ),
+    "src.crypto_crew.batch": (
+        400, ("pandas", "crewai", "crewai_tools", "langchain", "langchain_openai", "bs4")
+    ),
+    "src.crypto_crew.report_store": (80, ("crewai", "pandas")),
+    "src.crypto_crew.tracing": (80, ("crewai", "pandas")),
+    # run_flow/plot_flow: поток (crewai) загружается только после поиска токена
+    "src.crypto_crew.flow_cli": (
+        300, ("pandas", "crewai", "crewai_tools", "langchain", "langchain_openai", "bs4",
+              "src.crypto_crew.workflow")
+    ),
+    # Flow - базовый класс WorkFlow, а crewai/__init__ загружает Agent, Crew и LLM (litellm),
+    # поэтому несколько секунд импорта неизбежны; инструменты и кэш LLM не загружаются
+    "src.crypto_crew.workflow": (
+        7000, ("pandas", "crewai_tools", "langchain_openai", "bs4", "src.crypto_crew.crew",
+               "src.crypto_crew.llm_cache")
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Разбирает вывод -X importtime.
+
+    Args:
+        stderr (str): Вывод интерпретатора.
+
+    Returns:
+        list of tuple: (модуль, собственное время, мкс; суммарное время, мкс; глубина вложенности).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # "import time:       512 |       1834 |   yaml.error"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module: str) -> list:
+    """
+    Импортирует модуль в новом процессе и возвращает строки -X importtime.
+
+    Args:
+        module (str): Имя модуля.
+
+    Returns:
+        list: Результат parse_importtime.
+
+    Raises:
+        RuntimeError: Если импорт завершился ошибкой.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode
+        raise RuntimeError(f"импорт {module} завершился ошибкой: {error}")
+    return parse_importtime(result.stderr)
+
+
+def heaviest(rows: list, module: str, top: int) -> list:
+    """
+    Возвращает самые тяжелые пакеты верхнего уровня (кроме самого модуля и его родителей).
+
+    Args:
+        rows (list): Строки parse_importtime.
+        module (str): Проверяемый модуль.
+        top (int): Число пакетов в отчете.
+
+    Returns:
+        list of tuple: (пакет, суммарное время, мкс).
+    """
+    own = module.split(".")[0]
+    packages = {}
+    for name, _, cumulative, _ in rows:
+        root = name.split(".")[0]
+        if root == own:
+            continue
+        packages[root] = max(packages.get(root, 0), cumulative)
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def check(module: str, budget_ms: float, forbidden: tuple, runs: int, top: int) -> bool:
+    """
+    Измеряет импорт модуля, печатает отчет и проверяет бюджет.
+
+    Returns:
+        bool: True, если бюджет соблюден и запрещенные модули не загружены.
+    """
+    try:
+        samples = [measure(module) for _ in range(runs)]
+    except RuntimeError as e:
+        print(f"{module}: {e}")
+        return False
+
+    totals = [
+        next((cumulative for name, _, cumulative, _ in rows if name == module), 0) / 1000
+        for rows in samples
+    ]
+    total = statistics.median(totals)
+    loaded = {name for name, *_ in samples[0]}
+    violations = [name for name in forbidden if name in loaded]
+    ok = total <= budget_ms and not violations
+
+    print(f"{module:<40} {total:>8.1f} ms  (бюджет {budget_ms:.0f} ms)  {'ok' if ok else 'FAIL'}")
+    for name, cumulative in heaviest(samples[0], module, top):
+        print(f"    {name:<36} {cumulative / 1000:>8.1f} ms")
+    if violations:
+        print(f"    загружены при импорте: {', '.join(violations)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бюджет времени импорта точек входа")
+    parser.add_argument("--modules", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--runs", type=int, default=3, help="Число замеров (берется медиана)")
+    parser.add_argument("--top", type=int, default=8, help="Число тяжелых пакетов в отчете")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Множитель бюджетов")
+    args = parser.parse_args()
+
+    results = [
+        check(module, ENTRY_POINTS[module][0] * args.budget_scale, ENTRY_POINTS[module][1], args.runs, args.top)
+        for module in args.modules
+    ]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
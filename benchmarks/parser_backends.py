@@ -0,0 +1,119 @@
+# benchmarks/parser_backends.py
+"""
+Сравнение бэкендов парсинга HTML на сохраненных и синтетических страницах.
+
+Сохраненные страницы лежат в каталоге (по умолчанию benchmarks/pages) в том виде,
+в котором они передаются парсеру фетчера (после html.unescape). Тип страницы
+определяется по префиксу имени файла: dropstab_vesting, dropstab_fundraising,
+cryptorank_vesting, cryptorank_ico. Синтетические страницы тех же типов
+(benchmarks/fixtures.py) проверяются всегда, поэтому сравнение работает и без
+сохраненных страниц.
+
+Эталоном служит разбор html.parser полного дерева (как до появления бэкендов);
+для каждого доступного бэкенда проверяется, что извлеченные данные совпадают.
+
+Запуск из корня репозитория:
+    python -m benchmarks.parser_backends --pages-dir benchmarks/pages --repeat 20
+"""
+
+import sys
+import time
+import argparse
+
+from benchmarks.fixtures import PAGES_DIR, SIZES, load_fixtures
+
+from src.crypto_crew.tools.html_parser import available_backends, make_soup
+from src.crypto_crew.tools.get_vesting_tool import (
+    DropstabVestingFetcher,
+    CryptoRankVestingFetcher,
+    DROPSTAB_VESTING_STRAINER,
+)
+from src.crypto_crew.tools.get_fundraising_tool import (
+    DropstabFundraisingFetcher,
+    CryptoRankFundraisingFetcher,
+    DROPSTAB_FUNDRAISING_STRAINER,
+)
+
+
+def _dropstab_vesting(soup):
+    return DropstabVestingFetcher().parse_vesting_data(soup)
+
+
+def _dropstab_fundraising(soup):
+    fetcher = DropstabFundraisingFetcher()
+    return fetcher.parse_fundraising_rounds(soup), fetcher.parse_investors(soup)
+
+
+def _cryptorank_vesting(soup):
+    return (
+        CryptoRankVestingFetcher.extract_distribution_progress(soup),
+        CryptoRankVestingFetcher.extract_allocation_data(soup),
+    )
+
+
+def _cryptorank_ico(soup):
+    fetcher = CryptoRankFundraisingFetcher.__new__(CryptoRankFundraisingFetcher)
+    return fetcher.extract_funding_rounds(soup), fetcher.extract_investors(soup)
+
+
+# Тип страницы -> (фильтр разбора, функция извлечения)
+PAGE_KINDS = {
+    "dropstab_vesting": (DROPSTAB_VESTING_STRAINER, _dropstab_vesting),
+    "dropstab_fundraising": (DROPSTAB_FUNDRAISING_STRAINER, _dropstab_fundraising),
+    "cryptorank_vesting": (None, _cryptorank_vesting),
+    "cryptorank_ico": (None, _cryptorank_ico),
+}
+
+
+def run_once(markup: str, kind: str, backend: str, use_strainer: bool):
+    parse_only, extract = PAGE_KINDS[kind]
+    soup = make_soup(markup, parse_only=parse_only if use_strainer else None, backend=backend)
+    return extract(soup)
+
+
+def measure(markup: str, kind: str, backend: str, use_strainer: bool, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run_once(markup, kind, backend, use_strainer)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение бэкендов парсинга HTML")
+    parser.add_argument("--pages-dir", default=PAGES_DIR)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"],
+                        help="Размеры синтетических страниц")
+    parser.add_argument("--no-synthetic", action="store_true", help="Только сохраненные страницы")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.pages_dir, sizes=args.sizes, synthetic=not args.no_synthetic)
+    if not fixtures:
+        print(f"Нет фикстур: в {args.pages_dir} нет сохраненных страниц")
+        sys.exit(1)
+
+    backends = available_backends()
+    mismatches = 0
+
+    print(f"{'Страница':<40} {'Бэкенд':<12} {'ms/стр.':>9} {'ускорение':>10} {'совпадает':>10}")
+    for name, kind, markup in fixtures:
+        expected = run_once(markup, kind, "html.parser", use_strainer=False)
+        baseline = measure(markup, kind, "html.parser", False, args.repeat)
+        print(f"{name:<40} {'reference':<12} {baseline * 1000:>9.2f} {1.0:>9.2f}x {'-':>10}")
+
+        for backend in backends:
+            same = run_once(markup, kind, backend, use_strainer=True) == expected
+            mismatches += not same
+            elapsed = measure(markup, kind, backend, True, args.repeat)
+            print(
+                f"{'':<40} {backend:<12} {elapsed * 1000:>9.2f} "
+                f"{baseline / elapsed:>9.2f}x {'да' if same else 'НЕТ':>10}"
+            )
+
+    if mismatches:
+        print(f"\nРасхождений с эталоном: {mismatches}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
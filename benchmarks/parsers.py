@@ -0,0 +1,301 @@
+# benchmarks/parsers.py
+"""
+Микробенчмарки парсеров Dropstab и CryptoRank.
+
+Для каждой фикстуры (сохраненные страницы из benchmarks/pages и синтетические
+страницы размеров small/medium/large, см. benchmarks/fixtures.py) измеряются
+построение дерева (make_soup с тем же фильтром разбора, что и в фетчере) и
+каждый метод извлечения на готовом дереве:
+  - DropstabVestingFetcher.parse_vesting_data
+  - DropstabFundraisingFetcher.parse_fundraising_rounds / parse_investors
+  - CryptoRankVestingFetcher.extract_distribution_progress / extract_allocation_data
+  - CryptoRankFundraisingFetcher.extract_funding_rounds / extract_investors
+
+Время - медиана нескольких раундов (пропускная способность в вызовах/с и МБ/с
+HTML для разбора). Память - отдельный прогон под tracemalloc: пик выделенной
+во время вызова памяти и память, оставшаяся занятой после него (в байтах и блоках).
+
+Базовые результаты сохраняются в JSON; при сравнении замедление или рост
+пиковой памяти сверх допуска считается регрессией (код выхода 1).
+
+Запуск из корня репозитория:
+    python -m benchmarks.parsers --save-baseline
+    python -m benchmarks.parsers --compare
+    python -m benchmarks.parsers --sizes small medium --no-recorded
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import statistics
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.fixtures import PAGES_DIR, SIZES, load_fixtures
+from src.crypto_crew.tools.html_parser import make_soup, resolve_backend
+from src.crypto_crew.tools.get_vesting_tool import (
+    DropstabVestingFetcher,
+    CryptoRankVestingFetcher,
+    DROPSTAB_VESTING_STRAINER,
+)
+from src.crypto_crew.tools.get_fundraising_tool import (
+    DropstabFundraisingFetcher,
+    CryptoRankFundraisingFetcher,
+    DROPSTAB_FUNDRAISING_STRAINER,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Допуски регрессии: время шумнее, пиковая память почти детерминирована
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+
+# Фетчеры создаются без __init__: методам разбора не нужна HTTP-сессия
+_dropstab_vesting = DropstabVestingFetcher.__new__(DropstabVestingFetcher)
+_dropstab_fundraising = DropstabFundraisingFetcher.__new__(DropstabFundraisingFetcher)
+_cryptorank_ico = CryptoRankFundraisingFetcher.__new__(CryptoRankFundraisingFetcher)
+
+# Тип страницы -> (фильтр разбора, {имя парсера: функция извлечения})
+PARSERS = {
+    "dropstab_vesting": (DROPSTAB_VESTING_STRAINER, {
+        "parse_vesting_data": _dropstab_vesting.parse_vesting_data,
+    }),
+    "dropstab_fundraising": (DROPSTAB_FUNDRAISING_STRAINER, {
+        "parse_fundraising_rounds": _dropstab_fundraising.parse_fundraising_rounds,
+        "parse_investors": _dropstab_fundraising.parse_investors,
+    }),
+    "cryptorank_vesting": (None, {
+        "extract_distribution_progress": CryptoRankVestingFetcher.extract_distribution_progress,
+        "extract_allocation_data": CryptoRankVestingFetcher.extract_allocation_data,
+    }),
+    "cryptorank_ico": (None, {
+        "extract_funding_rounds": _cryptorank_ico.extract_funding_rounds,
+        "extract_investors": _cryptorank_ico.extract_investors,
+    }),
+}
+
+
+def time_call(func, min_time: float, rounds: int) -> dict:
+    """
+    Измеряет время вызова: число повторов подбирается так, чтобы раунд длился не меньше min_time.
+
+    Args:
+        func (callable): Функция без аргументов.
+        min_time (float): Минимальная длительность раунда в секундах.
+        rounds (int): Количество раундов.
+
+    Returns:
+        dict: median_s и best_s - время одного вызова в секундах.
+    """
+    func()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return {"median_s": statistics.median(samples), "best_s": min(samples)}
+
+
+def memory_call(func) -> dict:
+    """
+    Измеряет память одного вызова под tracemalloc.
+
+    Args:
+        func (callable): Функция без аргументов.
+
+    Returns:
+        dict: peak_bytes - пик выделенной во время вызова памяти,
+        retained_bytes и retained_blocks - память результата, оставшаяся после вызова.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return {
+        "peak_bytes": peak - start_current,
+        "retained_bytes": current - start_current,
+        "retained_blocks": blocks,
+    }
+
+
+def run_suite(fixtures: list, min_time: float, rounds: int) -> dict:
+    """
+    Прогоняет все парсеры на всех фикстурах.
+
+    Args:
+        fixtures (list): (имя фикстуры, тип страницы, HTML) из load_fixtures.
+        min_time (float): Минимальная длительность раунда замера времени.
+        rounds (int): Количество раундов.
+
+    Returns:
+        dict: "<фикстура>::<парсер>" -> результаты замеров.
+    """
+    results = {}
+    for name, kind, markup in fixtures:
+        strainer, parsers = PARSERS[kind]
+        page_bytes = len(markup.encode("utf-8"))
+
+        def parse():
+            return make_soup(markup, parse_only=strainer)
+
+        soup = parse()
+        cases = {"make_soup": parse}
+        for parser_name, extract in parsers.items():
+            cases[parser_name] = lambda extract=extract: extract(soup)
+
+        for parser_name, func in cases.items():
+            result = {"page_bytes": page_bytes, "records": None}
+            if parser_name != "make_soup":
+                result["records"] = len(func())
+            result.update(time_call(func, min_time, rounds))
+            result.update(memory_call(func))
+            results[f"{name}::{parser_name}"] = result
+    return results
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    print(
+        f"{'Фикстура / парсер':<66} {'записей':>7} {'мкс/выз.':>10} {'выз./с':>9} {'МБ/с':>7} "
+        f"{'пик КиБ':>9} {'ост. КиБ':>9} {'блоков':>8}" + (f" {'Δ время':>8}" if baseline else "")
+    )
+    for key, result in results.items():
+        median = result["median_s"]
+        throughput = result["page_bytes"] / median / 1e6 if key.endswith("::make_soup") else None
+        line = (
+            f"{key:<66} {result['records'] if result['records'] is not None else '-':>7} "
+            f"{median * 1e6:>10.1f} {1 / median:>9.0f} "
+            f"{f'{throughput:.1f}' if throughput is not None else '-':>7} "
+            f"{result['peak_bytes'] / 1024:>9.1f} {result['retained_bytes'] / 1024:>9.1f} "
+            f"{result['retained_blocks']:>8}"
+        )
+        if baseline:
+            base = baseline.get(key)
+            delta = f"{median / base['median_s'] - 1:+.0%}" if base else "нов."
+            line += f" {delta:>8}"
+        print(line)
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list:
+    """
+    Сравнивает результаты с базовыми.
+
+    Args:
+        results (dict): Текущие результаты run_suite.
+        baseline (dict): Базовые результаты.
+        time_tolerance (float): Допустимое относительное замедление медианы.
+        memory_tolerance (float): Допустимый относительный рост пиковой памяти.
+
+    Returns:
+        list of str: Описания регрессий.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["median_s"] > base["median_s"] * (1 + time_tolerance):
+            regressions.append(
+                f"{key}: время {base['median_s'] * 1e6:.1f} -> {result['median_s'] * 1e6:.1f} мкс"
+            )
+        if result["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{key}: пик памяти {base['peak_bytes'] / 1024:.1f} -> {result['peak_bytes'] / 1024:.1f} КиБ"
+            )
+        if base.get("records") is not None and result["records"] != base["records"]:
+            regressions.append(f"{key}: записей {base['records']} -> {result['records']}")
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "backend": resolve_backend(strained=True),
+        "full_page_backend": resolve_backend(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарки парсеров страниц")
+    parser.add_argument("--pages-dir", default=PAGES_DIR)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--no-recorded", action="store_true", help="Только синтетические страницы")
+    parser.add_argument("--no-synthetic", action="store_true", help="Только сохраненные страницы")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Минимальная длительность раунда, с")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как базовые")
+    parser.add_argument("--compare", action="store_true", help="Сравнить с базовыми результатами")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(
+        args.pages_dir, sizes=args.sizes, recorded=not args.no_recorded, synthetic=not args.no_synthetic
+    )
+    if not fixtures:
+        print(f"Нет фикстур: в {args.pages_dir} нет сохраненных страниц")
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            print(f"Базовые результаты не найдены: {args.baseline} (запустите с --save-baseline)")
+            sys.exit(1)
+        if saved["environment"] != environment():
+            print(f"Внимание: базовые результаты получены в другом окружении: {saved['environment']}")
+        baseline = saved["results"]
+
+    results = run_suite(fixtures, args.min_time, args.rounds)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"created_at": datetime.now().isoformat(timespec="seconds"),
+                 "environment": environment(), "results": results},
+                f, ensure_ascii=False, indent=2, sort_keys=True
+            )
+        print(f"\nБазовые результаты сохранены: {args.baseline}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print("\nРегрессии:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nРегрессий нет")
+
+
+if __name__ == "__main__":
+    main()
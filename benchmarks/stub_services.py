@@ -0,0 +1,610 @@
+# benchmarks/stub_services.py
+"""
+Локальные заглушки внешних сервисов: CoinMarketCap, Serper, прокси рендеринга и OpenAI.
+
+Каждый сервис - HTTP-сервер с API, совместимым с тем, что использует конвейер,
+и заготовленными данными. Для каждого задаются распределение задержки, доля
+ошибок и лимит запросов (benchmarks/stub_services.yaml). Страницы прокси
+рендеринга - синтетические страницы из benchmarks/fixtures.py, ответы OpenAI
+сразу содержат Final Answer, поэтому агенты завершают задачу за один вызов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.stub_services --env > ./tmp/stub.env
+    set -a; . ./tmp/stub.env; set +a
+    python -m benchmarks.stub_services &
+    run_batch BTC ETH TON --output-dir ./tmp/stub/batch
+
+Статистика сервиса: GET http://127.0.0.1:<port>/__stats
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+from benchmarks.fixtures import synthetic_page
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "stub_services.yaml")
+
+DEFAULT_HOST = "127.0.0.1"
+
+# Каталог, в котором запуски против заглушек держат кэши и отчеты отдельно от настоящих
+STUB_STATE_DIR = "./tmp/stub"
+
+
+class Latency:
+    """
+    Распределение задержки ответа в миллисекундах.
+    """
+
+    def __init__(self, config: dict, scale: float = 1.0):
+        self.config = dict(config or {"distribution": "constant", "ms": 0})
+        self.scale = scale
+
+    def sample(self, rnd: random.Random) -> float:
+        """
+        Возвращает задержку в секундах.
+        """
+        c = self.config
+        kind = c.get("distribution", "constant")
+        if kind == "constant":
+            ms = c.get("ms", 0)
+        elif kind == "uniform":
+            ms = rnd.uniform(c["min_ms"], c["max_ms"])
+        elif kind == "normal":
+            ms = max(0.0, rnd.gauss(c["mean_ms"], c["stddev_ms"]))
+        elif kind == "lognormal":
+            ms = rnd.lognormvariate(math.log(c["median_ms"]), c.get("sigma", 0.5))
+        else:
+            raise ValueError(f"Неизвестное распределение задержки: {kind}")
+        return ms * self.scale / 1000
+
+
+class TokenBucket:
+    """
+    Лимит запросов заглушки: корзина токенов без ожидания (сверх лимита - отказ).
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Забирает токен.
+
+        Returns:
+            float: 0, если запрос разрешен, иначе - через сколько секунд появится токен.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class StubService:
+    """
+    Базовый класс заглушки: задержка, ошибки, лимит и счетчики ответов.
+
+    Наследники реализуют handle(method, path, query, body) -> (status, dict) или
+    (status, bytes, headers) для ответов не в JSON.
+    """
+
+    name = ""
+
+    def __init__(self, config: dict, latency_scale: float = 1.0, seed: int = None):
+        self.config = config
+        self.port = config["port"]
+        self.latency = Latency(config.get("latency"), latency_scale)
+        self.error_rate = float(config.get("error_rate") or 0)
+        self.error_status = int(config.get("error_status") or 500)
+        limit = config.get("rate_limit")
+        self.bucket = TokenBucket(float(limit["rate"]), float(limit.get("burst", limit["rate"]))) if limit else None
+        self._rnd = random.Random(seed)
+        self._rnd_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.statuses = {}
+        self.total_latency = 0.0
+
+    def _random(self, func):
+        with self._rnd_lock:
+            return func(self._rnd)
+
+    def respond(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        """
+        Обрабатывает запрос с учетом лимита, задержки и доли ошибок.
+
+        Returns:
+            tuple: (HTTP-статус, тело ответа dict или bytes, заголовки dict).
+        """
+        if path == "/__stats":
+            return 200, self.stats(), {}
+
+        headers = {}
+        retry_after = self.bucket.acquire() if self.bucket else 0
+        if retry_after:
+            status, payload = 429, self.rate_limited()
+            headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        else:
+            delay = self._random(self.latency.sample)
+            time.sleep(delay)
+            with self._stats_lock:
+                self.total_latency += delay
+            if self._random(lambda rnd: rnd.random()) < self.error_rate:
+                status, payload = self.error_status, {"error": "stub failure"}
+            else:
+                try:
+                    result = self.handle(method, path, query, body)
+                    status, payload = result[:2]
+                    headers.update(result[2] if len(result) > 2 else {})
+                except (ValueError, KeyError) as e:
+                    status, payload = 400, {"error": str(e)}
+
+        with self._stats_lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        return status, payload, headers
+
+    def handle(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        raise NotImplementedError
+
+    def rate_limited(self) -> dict:
+        return {"error": "rate limit exceeded"}
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            requests_total = sum(self.statuses.values())
+            served = requests_total - self.statuses.get(429, 0)
+            return {
+                "service": self.name,
+                "requests": requests_total,
+                "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+                "mean_latency_ms": round(self.total_latency / served * 1000, 1) if served else 0.0,
+            }
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "token"
+
+
+class CoinMarketCapStub(StubService):
+    """
+    GET /v2/cryptocurrency/info?symbol=A,B - метаданные монет.
+
+    Сайт и whitepaper монеты указывают на заглушку прокси рендеринга (documents_url),
+    без нее - на несуществующие адреса example.com.
+    """
+
+    name = "cmc"
+
+    documents_url = None
+
+    def handle(self, method, path, query, body):
+        if path != "/v2/cryptocurrency/info":
+            return 404, {"status": {"error_code": 404, "error_message": "Not found"}}
+
+        symbols = [s for s in query.get("symbol", [""])[0].split(",") if s]
+        unknown = {s.upper() for s in self.config.get("unknown_symbols") or []}
+        data = {symbol: [self.coin(symbol)] for symbol in symbols if symbol.upper() not in unknown}
+        status = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+            "error_code": 0,
+            "error_message": None,
+            "credit_count": -(-len(symbols) // 100),
+        }
+        return 200, {"status": status, "data": data}
+
+    def coin(self, symbol: str) -> dict:
+        slug = _slug(symbol)
+        if self.documents_url:
+            website, technical_doc = f"{self.documents_url}/site/{slug}/", f"{self.documents_url}/whitepaper/{slug}.pdf"
+        else:
+            website, technical_doc = f"https://{slug}.example.com/", f"https://{slug}.example.com/whitepaper.pdf"
+        return {
+            "id": sum(map(ord, symbol)),
+            "name": f"{symbol.upper()} Network",
+            "symbol": symbol.upper(),
+            "slug": slug,
+            "category": "token",
+            "description": f"{symbol.upper()} Network is a layer-1 blockchain with a native token {symbol.upper()}.",
+            "logo": f"https://example.com/{slug}.png",
+            "date_added": "2021-01-01T00:00:00.000Z",
+            "date_launched": "2021-01-01T00:00:00.000Z",
+            "tags": ["layer-1", "smart-contracts"],
+            "platform": None,
+            "urls": {
+                "website": [website],
+                "technical_doc": [technical_doc],
+                "twitter": [f"https://twitter.com/{slug}"],
+                "source_code": [f"https://github.com/{slug}"],
+                "explorer": [],
+                "reddit": [],
+                "message_board": [],
+                "chat": [],
+                "announcement": [],
+            },
+        }
+
+    def rate_limited(self):
+        return {"status": {"error_code": 1008, "error_message": "You've exceeded your API Key's HTTP request rate limit.",
+                           "credit_count": 0}}
+
+
+class SerperStub(StubService):
+    """
+    POST /search - результаты поиска; запросы 'dropstab X' и 'cryptorank X' возвращают ссылки на токен.
+    """
+
+    name = "serper"
+
+    def handle(self, method, path, query, body):
+        if path != "/search":
+            return 404, {"message": "Not found"}
+
+        request = json.loads(body or b"{}")
+        q = request.get("q", "")
+        source, _, rest = q.partition(" ")
+        slug = _slug(rest)
+        if source == "dropstab":
+            organic = [{"title": f"{rest} vesting", "link": f"https://dropstab.com/coins/{slug}", "position": 1}]
+        elif source == "cryptorank":
+            organic = [{"title": f"{rest} price", "link": f"https://cryptorank.io/price/{slug}", "position": 1}]
+        else:
+            organic = [
+                {
+                    "title": f"{q}: article {i}",
+                    "link": f"https://news{i % 7}.example.com/{_slug(q)}-{i}",
+                    "snippet": f"Overview {i} of the consensus, scalability and security design behind {q}.",
+                    "date": f"Jan {i + 1}, 2024",
+                    "position": i + 1,
+                }
+                for i in range(int(request.get("num", 10)))
+            ]
+        return 200, {"searchParameters": request, "organic": organic}
+
+    def rate_limited(self):
+        return {"message": "Too many requests", "statusCode": 429}
+
+
+def _pdf(lines: list) -> bytes:
+    """
+    Собирает одностраничный PDF с текстом (для извлечения текста через pypdf).
+    """
+    text = "".join(
+        f"({line.replace(chr(92), chr(92) * 2).replace('(', chr(92) + '(').replace(')', chr(92) + ')')}) Tj T* "
+        for line in lines
+    )
+    stream = f"BT /F1 10 Tf 14 TL 40 800 Td {text}ET".encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+def _document_paragraphs(slug: str) -> list:
+    name = f"{slug.upper()} Network"
+    return [
+        f"{name} is a layer-1 blockchain for payments and decentralized applications.",
+        f"{name} uses a proof-of-stake consensus mechanism with sharding for scalability.",
+        f"Validators of {name} stake the native token; blocks are final after two epochs.",
+        f"{name} introduces a proprietary virtual machine and threshold cryptography for bridges.",
+        f"Security of {name} was audited twice; the main risks are validator concentration and bridge exploits.",
+        f"Competitive advantages of {name}: low fees, fast finality and a large developer ecosystem.",
+    ]
+
+
+class RenderProxyStub(StubService):
+    """
+    POST / с payload {goto, sel, timeout} - HTML страницы Dropstab или CryptoRank в поле data.
+
+    Заодно отдает сайт и whitepaper монет из заглушки CoinMarketCap:
+    GET /site/<slug>/ - HTML, GET /whitepaper/<slug>.pdf - PDF.
+    """
+
+    name = "render"
+
+    # Шаблон URL страницы -> тип синтетической страницы
+    PAGES = (
+        (re.compile(r"dropstab\.com/coins/[^/]+/vesting"), "dropstab_vesting"),
+        (re.compile(r"dropstab\.com/coins/[^/]+/fundraising"), "dropstab_fundraising"),
+        (re.compile(r"cryptorank\.io/price/[^/]+/vesting"), "cryptorank_vesting"),
+        (re.compile(r"cryptorank\.io/ico/"), "cryptorank_ico"),
+    )
+
+    def __init__(self, config, latency_scale=1.0, seed=None):
+        super().__init__(config, latency_scale, seed)
+        size = config.get("page_size", "small")
+        self.pages = {kind: synthetic_page(kind, size) for _, kind in self.PAGES}
+
+    def handle(self, method, path, query, body):
+        if method == "GET":
+            return self.document(path)
+        goto = json.loads(body or b"{}").get("goto", "")
+        for pattern, kind in self.PAGES:
+            if pattern.search(goto):
+                return 200, {"data": self.pages[kind]}
+        return 200, {"data": ""}
+
+    def document(self, path: str) -> tuple:
+        site = re.fullmatch(r"/site/([a-z0-9-]+)/?", path)
+        if site:
+            slug = site.group(1)
+            body = "".join(f"<p>{paragraph}</p>" for paragraph in _document_paragraphs(slug))
+            html = (f"<html><head><title>{slug.upper()} Network</title><script>var x = 1;</script></head>"
+                    f"<body><nav>Home | Docs</nav><main><h1>{slug.upper()} Network</h1>{body}</main>"
+                    f"<footer>(c) {slug.upper()} Foundation</footer></body></html>")
+            return 200, html.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"}
+        whitepaper = re.fullmatch(r"/whitepaper/([a-z0-9-]+)\.pdf", path)
+        if whitepaper:
+            slug = whitepaper.group(1)
+            lines = [f"{slug.upper()} Network Whitepaper", *_document_paragraphs(slug)]
+            return 200, _pdf(lines), {"Content-Type": "application/pdf"}
+        return 404, {"error": "Not found"}
+
+
+class OpenAIStub(StubService):
+    """
+    POST /v1/chat/completions - ответ в формате ReAct с Final Answer.
+    POST /v1/embeddings - детерминированные векторы по хэшу слов текста.
+    """
+
+    name = "openai"
+
+    EMBEDDING_DIMENSIONS = 64
+
+    def embedding(self, text: str) -> list:
+        vector = [0.0] * self.EMBEDDING_DIMENSIONS
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % self.EMBEDDING_DIMENSIONS] += 1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def handle(self, method, path, query, body):
+        if path.endswith("/embeddings"):
+            request = json.loads(body or b"{}")
+            texts = request.get("input") or []
+            texts = [texts] if isinstance(texts, str) else texts
+            tokens = sum(len(text) // 4 for text in texts)
+            return 200, {
+                "object": "list",
+                "model": request.get("model", "text-embedding-3-small"),
+                "data": [
+                    {"object": "embedding", "index": idx, "embedding": self.embedding(text)}
+                    for idx, text in enumerate(texts)
+                ],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        if not path.endswith("/chat/completions"):
+            return 404, {"error": {"message": "Not found", "type": "invalid_request_error"}}
+
+        request = json.loads(body or b"{}")
+        messages = request.get("messages") or []
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        task = next((line for line in prompt.splitlines() if line.startswith("Current Task:")), "Current Task: analysis")
+        answer = (
+            "Thought: I now can give a great answer\n"
+            f"Final Answer: # Stub report\n\n{task[len('Current Task:'):].strip()[:200]}\n\n"
+            "- Summary: canned response from the local OpenAI stand-in.\n"
+        )
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(answer) // 4
+        return 200, {
+            "id": f"chatcmpl-stub-{self._random(lambda rnd: rnd.getrandbits(32)):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def rate_limited(self):
+        return {"error": {"message": "Rate limit reached for requests", "type": "requests",
+                          "code": "rate_limit_exceeded"}}
+
+
+SERVICES = {
+    "cmc": CoinMarketCapStub,
+    "serper": SerperStub,
+    "render": RenderProxyStub,
+    "openai": OpenAIStub,
+}
+
+
+def _handler(service: StubService, verbose: bool):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self, method: str):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, payload, headers = service.respond(method, url.path, parse_qs(url.query), body)
+
+            if isinstance(payload, bytes):
+                raw, content_type = payload, headers.pop("Content-Type", "application/octet-stream")
+            else:
+                raw, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(raw)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            self._serve("GET")
+
+        def do_POST(self):
+            self._serve("POST")
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+class StubStack:
+    """
+    Набор запущенных заглушек.
+    """
+
+    def __init__(self, config: dict, host: str = DEFAULT_HOST, latency_scale: float = 1.0, seed: int = None,
+                 services: list = None, verbose: bool = False):
+        self.host = host
+        self.services = {}
+        self._servers = []
+        defaults = config.get("defaults") or {}
+        for name, service_config in (config.get("services") or {}).items():
+            if services and name not in services:
+                continue
+            merged = {**defaults, **(service_config or {})}
+            self.services[name] = SERVICES[name](merged, latency_scale, seed)
+        render = (config.get("services") or {}).get("render") or {}
+        if "cmc" in self.services and render.get("port"):
+            self.services["cmc"].documents_url = f"http://{host}:{render['port']}"
+        self._verbose = verbose
+
+    def start(self) -> "StubStack":
+        for service in self.services.values():
+            server = ThreadingHTTPServer((self.host, service.port), _handler(service, self._verbose))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f"stub-{service.name}", daemon=True).start()
+            self._servers.append(server)
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def url(self, name: str) -> str:
+        return f"http://{self.host}:{self.services[name].port}"
+
+    def env(self) -> dict:
+        """
+        Переменные окружения, переключающие конвейер на заглушки.
+
+        Кэши и отчеты выносятся в STUB_STATE_DIR, чтобы ответы заглушек не
+        попали в настоящие кэши рендеринга, LLM и эмбеддингов.
+        """
+        env = {}
+        urls = {
+            "cmc": ("CMC_API_BASE_URL", ""),
+            "serper": ("SERPER_API_URL", ""),
+            "render": ("RENDER_PROXY_URL", ""),
+            "openai": ("OPENAI_API_BASE", "/v1"),
+        }
+        for name, (variable, suffix) in urls.items():
+            if name in self.services:
+                env[variable] = self.url(name) + suffix
+        env.update({
+            "COINMARKETCAP_API_KEY": os.getenv("COINMARKETCAP_API_KEY") or "stub",
+            "SERPER_API_KEY": os.getenv("SERPER_API_KEY") or "stub",
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "stub",
+            "RENDER_CACHE_PATH": os.path.join(STUB_STATE_DIR, "render_cache.sqlite3"),
+            "LLM_CACHE_PATH": os.path.join(STUB_STATE_DIR, "llm_cache.sqlite3"),
+            "EMBEDDING_CACHE_PATH": os.path.join(STUB_STATE_DIR, "embedding_cache.sqlite3"),
+            "EMBEDDING_STORE_PATH": os.path.join(STUB_STATE_DIR, "db"),
+            "CRYPTO_CREW_REPORTS_DIR": os.path.join(STUB_STATE_DIR, "reports"),
+        })
+        return env
+
+    def stats(self) -> list:
+        return [service.stats() for service in self.services.values()]
+
+
+def load_config(path: str = DEFAULT_CONFIG) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def print_stats(stats: list) -> None:
+    print(f"{'Сервис':<8} {'запросов':>9} {'ср. задержка, мс':>17}  статусы")
+    for item in stats:
+        statuses = ", ".join(f"{status}: {count}" for status, count in item["statuses"].items())
+        print(f"{item['service']:<8} {item['requests']:>9} {item['mean_latency_ms']:>17.1f}  {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальные заглушки CoinMarketCap, Serper, прокси рендеринга и OpenAI")
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--services", nargs="+", choices=list(SERVICES), help="Запустить только эти сервисы")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Множитель всех задержек (0 - без задержек)")
+    parser.add_argument("--error-rate", type=float, default=None, help="Доля ошибок для всех сервисов")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Отключить лимиты запросов")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--env", action="store_true", help="Напечатать переменные окружения и выйти")
+    parser.add_argument("--verbose", action="store_true", help="Логировать каждый запрос")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    for service_config in (config.get("services") or {}).values():
+        if args.error_rate is not None:
+            service_config["error_rate"] = args.error_rate
+        if args.no_rate_limit:
+            service_config["rate_limit"] = None
+
+    stack = StubStack(config, args.host, args.latency_scale, args.seed, args.services, args.verbose)
+    if args.env:
+        for name, value in stack.env().items():
+            print(f"{name}={value}")
+        return
+
+    stack.start()
+    for name in stack.services:
+        print(f"{name:<8} {stack.url(name)}")
+    print("Ctrl+C - остановить и вывести статистику")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stack.stop()
+        print()
+        print_stats(stack.stats())
+
+
+if __name__ == "__main__":
+    main()
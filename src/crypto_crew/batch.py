@@ -0,0 +1,247 @@
+### src/crypto_crew/batch.py
+
+import os
+import math
+import json
+import time
+import asyncio
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from src.crypto_crew.tools.get_metadata import GetCoinMetadata
+from src.crypto_crew.report_store import get_report_store
+from src.crypto_crew.tracing import print_summary, span
+from src.crypto_crew.usage import format_usage, get_usage_ledger
+
+# Число токенов, анализируемых одновременно
+BATCH_WORKERS = int(os.getenv("CRYPTO_CREW_BATCH_WORKERS", "4"))
+
+ANALYSIS_BRANCHES = (
+    "metadata_analysis",
+    "technology_analysis",
+    "tokenomics_analysis",
+    "fundraising_analysis",
+)
+
+
+def load_symbols(symbols: list = None, file_path: str = None) -> list:
+    """
+    Собирает список символов из аргументов и/или файла.
+
+    В файле символы разделяются переводами строк, пробелами или запятыми;
+    строки, начинающиеся с '#', игнорируются. Повторы удаляются с сохранением порядка.
+
+    Args:
+        symbols (list): Символы, переданные в командной строке.
+        file_path (str): Путь к файлу со списком символов.
+
+    Returns:
+        list: Уникальные символы в исходном порядке.
+    """
+    raw = list(symbols or [])
+    if file_path:
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0]
+                raw.extend(line.replace(",", " ").split())
+
+    seen = set()
+    result = []
+    for symbol in raw:
+        symbol = symbol.strip()
+        if symbol and symbol not in seen:
+            seen.add(symbol)
+            result.append(symbol)
+    return result
+
+
+def analyse_token(symbol: str, output_dir: str, branch_concurrency: int = None, metadata: dict = None,
+                  incremental: bool = None) -> dict:
+    """
+    Выполняет полный конвейер анализа (метаданные -> анализ) для одного токена.
+
+    Args:
+        symbol (str): Символ криптовалюты.
+        output_dir (str): Каталог для файлов с результатами.
+        branch_concurrency (int): Число одновременно выполняемых веток анализа.
+        metadata (dict): Заранее полученные метаданные (None - запросить в потоке).
+        incremental (bool): Пропускать задачи с неизменными входными данными.
+
+    Returns:
+        dict: Итог по токену: статус, ошибки, время этапов и результаты веток.
+    """
+    # crewai загружается только при анализе, а не при разборе аргументов и запросе метаданных
+    from src.crypto_crew.workflow import WorkFlow
+
+    started = time.perf_counter()
+    workflow = WorkFlow(max_concurrency=branch_concurrency, token=symbol, metadata=metadata,
+                        incremental=incremental)
+    errors = {}
+
+    try:
+        with span("flow.run", token=symbol):
+            asyncio.run(workflow.kickoff())
+    except Exception as e:
+        errors["flow"] = str(e)
+
+    state = workflow.state
+    errors.update(state.branch_errors)
+    if not state.metadata:
+        errors.setdefault("fetch_coin_metadata", "Метаданные не найдены")
+    for branch in ANALYSIS_BRANCHES:
+        if state.metadata and branch not in state.analysis_results:
+            errors.setdefault(branch, "Ветка анализа не выполнена")
+
+    result = {
+        "token": symbol,
+        "name": state.name,
+        "date": state.date,
+        "ok": not errors,
+        "errors": errors,
+        "elapsed": time.perf_counter() - started,
+        "timings": dict(state.branch_timings),
+        "skipped": list(state.skipped_tasks),
+        "run_id": state.run_id,
+        "usage": get_usage_ledger().rows(token=symbol),
+        "results": dict(state.analysis_results),
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, f"{symbol}.json")
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+
+    return result
+
+
+def _percentile(values: list, q: float) -> float:
+    """
+    Возвращает перцентиль методом ближайшего ранга.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(results: list, elapsed: float) -> str:
+    """
+    Формирует сводку пропускной способности пакетного запуска.
+
+    Args:
+        results (list): Результаты analyse_token по всем токенам.
+        elapsed (float): Общее время запуска в секундах.
+
+    Returns:
+        str: Текстовая сводка.
+    """
+    failures = [r for r in results if not r["ok"]]
+    tokens_per_minute = len(results) / elapsed * 60 if elapsed > 0 else 0.0
+
+    lines = [
+        "=" * 23 + " Batch summary " + "=" * 23,
+        f"Токенов: {len(results)}, успешно: {len(results) - len(failures)}, с ошибками: {len(failures)}",
+        f"Общее время: {elapsed:.1f} s, пропускная способность: {tokens_per_minute:.2f} токенов/мин",
+        "",
+        f"{'Этап':<25} {'n':>4} {'p50, s':>9} {'p95, s':>9} {'max, s':>9}",
+    ]
+
+    stages = {}
+    for r in results:
+        for stage, seconds in r["timings"].items():
+            stages.setdefault(stage, []).append(seconds)
+        stages.setdefault("total", []).append(r["elapsed"])
+
+    for stage, values in stages.items():
+        lines.append(
+            f"{stage:<25} {len(values):>4} {_percentile(values, 0.5):>9.1f} "
+            f"{_percentile(values, 0.95):>9.1f} {max(values):>9.1f}"
+        )
+
+    usage = [row for r in results for row in r.get("usage", [])]
+    if usage:
+        lines.extend(["", "Расход LLM по агентам:", format_usage(usage, by="agent")])
+        lines.extend(["", "Расход LLM по токенам:", format_usage(usage, by="token")])
+
+    if failures:
+        lines.append("")
+        lines.append("Ошибки:")
+        for r in failures:
+            for stage, error in r["errors"].items():
+                lines.append(f"  {r['token']}: {stage}: {error}")
+
+    return "\n".join(lines)
+
+
+def run_batch(symbols: list, workers: int = None, output_dir: str = "./reports/batch",
+              branch_concurrency: int = None, incremental: bool = None) -> list:
+    """
+    Анализирует список токенов с ограниченным числом параллельных потоков.
+
+    Args:
+        symbols (list): Символы криптовалют.
+        workers (int): Число токенов, обрабатываемых одновременно.
+        output_dir (str): Каталог для файлов с результатами.
+        branch_concurrency (int): Число одновременно выполняемых веток анализа на токен.
+        incremental (bool): Пропускать задачи с неизменными входными данными.
+
+    Returns:
+        list: Результаты analyse_token в порядке входного списка.
+    """
+    workers = max(1, workers or BATCH_WORKERS)
+    started = time.perf_counter()
+
+    # Метаданные всех токенов запрашиваются заранее пачками до 100 символов
+    metadata_started = time.perf_counter()
+    with span("batch.fetch_metadata", symbols=len(symbols)):
+        datasets = GetCoinMetadata.save_datasets(symbols)
+    print(
+        f"Метаданные для {len(symbols)} токенов получены за "
+        f"{time.perf_counter() - metadata_started:.1f} s "
+        f"(кредитов CMC: {GetCoinMetadata.credits_used})"
+    )
+
+    # Символы, запрос которых не удался (None), запрашиваются заново в потоке токена
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+        results = list(executor.map(
+            lambda symbol: analyse_token(symbol, output_dir, branch_concurrency, datasets.get(symbol, {}), incremental),
+            symbols
+        ))
+
+    print(summarize(results, time.perf_counter() - started))
+    # Кэш ссылок общий для всех токенов пакета - счетчики печатаются один раз
+    from src.crypto_crew.tools.get_tokenomic_links import get_link_resolver
+    print("Tokenomic links cache:", get_link_resolver().stats())
+    print_summary()
+    get_report_store().apply_retention()
+    return results
+
+
+def main():
+    """
+    Точка входа пакетного режима: анализ списка токенов без интерактивного ввода.
+    """
+    parser = argparse.ArgumentParser(description="Пакетный анализ списка криптовалют")
+    parser.add_argument("symbols", nargs="*", help="Символы криптовалют (например, BTC ETH TON)")
+    parser.add_argument("-f", "--file", help="Файл со списком символов")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help=f"Число токенов, обрабатываемых одновременно (по умолчанию {BATCH_WORKERS})")
+    parser.add_argument("--branch-concurrency", type=int, default=None,
+                        help="Число веток анализа, выполняемых одновременно для одного токена")
+    parser.add_argument("-o", "--output-dir", default="./reports/batch",
+                        help="Каталог для результатов по токенам")
+    parser.add_argument("--incremental", action="store_true", default=None,
+                        help="Перезапускать только задачи, входные данные которых изменились")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    symbols = load_symbols(args.symbols, args.file)
+    if not symbols:
+        parser.error("не указано ни одного символа")
+
+    results = run_batch(symbols, args.workers, args.output_dir, args.branch_concurrency, args.incremental)
+    if any(not r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,13 @@
 
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import ScrapeWebsiteTool, WebsiteSearchTool
+from crewai_tools import ScrapeWebsiteTool
 from src.crypto_crew.tools.web_search import WebSearchTool
+from src.crypto_crew.tools.website_search import WebsiteSearchTool
 # from src.crypto_crew.tools.get_fundraising import DropstabFundraisingTool
 from src.crypto_crew.tools.get_fundraising_tool import GetFundraisingTool
 from src.crypto_crew.tools.get_vesting_tool import GetVestingTool
-from langchain_openai import ChatOpenAI
-
-llm=ChatOpenAI(model_name="gpt-4o-mini")
+from src.crypto_crew.llm_cache import cached_llm
 
 @CrewBase
 class CryptocrewCrew():
@@ -19,6 +18,7 @@ class CryptocrewCrew():
 	def researcher(self) -> Agent:
 		return Agent(
 			config=self.agents_config['researcher'],
+			llm=cached_llm('researcher'),
 			verbose=True,
 			)
 
@@ -26,6 +26,7 @@ class CryptocrewCrew():
 	def technology_analyst(self) -> Agent:
 		return Agent(
 			config=self.agents_config['technology_analyst'],
+			llm=cached_llm('technology_analyst'),
 			verbose=True,
 			tools=[ScrapeWebsiteTool(), WebSearchTool()]
 		)
@@ -34,6 +35,7 @@ class CryptocrewCrew():
 	def crypto_tokenomics_analyst(self) -> Agent:
 		return Agent(
 			config=self.agents_config['crypto_tokenomics_analyst'],
+			llm=cached_llm('crypto_tokenomics_analyst'),
 			verbose=True,
 			tools=[GetVestingTool(), ScrapeWebsiteTool(), WebsiteSearchTool()]
 		)
@@ -42,6 +44,7 @@ class CryptocrewCrew():
 	def fundraising_analyst(self) -> Agent:
 		return Agent(
 			config=self.agents_config['fundraising_analyst'],
+			llm=cached_llm('fundraising_analyst'),
 			verbose=True,
 			tools=[GetFundraisingTool()]
 		)
@@ -0,0 +1,39 @@
+### src/crypto_crew/flow_cli.py
+
+import asyncio
+import logging
+from src.crypto_crew.tools.get_metadata import GetCoinMetadata
+
+
+def ask_metadata():
+    """
+    Запрашивает символ токена, пока метаданные не будут найдены.
+
+    Returns:
+        tuple: (символ, метаданные).
+    """
+    while True:
+        coin_symbol = input("Введите символ или название криптовалюты (например, BTC, ETH, TON): ")
+        metadata = GetCoinMetadata.save_dataset(coin_symbol)
+        if metadata:
+            return coin_symbol, metadata
+        print("Данные не найдены. Пожалуйста, скорректируйте название токена.")
+
+
+def main():
+    """
+    Запускает поток анализа для одного токена.
+
+    crewai и litellm (несколько секунд импорта) загружаются только после того,
+    как метаданные токена найдены.
+    """
+    logging.basicConfig(level=logging.INFO)
+    coin_symbol, metadata = ask_metadata()
+
+    from src.crypto_crew.workflow import run
+    asyncio.run(run(token=coin_symbol, metadata=metadata))
+
+
+def plot_flow():
+    from src.crypto_crew.workflow import WorkFlow
+    WorkFlow().plot()
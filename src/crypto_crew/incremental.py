@@ -0,0 +1,78 @@
+### src/crypto_crew/incremental.py
+
+import os
+import json
+import hashlib
+import yaml
+from functools import lru_cache
+from src.crypto_crew.report_store import ReportStore
+
+# Перезапускать только задачи, входные данные которых изменились с прошлого запуска
+INCREMENTAL = os.getenv("CRYPTO_CREW_INCREMENTAL", "").lower() in ("1", "true", "yes")
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "config")
+
+# Входные данные, которые меняются при каждом запуске (живая выдача Serper) и не входят
+# в отпечаток: иначе technology_analyst_task не пропускалась бы почти никогда.
+# Отчет технологии переиспользуется, пока не изменились метаданные, сайт и whitepaper.
+VOLATILE_INPUTS = ("search_results",)
+
+
+@lru_cache(maxsize=None)
+def _load_config(name: str) -> dict:
+    with open(os.path.join(CONFIG_DIR, name), encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def task_fingerprint(task_name: str, inputs: dict, model: str = None):
+    """
+    Вычисляет отпечаток задачи по шаблону, конфигурации агента и входным данным
+    (кроме VOLATILE_INPUTS).
+
+    Args:
+        task_name (str): Имя задачи в tasks.yaml.
+        inputs (dict): Входные данные задачи (метаданные, данные инструментов).
+        model (str): Модель агента.
+
+    Returns:
+        str | None: SHA-256 отпечатка или None, если часть данных не была загружена
+        заранее (агент получит их сам через инструменты, и сравнение не имеет смысла).
+    """
+    # prefetch тянет за собой инструменты (crewai_tools, bs4) - импорт только при запуске задачи
+    from src.crypto_crew.prefetch import NOT_PREFETCHED
+
+    if any(value in NOT_PREFETCHED.values() for value in inputs.values() if isinstance(value, str)):
+        return None
+
+    template = _load_config("tasks.yaml")[task_name]
+    agent = _load_config("agents.yaml").get(template.get("agent"), {})
+    stable = {key: value for key, value in inputs.items() if key not in VOLATILE_INPUTS}
+    raw = json.dumps(
+        {"task": template, "agent": agent, "model": model, "inputs": stable},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def find_unchanged(store: ReportStore, token: str, task_name: str, fingerprint: str):
+    """
+    Возвращает последний отчет задачи, построенный по тем же входным данным.
+
+    Args:
+        store (ReportStore): Хранилище отчетов.
+        token (str): Символ токена.
+        task_name (str): Имя задачи в tasks.yaml.
+        fingerprint (str): Текущий отпечаток задачи.
+
+    Returns:
+        str | None: Текст отчета или None, если задачу нужно выполнить заново.
+    """
+    if not fingerprint:
+        return None
+    entry = store.latest(token, task=task_name, fingerprint=fingerprint)
+    if entry is None:
+        return None
+    try:
+        return store.read(entry)
+    except OSError:
+        return None
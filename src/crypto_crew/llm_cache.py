@@ -0,0 +1,267 @@
+### src/crypto_crew/llm_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from crewai import LLM
+from src.crypto_crew.tools.endpoints import openai_api_base
+from src.crypto_crew.tools.compaction import count_tokens
+from src.crypto_crew.tracing import span
+from src.crypto_crew.usage import (
+    FORCE_FINAL_ANSWER, agent_budget, budget_final_answer, current_usage, get_usage_ledger, trim_messages
+)
+
+logger = logging.getLogger(__name__)
+
+# Модель агентов по умолчанию (та же переменная, что читает crewai)
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+
+DEFAULT_CACHE_PATH = "./tmp/llm_cache.sqlite3"
+
+# Время жизни ответа (в секундах) и максимальное число записей (старые вытесняются по LRU)
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+# Агенты, ответы которых не кэшируются (через запятую), например LLM_CACHE_OPT_OUT=researcher
+LLM_CACHE_OPT_OUT = {
+    name.strip() for name in os.getenv("LLM_CACHE_OPT_OUT", "").split(",") if name.strip()
+}
+
+
+class LLMResponseCache:
+    """
+    Постоянный кэш ответов LLM в SQLite с точным совпадением запроса.
+
+    Записи старше TTL не используются; при превышении max_entries
+    удаляются записи, к которым дольше всего не обращались.
+    """
+
+    def __init__(self, path: str = None, ttl: int = None, max_entries: int = None, enabled: bool = None):
+        self.path = os.path.abspath(path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.ttl = int(ttl if ttl is not None else os.getenv("LLM_CACHE_TTL", DEFAULT_TTL))
+        self.max_entries = int(max_entries if max_entries is not None
+                               else os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        if enabled is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открывает соединение с базой кэша и создает таблицу при первом обращении.
+        """
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " used_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(request: dict) -> str:
+        """
+        Строит ключ кэша по параметрам запроса.
+
+        Args:
+            request (dict): Модель, сообщения, схема инструментов и параметры генерации.
+
+        Returns:
+            str: SHA-256 от канонического JSON запроса.
+        """
+        raw = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Возвращает сохраненный ответ, если он не старше TTL.
+
+        Args:
+            key (str): Ключ запроса.
+
+        Returns:
+            str | None: Ответ модели или None при промахе.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """
+        Сохраняет ответ и вытесняет лишние записи по LRU.
+
+        Args:
+            key (str): Ключ запроса.
+            model (str): Имя модели.
+            response (str): Ответ модели.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            # Сначала удаляются записи старше TTL, затем - давно не использованные
+            evicted = conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)).rowcount
+            evicted += conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            conn.commit()
+            self.evictions += evicted
+
+    def clear(self) -> int:
+        """
+        Удаляет все записи кэша.
+
+        Returns:
+            int: Количество удаленных записей.
+        """
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute("DELETE FROM responses").rowcount
+            conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики обращений к кэшу в текущем процессе.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Возвращает общий для процесса кэш ответов LLM.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
+
+
+class CachedLLM(LLM):
+    """
+    LLM crewai с кэшированием ответов.
+
+    Ключ - модель, сообщения (включая описание инструментов в промпте агента),
+    схема инструментов и параметры, влияющие на ответ.
+    """
+
+    def __init__(self, model: str = None, cache: LLMResponseCache = None, use_cache: bool = True,
+                 agent_name: str = None, **kwargs):
+        super().__init__(model=model or DEFAULT_MODEL, **kwargs)
+        self.cache = cache
+        self.use_cache = use_cache
+        self.agent_name = agent_name
+
+    def _cache_request(self, messages: list) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "tools": self.kwargs.get("tools"),
+            "tool_choice": self.kwargs.get("tool_choice"),
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "response_format": self.response_format,
+            "seed": self.seed,
+        }
+
+    def call(self, messages: list, callbacks: list = []) -> str:
+        budget = agent_budget(self.agent_name)
+        usage = current_usage()
+        with span("llm.call", model=self.model, agent=self.agent_name) as current:
+            messages, trimmed = trim_messages(messages, budget.max_prompt_tokens)
+            forced = False
+            started = time.perf_counter()
+            if usage is not None and usage.forced:
+                # Агент продолжил вызывать инструменты после требования завершить задачу
+                response, cached = budget_final_answer(messages), True
+            else:
+                if usage is not None and usage.exhausted(budget):
+                    logger.warning(f"Бюджет задачи {usage.task} исчерпан ({self.agent_name}): запрошен Final Answer")
+                    messages = messages + [{"role": "user", "content": FORCE_FINAL_ANSWER}]
+                    usage.forced = forced = True
+                response, cached = self._call(messages, callbacks)
+            latency = time.perf_counter() - started
+
+            # Токены считаются локальным токенизатором: crewai возвращает только текст ответа
+            prompt_tokens = count_tokens("\n".join(str(m.get("content", "")) for m in messages))
+            completion_tokens = count_tokens(response or "")
+            if usage is not None:
+                usage.calls += 1
+                usage.tokens += prompt_tokens + completion_tokens
+            get_usage_ledger().record(
+                usage.token if usage else None, self.agent_name, usage.task if usage else None, self.model,
+                prompt_tokens, completion_tokens, latency, cached=cached, trimmed=trimmed, forced=forced
+            )
+            current.set(cached=cached, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                        trimmed_messages=trimmed, forced_answer=forced)
+            return response
+
+    def _call(self, messages: list, callbacks: list) -> tuple:
+        cache = self.cache or get_llm_cache()
+        if not (self.use_cache and cache.enabled):
+            return super().call(messages, callbacks), False
+
+        key = cache.make_key(self._cache_request(messages))
+        response = cache.get(key)
+        if response is not None:
+            logger.info(f"LLM cache hit: {self.model}")
+            return response, True
+
+        response = super().call(messages, callbacks)
+        if response:
+            cache.put(key, self.model, response)
+        return response, False
+
+
+def cached_llm(agent_name: str, model: str = None, **kwargs) -> CachedLLM:
+    """
+    Создает LLM для агента с учетом списка исключений LLM_CACHE_OPT_OUT.
+
+    Args:
+        agent_name (str): Имя агента из agents.yaml.
+        model (str): Модель (по умолчанию OPENAI_MODEL_NAME или gpt-4o-mini).
+        **kwargs: Параметры crewai.LLM (base_url по умолчанию - OPENAI_API_BASE).
+
+    Returns:
+        CachedLLM: LLM с кэшем ответов (или без него для исключенных агентов).
+    """
+    kwargs.setdefault("base_url", openai_api_base())
+    return CachedLLM(model=model, use_cache=agent_name not in LLM_CACHE_OPT_OUT, agent_name=agent_name, **kwargs)
@@ -1,7 +1,6 @@
 ### src/cryptocrew/main.py
 
 import sys
-from crypto_crew.crew import CryptocrewCrew
 from crypto_crew.tools.get_metadata import GetCoinMetadata
 import os
 from dotenv import load_dotenv
@@ -20,9 +19,16 @@ def run():
     Run the crew.
     """
 
+    logging.basicConfig(level=logging.INFO)
     coin_symbol = input("Введите символ или название криптовалюты (например, BTC, ETH, TON): ")
 
-    metadata = GetCoinMetadata.save_dataset.invoke(coin_symbol)
+    metadata = GetCoinMetadata.save_dataset(coin_symbol)
+    if not metadata:
+        print(f"Метаданные для {coin_symbol} не найдены")
+        return
+
+    # crewai_tools и инструменты загружаются только после успешного поиска токена
+    from crypto_crew.crew import CryptocrewCrew
 
     inputs = {
         'coin_symbol': coin_symbol,
@@ -0,0 +1,104 @@
+### src/crypto_crew/prefetch.py
+
+import os
+import logging
+from src.crypto_crew.tools.fan_out import run_with_deadline
+from src.crypto_crew.tools.get_tokenomic_links import get_link_resolver
+from src.crypto_crew.tools.get_vesting_tool import GetVestingTool
+from src.crypto_crew.tools.get_fundraising_tool import GetFundraisingTool
+from src.crypto_crew.tools.web_search import WebSearchTool
+from src.crypto_crew.tools.ingestion import NOT_INGESTED, prepare_documents
+from src.crypto_crew.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Собирать сырые данные до запуска агентов (0 - агенты получают данные сами через инструменты)
+PREFETCH_ENABLED = os.getenv("CRYPTO_CREW_PREFETCH", "1").lower() not in ("0", "false", "no")
+
+# Общий дедлайн этапа предварительной загрузки (в секундах)
+PREFETCH_DEADLINE = float(os.getenv("CRYPTO_CREW_PREFETCH_DEADLINE", "120"))
+
+# Текст, который получает агент, если данные не были загружены заранее
+NOT_PREFETCHED = {
+    "tokenomic_links": "Ссылки не были загружены заранее.",
+    "vesting_data": "Данные о вестинге не были загружены заранее. Получите их с помощью инструмента get_vesting_tool.",
+    "fundraising_data": "Данные о финансировании не были загружены заранее. Получите их с помощью инструмента get_fundraising_tool.",
+    "search_results": "Результаты поиска не были загружены заранее. Выполните поиск с помощью инструмента 'search technology'.",
+    "documents": NOT_INGESTED,
+}
+
+
+def _links(token_name: str) -> str:
+    """
+    Находит страницы токена на Dropstab и Cryptorank.
+
+    Ссылки кэшируются резолвером, поэтому загрузка вестинга и финансирования
+    использует уже найденные адреса.
+    """
+    resolver = get_link_resolver()
+    results = run_with_deadline({
+        "Dropstab": lambda: resolver.resolve("dropstab", token_name),
+        "Cryptorank": lambda: resolver.resolve("cryptorank", token_name),
+    })
+    return "\n".join(
+        f"{source}: {'не найдено' if isinstance(url, Exception) else url}"
+        for source, url in results.items()
+    )
+
+
+def _source_data(tool, token_name: str) -> str:
+    """
+    Получает данные инструмента с несколькими источниками (вестинг, финансирование).
+
+    Инструмент при ошибке возвращает текст ошибки как обычный результат, поэтому
+    предварительная загрузка вызывает fetch напрямую: если не ответил ни один
+    источник, данные считаются не загруженными, и агент получит подсказку
+    вызвать инструмент сам.
+
+    Raises:
+        LookupError: Если ни один источник не вернул данные.
+    """
+    with span(f"tool.{tool.name}"):
+        results = tool.fetch(token_name)
+        if all(isinstance(result, Exception) for result in results.values()):
+            raise LookupError(f"{tool.name}: ни один источник не вернул данные")
+        return tool.format(results)
+
+
+def prefetch(token_name: str, deadline: float = None, token: str = None, documents: list = None) -> dict:
+    """
+    Параллельно собирает сырые данные, которые нужны каждой ветке анализа.
+
+    Ошибка или таймаут одного источника не прерывает остальные: вместо данных
+    в результат попадает подсказка агенту получить их через инструмент.
+
+    Args:
+        token_name (str): Название токена (из метаданных CoinMarketCap).
+        deadline (float): Дедлайн в секундах (по умолчанию PREFETCH_DEADLINE).
+        token (str): Символ токена (коллекция для индексации документов).
+        documents (list): Адреса сайта и whitepaper для индексации.
+
+    Returns:
+        dict: tokenomic_links, vesting_data, fundraising_data, search_results, documents -> текст.
+    """
+    if not PREFETCH_ENABLED or not token_name:
+        return dict(NOT_PREFETCHED)
+
+    deadline = PREFETCH_DEADLINE if deadline is None else deadline
+    results = run_with_deadline({
+        "tokenomic_links": lambda: _links(token_name),
+        "vesting_data": lambda: _source_data(GetVestingTool(), token_name),
+        "fundraising_data": lambda: _source_data(GetFundraisingTool(), token_name),
+        "search_results": lambda: WebSearchTool().run(token_name),
+        # Дедлайн индексации чуть меньше общего, чтобы успели отобраться уже проиндексированные фрагменты
+        "documents": lambda: prepare_documents(token or token_name, documents or [], deadline=0.8 * deadline),
+    }, deadline=deadline)
+
+    data = {}
+    for name, result in results.items():
+        if isinstance(result, Exception) or not result:
+            logger.error(f"Предварительная загрузка {name} не удалась: {result}")
+            data[name] = NOT_PREFETCHED[name]
+        else:
+            data[name] = result
+    return data
@@ -0,0 +1,289 @@
+### src/crypto_crew/report_store.py
+
+import os
+import json
+import time
+import uuid
+import shutil
+import argparse
+import tempfile
+import threading
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORTS_DIR = "./reports"
+
+INDEX_FILE = "index.jsonl"
+
+# Политика хранения: сколько последних запусков держать на токен и максимальный возраст (0 - без ограничения)
+DEFAULT_KEEP_RUNS = 10
+DEFAULT_MAX_AGE_DAYS = 90
+
+
+def new_run_id() -> str:
+    """
+    Возвращает идентификатор запуска: время и случайный суффикс (сортируется по времени).
+    """
+    return f"{datetime.now():%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def atomic_write(path: str, content: str) -> None:
+    """
+    Записывает файл атомарно: во временный файл рядом и os.replace.
+
+    Args:
+        path (str): Путь к файлу.
+        content (str): Содержимое.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ReportStore:
+    """
+    Хранилище отчетов по токенам с индексом JSON-lines.
+
+    Отчеты лежат в <root>/<TOKEN>/<date>/<run_id>/<файл>, каждая запись
+    в index.jsonl описывает один файл отчета: токен, дату, запуск, задачу,
+    путь и отпечаток входных данных.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = os.path.abspath(root or os.getenv("CRYPTO_CREW_REPORTS_DIR", DEFAULT_REPORTS_DIR))
+        self.index_path = os.path.join(self.root, INDEX_FILE)
+        self._lock = threading.Lock()
+
+    def run_dir(self, token: str, date: str, run_id: str) -> str:
+        return os.path.join(self.root, token.upper(), date, run_id)
+
+    def write(self, token: str, date: str, run_id: str, name: str, content: str,
+              task: str = None, fingerprint: str = None) -> str:
+        """
+        Сохраняет отчет и добавляет запись в индекс.
+
+        Args:
+            token (str): Символ токена.
+            date (str): Дата запуска (YYYY-MM-DD).
+            run_id (str): Идентификатор запуска.
+            name (str): Имя файла отчета (например, '1. Metadata.md').
+            content (str): Текст отчета.
+            task (str): Имя задачи в tasks.yaml.
+            fingerprint (str): Отпечаток входных данных задачи.
+
+        Returns:
+            str: Путь к сохраненному отчету.
+        """
+        path = os.path.join(self.run_dir(token, date, run_id), name)
+        atomic_write(path, content)
+
+        entry = {
+            "token": token.upper(),
+            "date": date,
+            "run_id": run_id,
+            "task": task,
+            "file": name,
+            "path": os.path.relpath(path, self.root),
+            "fingerprint": fingerprint,
+            "created_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            # Одна запись в режиме O_APPEND - строки разных процессов не перемешиваются
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return path
+
+    def entries(self) -> list:
+        """
+        Читает все записи индекса в порядке добавления.
+        """
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+
+        result = []
+        for line in lines:
+            try:
+                result.append(json.loads(line))
+            except ValueError:
+                # Оборванная строка после аварийного завершения
+                continue
+        return result
+
+    def latest(self, token: str, task: str = None, fingerprint: str = None):
+        """
+        Возвращает последнюю запись индекса для токена.
+
+        Args:
+            token (str): Символ токена.
+            task (str): Фильтр по задаче.
+            fingerprint (str): Фильтр по отпечатку входных данных.
+
+        Returns:
+            dict | None: Запись индекса или None.
+        """
+        token = token.upper()
+        for entry in reversed(self.entries()):
+            if entry["token"] != token:
+                continue
+            if task is not None and entry.get("task") != task:
+                continue
+            if fingerprint is not None and entry.get("fingerprint") != fingerprint:
+                continue
+            if os.path.exists(self.abspath(entry)):
+                return entry
+        return None
+
+    def since(self, date: str, token: str = None) -> list:
+        """
+        Возвращает записи индекса начиная с даты.
+
+        Args:
+            date (str): Дата (YYYY-MM-DD) включительно.
+            token (str): Фильтр по токену.
+
+        Returns:
+            list of dict: Записи индекса в порядке добавления.
+        """
+        token = token.upper() if token else None
+        return [
+            entry for entry in self.entries()
+            if entry["date"] >= date and (token is None or entry["token"] == token)
+        ]
+
+    def abspath(self, entry: dict) -> str:
+        return os.path.join(self.root, entry["path"])
+
+    def read(self, entry: dict) -> str:
+        with open(self.abspath(entry), encoding="utf-8") as f:
+            return f.read()
+
+    def apply_retention(self, keep_runs: int = None, max_age_days: int = None) -> int:
+        """
+        Удаляет старые запуски и переписывает индекс.
+
+        Для каждого токена сохраняются keep_runs последних запусков, запуски
+        старше max_age_days удаляются всегда (0 - ограничение отключено).
+
+        Args:
+            keep_runs (int): Сколько последних запусков хранить на токен.
+            max_age_days (int): Максимальный возраст запуска в днях.
+
+        Returns:
+            int: Количество удаленных запусков.
+        """
+        if keep_runs is None:
+            keep_runs = int(os.getenv("REPORT_RETENTION_RUNS", DEFAULT_KEEP_RUNS))
+        if max_age_days is None:
+            max_age_days = int(os.getenv("REPORT_RETENTION_DAYS", DEFAULT_MAX_AGE_DAYS))
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d") if max_age_days else None
+
+        with self._lock:
+            entries = self.entries()
+            runs = {}
+            for entry in entries:
+                runs.setdefault(entry["token"], {}).setdefault((entry["date"], entry["run_id"]), entry["created_at"])
+
+            removed = set()
+            for token, token_runs in runs.items():
+                ordered = sorted(token_runs, key=token_runs.get, reverse=True)
+                for position, (date, run_id) in enumerate(ordered):
+                    too_many = keep_runs and position >= keep_runs
+                    too_old = cutoff is not None and date < cutoff
+                    if too_many or too_old:
+                        removed.add((token, date, run_id))
+
+            if not removed:
+                return 0
+
+            for token, date, run_id in removed:
+                shutil.rmtree(self.run_dir(token, date, run_id), ignore_errors=True)
+                # Пустые каталоги даты и токена тоже удаляются
+                parent = os.path.dirname(self.run_dir(token, date, run_id))
+                for _ in range(2):
+                    if os.path.isdir(parent) and not os.listdir(parent):
+                        os.rmdir(parent)
+                    parent = os.path.dirname(parent)
+
+            kept = [
+                entry for entry in entries
+                if (entry["token"], entry["date"], entry["run_id"]) not in removed
+            ]
+            atomic_write(self.index_path, "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in kept))
+
+        logger.info(f"Удалено запусков по политике хранения: {len(removed)}")
+        return len(removed)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    """
+    Возвращает общее для процесса хранилище отчетов.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReportStore()
+        return _store
+
+
+def main():
+    """
+    CLI хранилища отчетов: поиск последнего отчета, отчетов с даты и очистка.
+    """
+    parser = argparse.ArgumentParser(description="Хранилище отчетов по токенам")
+    parser.add_argument("--root", help="Каталог отчетов (по умолчанию CRYPTO_CREW_REPORTS_DIR)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    latest_parser = subparsers.add_parser("latest", help="Последние отчеты токена")
+    latest_parser.add_argument("token")
+    latest_parser.add_argument("--task", help="Имя задачи (например, fundraising_analysis_task)")
+
+    since_parser = subparsers.add_parser("since", help="Отчеты начиная с даты")
+    since_parser.add_argument("date", help="Дата в формате YYYY-MM-DD")
+    since_parser.add_argument("--token")
+
+    prune_parser = subparsers.add_parser("prune", help="Применить политику хранения")
+    prune_parser.add_argument("--keep-runs", type=int, default=None)
+    prune_parser.add_argument("--max-age-days", type=int, default=None)
+
+    args = parser.parse_args()
+    store = ReportStore(root=args.root)
+
+    if args.command == "latest":
+        entry = store.latest(args.token, task=args.task)
+        if entry is None:
+            print(f"Отчеты для {args.token} не найдены")
+            raise SystemExit(1)
+        # Все файлы последнего запуска, в котором есть нужная задача
+        for item in store.entries():
+            if (item["token"], item["date"], item["run_id"]) == (entry["token"], entry["date"], entry["run_id"]):
+                if args.task is None or item.get("task") == args.task:
+                    print(store.abspath(item))
+    elif args.command == "since":
+        for entry in store.since(args.date, token=args.token):
+            print(f"{entry['token']:<8} {entry['date']} {entry['run_id']:<14} {entry['path']}")
+    elif args.command == "prune":
+        removed = store.apply_retention(args.keep_runs, args.max_age_days)
+        print(f"Удалено запусков: {removed}")
+
+
+if __name__ == "__main__":
+    main()
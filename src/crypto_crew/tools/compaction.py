@@ -0,0 +1,211 @@
+# src/crypto_crew/tools/compaction.py
+
+import os
+import re
+import logging
+import threading
+from functools import lru_cache
+from src.crypto_crew.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# Бюджет токенов на ответ инструмента по умолчанию (0 - без ограничения)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("CRYPTO_CREW_TOOL_TOKEN_BUDGET", "3000"))
+
+# Бюджеты отдельных инструментов; переопределяются TOOL_TOKEN_BUDGET_<ИМЯ>,
+# например TOOL_TOKEN_BUDGET_SEARCH_TECHNOLOGY=1000
+TOOL_TOKEN_BUDGETS = {
+    "search technology": 1500,
+    "get_vesting_tool": 2500,
+    "get_fundraising_tool": 2500,
+}
+
+# Модель, по токенизатору которой считаются токены
+TOKENIZER_MODEL = os.getenv("CRYPTO_CREW_TOKENIZER_MODEL", "gpt-4o-mini")
+
+# Порог сходства (Жаккар по словам), начиная с которого результаты считаются дублями
+DEDUP_THRESHOLD = float(os.getenv("CRYPTO_CREW_DEDUP_THRESHOLD", "0.8"))
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """
+    Токенизатор модели или None, если tiktoken недоступен.
+
+    tiktoken скачивает файл кодировки при первом обращении, поэтому без сети
+    (или с поврежденным кэшем) загрузка падает не только с ImportError.
+    Результат, включая None, кэшируется: ошибка логируется один раз.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Токенизатор tiktoken не загружен, токены оцениваются как len / 4: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Считает токены текста токенизатором модели (без tiktoken - оценка len / 4).
+
+    Args:
+        text (str): Текст.
+
+    Returns:
+        int: Число токенов.
+    """
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def token_budget(tool: str) -> int:
+    """
+    Возвращает бюджет токенов инструмента.
+
+    Args:
+        tool (str): Имя инструмента (BaseTool.name).
+
+    Returns:
+        int: Бюджет в токенах (0 - без ограничения).
+    """
+    env_name = "TOOL_TOKEN_BUDGET_" + re.sub(r"\W+", "_", tool).upper()
+    value = os.getenv(env_name)
+    if value is not None:
+        return int(value)
+    return TOOL_TOKEN_BUDGETS.get(tool, DEFAULT_TOKEN_BUDGET)
+
+
+def select_fields(items: list, fields: tuple) -> list:
+    """
+    Оставляет в каждом результате только нужные непустые поля.
+
+    Args:
+        items (list): Список словарей.
+        fields (tuple): Имена полей в порядке вывода.
+
+    Returns:
+        list: Словари только с выбранными полями.
+    """
+    return [
+        {field: item[field] for field in fields if item.get(field)}
+        for item in items
+    ]
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(word.lower() for word in _WORD.findall(text))
+
+
+def dedupe(items: list, key, threshold: float = None) -> list:
+    """
+    Удаляет почти одинаковые результаты, сохраняя первый из похожих.
+
+    Похожесть - коэффициент Жаккара по множествам слов текста key(item).
+
+    Args:
+        items (list): Результаты в порядке релевантности.
+        key (callable): Функция, возвращающая сравниваемый текст.
+        threshold (float): Порог сходства (по умолчанию DEDUP_THRESHOLD).
+
+    Returns:
+        list: Результаты без дублей.
+    """
+    threshold = DEDUP_THRESHOLD if threshold is None else threshold
+    kept, seen = [], []
+    for item in items:
+        words = _words(key(item))
+        duplicate = False
+        for other in seen:
+            union = len(words | other)
+            if union and len(words & other) / union >= threshold:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(item)
+            seen.append(words)
+    return kept
+
+
+def fit_to_budget(text: str, budget: int) -> str:
+    """
+    Обрезает текст по границам строк, чтобы он уложился в бюджет токенов.
+
+    Args:
+        text (str): Текст ответа инструмента.
+        budget (int): Бюджет в токенах (0 - без ограничения).
+
+    Returns:
+        str: Текст не длиннее бюджета с пометкой об обрезке.
+    """
+    total = count_tokens(text)
+    if budget <= 0 or total <= budget:
+        return text
+
+    marker = f"\n[... обрезано до {budget} из {total} токенов]"
+    limit = budget - count_tokens(marker)
+    kept, used = [], 0
+    for line in text.splitlines(keepends=True):
+        tokens = count_tokens(line)
+        if used + tokens > limit:
+            # Одна длинная строка (JSON, шаг агента) обрезается по символам, а не отбрасывается целиком
+            if not kept and limit > 0:
+                kept.append(line[:len(line) * limit // tokens])
+            break
+        kept.append(line)
+        used += tokens
+    return "".join(kept).rstrip("\n") + marker
+
+
+def compact_output(tool: str, text: str, original_tokens: int = None) -> str:
+    """
+    Применяет бюджет инструмента и логирует сэкономленные токены.
+
+    Args:
+        tool (str): Имя инструмента.
+        text (str): Компактный ответ инструмента.
+        original_tokens (int): Размер ответа до компактизации (по умолчанию - размер text).
+
+    Returns:
+        str: Ответ, уложенный в бюджет.
+    """
+    result = fit_to_budget(text, token_budget(tool))
+    before = count_tokens(text) if original_tokens is None else original_tokens
+    after = count_tokens(result)
+    logger.info(f"{tool}: {before} -> {after} токенов (сэкономлено {before - after})")
+    current_span().set(original_tokens=before, output_tokens=after)
+
+    with _stats_lock:
+        stats = _stats.setdefault(tool, {"calls": 0, "tokens_before": 0, "tokens_after": 0})
+        stats["calls"] += 1
+        stats["tokens_before"] += before
+        stats["tokens_after"] += after
+    return result
+
+
+def compaction_stats() -> dict:
+    """
+    Возвращает накопленную статистику компактизации по инструментам.
+
+    Returns:
+        dict: Имя инструмента -> calls, tokens_before, tokens_after, tokens_saved.
+    """
+    with _stats_lock:
+        return {
+            tool: dict(stats, tokens_saved=stats["tokens_before"] - stats["tokens_after"])
+            for tool, stats in _stats.items()
+        }
@@ -0,0 +1,491 @@
+# src/crypto_crew/tools/embedding_store.py
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import logging
+from array import array
+from src.crypto_crew.tools.endpoints import openai_api_base
+from src.crypto_crew.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Коллекции Chroma (по одной на токен) и кэш эмбеддингов по хэшу содержимого
+DEFAULT_STORE_PATH = "./db"
+DEFAULT_CACHE_PATH = "./tmp/embedding_cache.sqlite3"
+
+# Время жизни эмбеддингов и проиндексированных страниц (в секундах)
+DEFAULT_TTL = 30 * 24 * 3600
+
+# Сколько фрагментов отправляется в API эмбеддингов одним запросом
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+# Размер фрагмента и перекрытие соседних фрагментов (в символах)
+CHUNK_SIZE = int(os.getenv("EMBEDDING_CHUNK_SIZE", "1500"))
+CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "200"))
+
+COLLECTION_PREFIX = "token_"
+
+
+def content_hash(text: str, model: str = "") -> str:
+    """
+    Возвращает SHA-256 фрагмента (с моделью - ключ кэша эмбеддингов).
+    """
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def chunk_id(url: str, chunk: str) -> str:
+    """
+    Возвращает идентификатор фрагмента в коллекции: у одинаковых фрагментов
+    разных страниц идентификаторы разные, а эмбеддинг общий (кэш по content_hash).
+    """
+    return content_hash(f"{url}\0{chunk}")
+
+
+def collection_name(token: str) -> str:
+    """
+    Возвращает имя коллекции Chroma для токена (3-63 символа [a-z0-9_-]).
+    """
+    name = re.sub(r"[^a-z0-9_-]+", "-", (token or "shared").lower()).strip("-_") or "shared"
+    return f"{COLLECTION_PREFIX}{name}"[:63]
+
+
+def chunk_text(text: str, size: int = None, overlap: int = None) -> list:
+    """
+    Делит текст на фрагменты по абзацам; длинные абзацы режутся с перекрытием.
+
+    Args:
+        text (str): Текст страницы.
+        size (int): Максимальный размер фрагмента в символах.
+        overlap (int): Перекрытие при разрезании длинного абзаца.
+
+    Returns:
+        list: Фрагменты без пустых и повторяющихся.
+    """
+    size = size or CHUNK_SIZE
+    overlap = min(CHUNK_OVERLAP if overlap is None else overlap, size // 2)
+    chunks, current = [], ""
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(current) + len(paragraph) + 1 <= size:
+            current = f"{current}\n{paragraph}" if current else paragraph
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        while len(paragraph) > size:
+            chunks.append(paragraph[:size])
+            paragraph = paragraph[size - overlap:]
+        current = paragraph
+    if current:
+        chunks.append(current)
+    return list(dict.fromkeys(chunks))
+
+
+def embed_texts(texts: list, model: str = None) -> list:
+    """
+    Получает эмбеддинги через litellm (OPENAI_API_BASE учитывается).
+
+    Args:
+        texts (list): Тексты.
+        model (str): Модель эмбеддингов.
+
+    Returns:
+        list: Векторы в порядке texts.
+    """
+    import litellm
+
+    response = litellm.embedding(model=model or DEFAULT_EMBEDDING_MODEL, input=texts, api_base=openai_api_base())
+    data = sorted(response.data, key=lambda item: item["index"])
+    return [item["embedding"] for item in data]
+
+
+def _url_filter(url):
+    if not url:
+        return None
+    if isinstance(url, str):
+        return {"url": url}
+    return {"url": {"$in": list(url)}} if len(url) > 1 else {"url": url[0]}
+
+
+class EmbeddingStore:
+    """
+    Эмбеддинги фрагментов страниц в коллекциях Chroma по токенам.
+
+    Эмбеддинг фрагмента кэшируется в SQLite по хэшу (модель, текст), поэтому
+    одинаковые фрагменты не отправляются в API повторно, а страница, проиндексированная
+    для токена не позже TTL назад, не скачивается и не индексируется заново.
+    """
+
+    def __init__(self, path: str = None, cache_path: str = None, model: str = None, ttl: int = None,
+                 embed=None):
+        self.path = os.path.abspath(path or os.getenv("EMBEDDING_STORE_PATH", DEFAULT_STORE_PATH))
+        self.cache_path = os.path.abspath(cache_path or os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.model = model or DEFAULT_EMBEDDING_MODEL
+        self.ttl = int(ttl if ttl is not None else os.getenv("EMBEDDING_TTL", DEFAULT_TTL))
+        self.embed_func = embed or embed_texts
+        self._lock = threading.Lock()
+        self._conn = None
+        self._client = None
+        self.hits = 0
+        self.misses = 0
+        self.api_calls = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открывает базу кэша эмбеддингов и списка проиндексированных страниц.
+        """
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " used_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " token TEXT NOT NULL,"
+                " url TEXT NOT NULL,"
+                " indexed_at REAL NOT NULL,"
+                " chunks INTEGER NOT NULL,"
+                " PRIMARY KEY (token, url))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def client(self):
+        """
+        Возвращает клиент Chroma (chromadb импортируется при первом обращении).
+        """
+        with self._lock:
+            if self._client is None:
+                import chromadb
+                from chromadb.config import Settings
+
+                self._client = chromadb.PersistentClient(
+                    path=self.path, settings=Settings(anonymized_telemetry=False)
+                )
+            return self._client
+
+    def collection(self, token: str):
+        return self.client().get_or_create_collection(collection_name(token), metadata={"hnsw:space": "cosine"})
+
+    def embed(self, texts: list) -> list:
+        """
+        Возвращает эмбеддинги текстов, запрашивая в API только отсутствующие в кэше (пачками).
+
+        Args:
+            texts (list): Тексты.
+
+        Returns:
+            list: Векторы в порядке texts.
+        """
+        keys = [content_hash(text, self.model) for text in texts]
+        vectors = {}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE created_at >= ? AND key IN ({','.join('?' * len(part))})",
+                    (now - self.ttl, *part)
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    vectors[key] = vector.tolist()
+            if vectors:
+                conn.executemany("UPDATE embeddings SET used_at = ? WHERE key = ?", [(now, key) for key in vectors])
+                conn.commit()
+
+        missing = list(dict.fromkeys(
+            (key, text) for key, text in zip(keys, texts) if key not in vectors
+        ))
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        with span("embed", model=self.model, texts=len(texts), cached=len(texts) - len(missing)):
+            for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+                batch = missing[start:start + EMBEDDING_BATCH_SIZE]
+                embedded = self.embed_func([text for _, text in batch], self.model)
+                self.api_calls += 1
+                with self._lock:
+                    conn = self._connect()
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                        [(key, self.model, array("f", vector).tobytes(), now, now)
+                         for (key, _), vector in zip(batch, embedded)]
+                    )
+                    conn.commit()
+                for (key, _), vector in zip(batch, embedded):
+                    vectors[key] = list(vector)
+        return [vectors[key] for key in keys]
+
+    def is_fresh(self, token: str, url: str) -> bool:
+        """
+        Проверяет, проиндексирована ли страница для токена не позже TTL назад.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT indexed_at FROM sources WHERE token = ? AND url = ?", (collection_name(token), url)
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl
+
+    def index(self, token: str, url: str, chunks: list) -> int:
+        """
+        Добавляет фрагменты страницы в коллекцию токена, удаляет фрагменты ее прежней
+        версии и отмечает страницу проиндексированной.
+
+        Args:
+            token (str): Символ токена (коллекция).
+            url (str): Адрес страницы.
+            chunks (list): Фрагменты текста.
+
+        Returns:
+            int: Число добавленных фрагментов.
+        """
+        added = self.add_chunks(token, url, chunks)
+        removed = self.remove_stale(token, url, [chunk_id(url, chunk) for chunk in chunks])
+        self.mark_indexed(token, url, len(chunks))
+        logger.info(f"{url}: {added} новых фрагментов из {len(chunks)}, {removed} устаревших удалено "
+                    f"({collection_name(token)})")
+        return added
+
+    def add_chunks(self, token: str, url: str, chunks: list) -> int:
+        """
+        Добавляет фрагменты в коллекцию токена.
+
+        Идентификатор фрагмента - хэш адреса и содержимого (chunk_id), поэтому уже
+        проиндексированные фрагменты страницы пропускаются без обращения к API эмбеддингов.
+
+        Args:
+            token (str): Символ токена (коллекция).
+            url (str): Адрес страницы.
+            chunks (list): Фрагменты текста.
+
+        Returns:
+            int: Число добавленных фрагментов.
+        """
+        chunks = list(dict.fromkeys(chunk for chunk in chunks if chunk.strip()))
+        collection = self.collection(token)
+        ids = [chunk_id(url, chunk) for chunk in chunks]
+        existing = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+        new = [(chunk_id, chunk) for chunk_id, chunk in zip(ids, chunks) if chunk_id not in existing]
+
+        now = time.time()
+        for start in range(0, len(new), EMBEDDING_BATCH_SIZE):
+            batch = new[start:start + EMBEDDING_BATCH_SIZE]
+            collection.add(
+                ids=[chunk_id for chunk_id, _ in batch],
+                documents=[chunk for _, chunk in batch],
+                embeddings=self.embed([chunk for _, chunk in batch]),
+                metadatas=[{"url": url, "indexed_at": now} for _ in batch],
+            )
+        return len(new)
+
+    def remove_stale(self, token: str, url: str, ids) -> int:
+        """
+        Удаляет фрагменты страницы, которых нет в ее новой версии.
+
+        Args:
+            token (str): Символ токена (коллекция).
+            url (str): Адрес страницы.
+            ids (iterable): Идентификаторы фрагментов новой версии (chunk_id).
+
+        Returns:
+            int: Число удаленных фрагментов.
+        """
+        collection = self.collection(token)
+        keep = set(ids)
+        stale = [item for item in collection.get(where={"url": url}, include=[])["ids"] if item not in keep]
+        if stale:
+            collection.delete(ids=stale)
+        return len(stale)
+
+    def mark_indexed(self, token: str, url: str, chunks: int) -> None:
+        """
+        Отмечает страницу проиндексированной: до истечения TTL она не скачивается заново.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO sources (token, url, indexed_at, chunks) VALUES (?, ?, ?, ?)",
+                (collection_name(token), url, time.time(), chunks)
+            )
+            conn.commit()
+
+    def search(self, token: str, query: str, k: int = 5, url=None) -> list:
+        """
+        Ищет фрагменты, ближайшие к запросу.
+
+        Args:
+            token (str): Символ токена (коллекция).
+            query (str): Поисковый запрос.
+            k (int): Число фрагментов.
+            url (str | list): Искать только во фрагментах этой страницы (или этих страниц).
+
+        Returns:
+            list of dict: text, url, distance - по возрастанию расстояния.
+        """
+        collection = self.collection(token)
+        result = collection.query(
+            query_embeddings=self.embed([query]),
+            n_results=k,
+            where=_url_filter(url),
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            {"text": text, "url": (metadata or {}).get("url"), "distance": distance}
+            for text, metadata, distance in zip(
+                result["documents"][0], result["metadatas"][0], result["distances"][0]
+            )
+        ]
+
+    def compact(self, ttl: int = None, vacuum: bool = False) -> dict:
+        """
+        Удаляет просроченные эмбеддинги и страницы, пустые коллекции токенов и сжимает базы.
+
+        Args:
+            ttl (int): Время жизни в секундах (по умолчанию EMBEDDING_TTL).
+            vacuum (bool): Выполнить VACUUM базы Chroma (другие процессы не должны с ней работать).
+
+        Returns:
+            dict: Число удаленных эмбеддингов, страниц и коллекций.
+        """
+        cutoff = time.time() - (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._connect()
+            embeddings = conn.execute("DELETE FROM embeddings WHERE used_at < ?", (cutoff,)).rowcount
+            expired = conn.execute("SELECT token, url FROM sources WHERE indexed_at < ?", (cutoff,)).fetchall()
+            conn.execute("DELETE FROM sources WHERE indexed_at < ?", (cutoff,))
+            conn.commit()
+            conn.execute("VACUUM")
+
+        client = self.client()
+        names = self._collection_names()
+        for name, url in expired:
+            if name in names:
+                client.get_collection(name).delete(where={"url": url})
+
+        collections = 0
+        for name in names:
+            if client.get_collection(name).count() == 0:
+                client.delete_collection(name)
+                collections += 1
+
+        if vacuum:
+            chroma_db = os.path.join(self.path, "chroma.sqlite3")
+            if os.path.exists(chroma_db):
+                with sqlite3.connect(chroma_db) as chroma_conn:
+                    chroma_conn.execute("VACUUM")
+        return {"embeddings": embeddings, "pages": len(expired), "collections": collections}
+
+    def purge(self, token: str) -> int:
+        """
+        Удаляет коллекцию токена и список ее страниц.
+
+        Returns:
+            int: Число удаленных страниц.
+        """
+        name = collection_name(token)
+        with self._lock:
+            conn = self._connect()
+            pages = conn.execute("DELETE FROM sources WHERE token = ?", (name,)).rowcount
+            conn.commit()
+        if name in self._collection_names():
+            self.client().delete_collection(name)
+        return pages
+
+    def _collection_names(self) -> list:
+        # chromadb < 0.6 возвращает объекты коллекций, новые версии - имена
+        names = [getattr(collection, "name", collection) for collection in self.client().list_collections()]
+        return sorted(name for name in names if name.startswith(COLLECTION_PREFIX))
+
+    def collections(self) -> dict:
+        """
+        Возвращает коллекции токенов и число фрагментов в них.
+        """
+        client = self.client()
+        return {name: client.get_collection(name).count() for name in self._collection_names()}
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики кэша эмбеддингов в текущем процессе.
+        """
+        return {"hits": self.hits, "misses": self.misses, "api_calls": self.api_calls}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """
+    Возвращает общее для процесса хранилище эмбеддингов.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+        return _store
+
+
+def embedding_stats() -> dict:
+    """
+    Возвращает счетчики кэша эмбеддингов или пустой словарь, если хранилище еще не создавалось.
+    """
+    return _store.stats() if _store is not None else {}
+
+
+def main():
+    """
+    CLI для просмотра и сжатия хранилища эмбеддингов.
+    """
+    parser = argparse.ArgumentParser(description="Хранилище эмбеддингов страниц по токенам")
+    parser.add_argument("--path", help="Каталог Chroma (по умолчанию EMBEDDING_STORE_PATH или ./db)")
+    parser.add_argument("--cache-path", help="База кэша эмбеддингов (по умолчанию EMBEDDING_CACHE_PATH)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="Показать коллекции токенов")
+
+    compact_parser = subparsers.add_parser("compact", help="Удалить просроченные данные и сжать базы")
+    compact_parser.add_argument("--ttl-days", type=float, help="Время жизни в днях (по умолчанию EMBEDDING_TTL)")
+    compact_parser.add_argument("--vacuum", action="store_true", help="Также выполнить VACUUM базы Chroma")
+
+    purge_parser = subparsers.add_parser("purge", help="Удалить коллекцию токена")
+    purge_parser.add_argument("token")
+
+    args = parser.parse_args()
+    store = EmbeddingStore(path=args.path, cache_path=args.cache_path)
+
+    if args.command == "list":
+        collections = store.collections()
+        for name, count in collections.items():
+            print(f"{name:<40} {count:>8} фрагментов")
+        print(f"Всего коллекций: {len(collections)}")
+    elif args.command == "compact":
+        ttl = int(args.ttl_days * 24 * 3600) if args.ttl_days is not None else None
+        result = store.compact(ttl=ttl, vacuum=args.vacuum)
+        print(
+            f"Удалено эмбеддингов: {result['embeddings']}, страниц: {result['pages']}, "
+            f"коллекций: {result['collections']}"
+        )
+    elif args.command == "purge":
+        print(f"Удалено страниц: {store.purge(args.token)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# src/crypto_crew/tools/endpoints.py
+
+import os
+
+# Адреса внешних сервисов по умолчанию. Каждый переопределяется переменной окружения,
+# например для локальных заглушек (python -m benchmarks.stub_services).
+DEFAULT_CMC_API_BASE_URL = "https://pro-api.coinmarketcap.com"
+DEFAULT_SERPER_API_URL = "https://google.serper.dev"
+DEFAULT_RENDER_PROXY_URL = "http://212.113.117.33:8080"
+
+
+def _base(env_name: str, default: str) -> str:
+    return (os.getenv(env_name) or default).rstrip("/")
+
+
+def cmc_api_url(path: str) -> str:
+    """
+    Возвращает адрес метода CoinMarketCap API (CMC_API_BASE_URL).
+
+    Args:
+        path (str): Путь метода, например '/v2/cryptocurrency/info'.
+
+    Returns:
+        str: Полный URL.
+    """
+    return _base("CMC_API_BASE_URL", DEFAULT_CMC_API_BASE_URL) + path
+
+
+def serper_url(path: str = "/search") -> str:
+    """
+    Возвращает адрес метода Serper API (SERPER_API_URL).
+
+    Args:
+        path (str): Путь метода.
+
+    Returns:
+        str: Полный URL.
+    """
+    return _base("SERPER_API_URL", DEFAULT_SERPER_API_URL) + path
+
+
+def render_proxy_url() -> str:
+    """
+    Возвращает адрес прокси рендеринга (RENDER_PROXY_URL).
+    """
+    return _base("RENDER_PROXY_URL", DEFAULT_RENDER_PROXY_URL)
+
+
+def render_proxy_urls() -> list:
+    """
+    Возвращает адреса пула прокси рендеринга: RENDER_PROXY_URLS через запятую,
+    без нее - единственный адрес RENDER_PROXY_URL.
+    """
+    urls = [url.strip().rstrip("/") for url in os.getenv("RENDER_PROXY_URLS", "").split(",") if url.strip()]
+    return list(dict.fromkeys(urls)) or [render_proxy_url()]
+
+
+def openai_api_base():
+    """
+    Возвращает адрес OpenAI-совместимого API (OPENAI_API_BASE) или None для адреса по умолчанию.
+    """
+    value = os.getenv("OPENAI_API_BASE") or os.getenv("OPENAI_BASE_URL")
+    return value.rstrip("/") if value else None
@@ -0,0 +1,300 @@
+# src/crypto_crew/tools/extraction.py
+
+import os
+import yaml
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+from src.crypto_crew.tools.html_parser import strainer
+from src.crypto_crew.tracing import span
+
+# Путь к схемам извлечения (по умолчанию config/extraction.yaml пакета)
+EXTRACTION_SPEC_PATH = os.getenv(
+    "CRYPTO_CREW_EXTRACTION_SPEC",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "extraction.yaml")
+)
+
+_REQUIRED = object()
+
+TEXT_MODES = {
+    "strip": lambda element: element.get_text(strip=True),
+    "trim": lambda element: element.get_text().strip(),
+    "raw": lambda element: element.get_text(),
+}
+
+TRANSFORMS = {
+    "first_word": lambda text: text.split()[0],
+}
+
+
+class ExtractionError(ValueError):
+    """
+    Обязательный элемент не найден на странице.
+    """
+
+
+class FieldSpec:
+    """
+    Скомпилированное описание одного поля записи.
+    """
+
+    __slots__ = ("name", "path", "cell", "index", "all", "join", "text",
+                 "default", "empty_default", "transform", "split", "into")
+
+    def __init__(self, name: str, config: dict):
+        select = config.get("select") or []
+        if isinstance(select, str):
+            select = [select]
+        self.name = name
+        self.path = [soupsieve.compile(selector) for selector in select]
+        self.cell = config.get("cell")
+        self.index = config.get("index", 0)
+        self.all = config.get("all", False)
+        self.join = config.get("join", ", ")
+        self.text = TEXT_MODES[config.get("text", "strip")]
+        self.default = config.get("default", _REQUIRED)
+        self.empty_default = config.get("empty_default", False)
+        self.transform = TRANSFORMS[config["transform"]] if config.get("transform") else None
+        self.split = config.get("split")
+        self.into = config.get("into") or [name]
+
+    def _missing(self, where: str):
+        if self.default is _REQUIRED:
+            raise ExtractionError(f"Поле {self.name}: элемент не найден ({where})")
+        return self.default
+
+    def _locate(self, node: Tag):
+        """
+        Проходит цепочку селекторов и возвращает целевой элемент или None.
+        """
+        last = len(self.path) - 1
+        for step, pattern in enumerate(self.path):
+            if step == last and self.index != 0:
+                matches = pattern.select(node)
+                try:
+                    node = matches[self.index]
+                except IndexError:
+                    return None
+            else:
+                node = pattern.select_one(node)
+            if node is None:
+                return None
+        return node
+
+    def extract(self, node: Tag, cells: list, record: dict) -> None:
+        """
+        Извлекает значение поля и записывает его в record.
+
+        Args:
+            node (Tag): Элемент записи.
+            cells (list): Ячейки строки (если запись - строка таблицы).
+            record (dict): Словарь, в который записываются значения.
+        """
+        if self.cell is not None:
+            node = cells[self.cell]
+
+        if self.all:
+            texts = [self.text(element) for element in self.path[-1].select(node)]
+            record[self.name] = self.join.join(texts) if texts else self._missing(self.name)
+            return
+
+        element = self._locate(node) if self.path else node
+        if element is None:
+            value = self._missing(self.name)
+            for name in self.into:
+                record[name] = value
+            return
+
+        if self.empty_default and not element.get_text():
+            value = self._missing(self.name)
+        else:
+            value = self.text(element)
+            if self.transform is not None:
+                value = self.transform(value)
+
+        if self.split is None:
+            record[self.name] = value
+            return
+
+        if self.split in value:
+            parts = value.split(self.split, len(self.into) - 1)
+        else:
+            parts = [value]
+        parts += [self.default] * (len(self.into) - len(parts))
+        for name, part in zip(self.into, parts):
+            record[name] = part
+
+
+class RecordSpec:
+    """
+    Скомпилированное описание набора однотипных записей на странице.
+    """
+
+    __slots__ = ("name", "anchor", "anchor_contains", "container", "select",
+                 "cells", "cell_count", "min_cells", "fields")
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        anchor = config.get("anchor")
+        self.anchor = soupsieve.compile(anchor["select"]) if anchor else None
+        self.anchor_contains = anchor.get("contains") if anchor else None
+        self.container = [
+            (kind, soupsieve.compile(selector))
+            for step in config.get("container", [])
+            for kind, selector in step.items()
+        ]
+        self.select = soupsieve.compile(config["select"])
+        self.cells = soupsieve.compile(config["cells"]) if config.get("cells") else None
+        self.cell_count = config.get("cell_count")
+        self.min_cells = config.get("min_cells")
+        self.fields = [FieldSpec(field, field_config) for field, field_config in config["fields"].items()]
+
+    def _find_anchor(self, soup: BeautifulSoup):
+        for element in self.anchor.select(soup):
+            if element.string and self.anchor_contains in element.string:
+                return element
+        return None
+
+    def _find_container(self, soup: BeautifulSoup):
+        """
+        Находит контейнер записей: от якоря через шаги parent/next/select.
+        """
+        if self.anchor is None:
+            node = soup
+        else:
+            node = self._find_anchor(soup)
+
+        for kind, pattern in self.container:
+            if node is None:
+                return None
+            if kind == "parent":
+                node = next((parent for parent in node.parents if pattern.match(parent)), None)
+            elif kind == "next":
+                node = next(
+                    (element for element in node.next_elements
+                     if isinstance(element, Tag) and pattern.match(element)),
+                    None
+                )
+            else:
+                node = pattern.select_one(node)
+        return node
+
+    def extract(self, soup: BeautifulSoup) -> list:
+        """
+        Извлекает все записи набора из документа.
+
+        Args:
+            soup (BeautifulSoup): Разобранная страница.
+
+        Returns:
+            list of dict: Записи с полями, описанными в схеме.
+        """
+        container = self._find_container(soup)
+        if container is None:
+            return []
+
+        records = []
+        for node in self.select.select(container):
+            cells = None
+            if self.cells is not None:
+                cells = self.cells.select(node)
+                if self.cell_count is not None and len(cells) != self.cell_count:
+                    continue
+                if self.min_cells is not None and len(cells) < self.min_cells:
+                    continue
+
+            record = {}
+            for field in self.fields:
+                field.extract(node, cells, record)
+            records.append(record)
+        return records
+
+
+class PageSpec:
+    """
+    Скомпилированная схема страницы: все наборы записей и фильтр разбора.
+    """
+
+    __slots__ = ("name", "records", "parse_only")
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.records = {record: RecordSpec(record, record_config)
+                        for record, record_config in config["records"].items()}
+        parse_only = config.get("parse_only")
+        self.parse_only = strainer(
+            [item["tag"] for item in parse_only],
+            [item["class"] for item in parse_only]
+        ) if parse_only else None
+
+    def extract(self, soup: BeautifulSoup) -> dict:
+        """
+        Извлекает все наборы записей страницы за один проход.
+
+        Args:
+            soup (BeautifulSoup): Разобранная страница.
+
+        Returns:
+            dict: Имя набора -> список записей.
+        """
+        return {name: record.extract(soup) for name, record in self.records.items()}
+
+
+def load_specs(path: str = EXTRACTION_SPEC_PATH) -> dict:
+    """
+    Загружает и компилирует схемы извлечения из YAML.
+
+    Args:
+        path (str): Путь к YAML со схемами.
+
+    Returns:
+        dict: Имя страницы -> PageSpec.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    return {page: PageSpec(page, page_config) for page, page_config in config.items()}
+
+
+# Схемы компилируются один раз при импорте модуля
+SPECS = load_specs()
+
+
+def extract(page: str, soup: BeautifulSoup) -> dict:
+    """
+    Извлекает все наборы записей страницы.
+
+    Args:
+        page (str): Имя страницы в схеме (например, 'dropstab_vesting').
+        soup (BeautifulSoup): Разобранная страница.
+
+    Returns:
+        dict: Имя набора -> список записей.
+    """
+    with span("parse.extract", page=page) as current:
+        records = SPECS[page].extract(soup)
+        current.set(records=sum(len(items) for items in records.values()))
+        return records
+
+
+def extract_records(page: str, record: str, soup: BeautifulSoup) -> list:
+    """
+    Извлекает один набор записей страницы.
+
+    Args:
+        page (str): Имя страницы в схеме.
+        record (str): Имя набора записей.
+        soup (BeautifulSoup): Разобранная страница.
+
+    Returns:
+        list of dict: Записи набора.
+    """
+    with span("parse.extract", page=page, record=record) as current:
+        records = SPECS[page].records[record].extract(soup)
+        current.set(records=len(records))
+        return records
+
+
+def page_strainer(page: str):
+    """
+    Возвращает фильтр разбора страницы (None, если страница строится целиком).
+    """
+    return SPECS[page].parse_only
@@ -0,0 +1,48 @@
+# src/crypto_crew/tools/fan_out.py
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.crypto_crew.tracing import run_in_context
+
+logger = logging.getLogger(__name__)
+
+# Общий дедлайн (в секундах) для параллельных запросов внутри одного инструмента
+TOOL_DEADLINE = float(os.getenv("CRYPTO_CREW_TOOL_DEADLINE", "45"))
+
+
+def run_with_deadline(jobs: dict, deadline: float = None) -> dict:
+    """
+    Запускает независимые задачи параллельно и ждет их не дольше дедлайна.
+
+    Задачи, не успевшие завершиться к дедлайну, продолжают работать в фоне,
+    но их результат игнорируется.
+
+    Args:
+        jobs (dict): Имя задачи -> функция без аргументов.
+        deadline (float): Дедлайн в секундах (по умолчанию TOOL_DEADLINE).
+
+    Returns:
+        dict: Имя задачи -> результат или исключение (TimeoutError для незавершенных).
+    """
+    if deadline is None:
+        deadline = TOOL_DEADLINE
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(jobs)), thread_name_prefix="fan-out")
+    try:
+        # Спаны задач становятся дочерними для спана вызывающего инструмента
+        futures = {name: executor.submit(run_in_context(job)) for name, job in jobs.items()}
+        wait(futures.values(), timeout=deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, future in futures.items():
+        if future.cancelled() or not future.done():
+            logger.warning(f"Задача {name} не завершилась за {deadline} с")
+            results[name] = TimeoutError(f"{name}: превышен дедлайн {deadline} с")
+        elif future.exception() is not None:
+            results[name] = future.exception()
+        else:
+            results[name] = future.result()
+    return results
@@ -1,6 +1,15 @@
 # src/crypto_crew/tools/get_fundraising_tool.py
 
-from src.crypto_crew.tools.get_tokenomic_links import GetTokenomicLinks
+from src.crypto_crew.tools.get_tokenomic_links import get_link_resolver
+from src.crypto_crew.tools.fan_out import run_with_deadline
+from src.crypto_crew.tools.render_proxy import render_page
+from src.crypto_crew.tools.http_client import get_session
+from src.crypto_crew.tools.html_parser import make_soup
+from src.crypto_crew.tools.extraction import extract, extract_records, page_strainer
+from src.crypto_crew.tools.records import FundingRound, FundraisingReport, Investor, Value
+from src.crypto_crew.tools.markdown import render_fundraising
+from src.crypto_crew.tools.compaction import compact_output
+from src.crypto_crew.tracing import traced
 import json
 import html
 import requests
@@ -8,17 +17,18 @@ from bs4 import BeautifulSoup
 from crewai_tools import BaseTool
 import logging
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# При разборе строятся только карточки раундов и строки инвесторов
+DROPSTAB_FUNDRAISING_STRAINER = page_strainer("dropstab_fundraising")
+
 
 class DropstabFundraisingFetcher:
     """
     Класс для получения и парсинга данных о финансировании из Dropstab.
     """
 
-    def __init__(self, base_url: str = "http://212.113.117.33:8080"):
+    def __init__(self, base_url: str = None):
         self.base_url = base_url
 
     def get_html(self, token_drop_url: str) -> str:
@@ -32,9 +42,6 @@ class DropstabFundraisingFetcher:
             str: HTML содержимое.
         """
         url = f"https://dropstab.com/coins/{token_drop_url}/fundraising"
-        headers = {
-            "Content-Type": "application/json"
-        }
 
         payload = {
             "goto": url,
@@ -43,14 +50,9 @@ class DropstabFundraisingFetcher:
         }
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                data=json.dumps(payload)
+            response_data = json.loads(
+                render_page(self.base_url, payload, source="dropstab", page="fundraising")
             )
-            logger.info(f"Dropstab Fundraising, status: {response.status_code}")
-            response.raise_for_status()
-            response_data = response.json()
             html_content = html.unescape(response_data.get('data', ''))
             return html_content
         except requests.HTTPError:
@@ -62,50 +64,78 @@ class DropstabFundraisingFetcher:
 
     def parse_fundraising_rounds(self, soup: BeautifulSoup) -> list:
         """
-        Извлекает и форматирует информацию о раундах инвестирования.
+        Извлекает информацию о раундах инвестирования.
 
         Args:
             soup (BeautifulSoup): HTML контент.
 
         Returns:
-            list: Отформатированные раунды финансирования.
+            list of FundingRound: Раунды финансирования.
         """
-        rounds = []
-        for div in soup.find_all(
-            'div',
-            class_="group relative flex flex-col gap-y-4 rounded-2xl p-4 shadow-md hover:bg-gray-100 active:bg-gray-200 dark:bg-zinc-800 dark:shadow-black dark:hover:bg-zinc-700 dark:active:bg-zinc-600"
-        ):
-            round_name = div.find('h2').get_text(strip=True)
-            date = div.find('span', class_="text-gray-900 dark:text-white").get_text(strip=True)
-            funds_raised = div.find_all('span', class_="text-gray-900 dark:text-white")[-1].get_text(strip=True)
-
-            rounds.append(f"Раунд: {round_name}, Дата: {date}, Собрано средств: {funds_raised}")
-
-        return rounds
+        return self._round_rows(extract_records("dropstab_fundraising", "rounds", soup))
 
     def parse_investors(self, soup: BeautifulSoup) -> list:
         """
-        Извлекает и форматирует информацию об инвесторах.
+        Извлекает информацию об инвесторах.
 
         Args:
             soup (BeautifulSoup): HTML контент.
 
         Returns:
-            list: Отформатированные инвесторы.
-        """
-        investors = []
-        for row in soup.find_all('tr', class_="group tableRow"):
-            cells = row.find_all('td')
-            if len(cells) == 5:
-                investor_number = cells[0].get_text(strip=True)
-                name = cells[1].get_text(strip=True)
-                tier = cells[2].get_text(strip=True)
-                investor_type = cells[3].get_text(strip=True)
-                stage = cells[4].get_text(strip=True)
-                investors.append(
-                    f"{investor_number:<5} {name:<30} {tier:<10} {investor_type:<20} {stage:<10}"
-                )
-        return investors
+            list of Investor: Инвесторы проекта.
+        """
+        return self._investor_rows(extract_records("dropstab_fundraising", "investors", soup))
+
+    @staticmethod
+    def _round_rows(records: list) -> list:
+        """
+        Приводит записи схемы раундов к записям FundingRound.
+        """
+        return [
+            FundingRound(
+                source="dropstab",
+                name=record['round_name'],
+                date=record['date'],
+                raised=Value.parse(record['funds_raised'])
+            )
+            for record in records
+        ]
+
+    @staticmethod
+    def _investor_rows(records: list) -> list:
+        """
+        Приводит записи схемы инвесторов к записям Investor.
+        """
+        return [
+            Investor(
+                source="dropstab",
+                number=record['number'],
+                name=record['name'],
+                tier=record['tier'],
+                investor_type=record['investor_type'],
+                stages=record['stage']
+            )
+            for record in records
+        ]
+
+    def get_fundraising_report(self, token_drop_url: str) -> FundraisingReport:
+        """
+        Получает данные о финансировании из Dropstab без форматирования.
+
+        Args:
+            token_drop_url (str): URL токена на dropstab.com.
+
+        Returns:
+            FundraisingReport: Раунды финансирования и инвесторы.
+        """
+        html_content = self.get_html(token_drop_url)
+        soup = make_soup(html_content, parse_only=DROPSTAB_FUNDRAISING_STRAINER)
+        records = extract("dropstab_fundraising", soup)
+        return FundraisingReport(
+            source="dropstab",
+            rounds=tuple(self._round_rows(records["rounds"])),
+            investors=tuple(self._investor_rows(records["investors"]))
+        )
 
     def get_fundraising(self, token_drop_url: str) -> str:
         """
@@ -118,28 +148,7 @@ class DropstabFundraisingFetcher:
             str: Отформатированные данные о финансировании.
         """
         try:
-            html_content = self.get_html(token_drop_url)
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            rounds = self.parse_fundraising_rounds(soup)
-            investors = self.parse_investors(soup)
-
-            result = "========== Fundraising ============\n"
-            result += "## Source: Dropstab ##\n"
-            result += "# Инвесторы\n"
-            result += "#     Имя                            Tier       Тип                  Стадия    \n"
-            result += "---------------------------------------------------------------------------\n"
-            if investors:
-                result += "\n".join(investors) + "\n\n"
-            else:
-                result += "Инвесторы не найдены.\n\n"
-
-            result += "# Раунды финансирования:\n"
-            if rounds:
-                result += "\n".join(rounds) + "\n\n"
-            else:
-                result += "Раунды финансирования не найдены.\n\n"
-
+            result = render_fundraising(self.get_fundraising_report(token_drop_url))
             logger.info("Финансирование из Dropstab успешно получено и отформатировано.")
             return result
         except Exception as e:
@@ -152,13 +161,9 @@ class CryptoRankFundraisingFetcher:
     Класс для получения и парсинга данных о финансировании из CryptoRank.
     """
 
-    def __init__(self, base_url: str = "http://212.113.117.33:8080"):
+    def __init__(self, base_url: str = None):
         self.base_url = base_url
-        self.headers = {
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.session = get_session()
 
     def fetch_fundraising_page(self, token: str) -> str:
         """
@@ -177,10 +182,7 @@ class CryptoRankFundraisingFetcher:
         }
 
         try:
-            response = self.session.post(self.base_url, data=json.dumps(payload))
-            logger.info(f"Cryptorank Fundraising, status: {response.status_code}")
-            response.raise_for_status()
-            return response.text
+            return render_page(self.base_url, payload, source="cryptorank", page="ico", session=self.session)
         except requests.HTTPError:
             logger.error("Информация о Fundraising из Cryptorank не получена из-за HTTP ошибки.")
             raise Exception("Информация о Fundraising из Cryptorank не получена")
@@ -196,42 +198,9 @@ class CryptoRankFundraisingFetcher:
             soup (BeautifulSoup): Объект BeautifulSoup с HTML-контентом.
 
         Returns:
-            list of dict: Список словарей с данными о раундах финансирования.
+            list of FundingRound: Раунды финансирования.
         """
-        funding_data = []
-        funding_header = soup.find(
-            'h2',
-            string=lambda text: text and 'Funding Rounds' in text
-        )
-
-        if not funding_header:
-            return funding_data
-
-        parent_div = funding_header.find_parent('div', class_=lambda x: x and 'cards' in x)
-        if not parent_div:
-            return funding_data
-
-        entries = parent_div.find_all('div', class_=lambda x: x and 'kDrqot' in x)
-        for entry in entries:
-            funding_type = self._get_text(entry, 'p', 'eqjvBs')
-            date = self._get_text(entry, 'p', 'fxIPVd')
-            raised = self._get_text(entry, 'p', 'bYpygy')
-            price = self._get_nested_text(entry, 'div', 'price', 'p', 'jvlrjM')
-            roi = self._get_nested_text(entry, 'div', 'roi', 'p', 'jvlrjM')
-            ath_roi = self._get_nested_text(entry, 'div', 'athRoi', 'p', 'jvlrjM')
-            platform = self._get_nested_text(entry, 'div', 'platform', 'p', 'jvlrjM')
-
-            funding_data.append({
-                'Тип': funding_type,
-                'Дата': date,
-                'Собрано': raised,
-                'Цена': price,
-                'ROI': roi,
-                'ATH ROI': ath_roi,
-                'Платформа': platform
-            })
-
-        return funding_data
+        return self._funding_rows(extract_records("cryptorank_ico", "funding_rounds", soup))
 
     def extract_investors(self, soup: BeautifulSoup) -> list:
         """
@@ -241,77 +210,64 @@ class CryptoRankFundraisingFetcher:
             soup (BeautifulSoup): Объект BeautifulSoup с HTML-контентом.
 
         Returns:
-            list of dict: Список словарей с данными об инвесторах.
+            list of Investor: Инвесторы проекта.
         """
-        investors = []
-        investors_header = soup.find(
-            'h2',
-            string=lambda text: text and 'Investors and Backers' in text
-        )
-
-        if not investors_header:
-            return investors
-
-        table = investors_header.find_next('table')
-        if not table:
-            return investors
-
-        rows = table.find('tbody').find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) < 4:
-                continue
-
-            name = self._get_text(cols[0], 'p', 'ktClAm')
-            tier = self._get_text(cols[1], 'p', 'ktClAm')
-            inv_type = self._get_text(cols[2], 'p', 'ktClAm')
-            stages = [btn.text.strip() for btn in cols[3].find_all('button')]
-
-            investors.append({
-                'Название': name,
-                'Уровень': tier,
-                'Тип': inv_type,
-                'Этапы инвестирования': ', '.join(stages) if stages else 'N/A'
-            })
-
-        return investors
+        return self._investor_rows(extract_records("cryptorank_ico", "investors", soup))
 
     @staticmethod
-    def _get_text(parent: BeautifulSoup, tag: str, class_name: str) -> str:
+    def _funding_rows(records: list) -> list:
         """
-        Извлекает текст из указанного тега и класса.
-
-        Args:
-            parent (BeautifulSoup): Родительский тег.
-            tag (str): Имя тега для поиска.
-            class_name (str): Класс тега.
-
-        Returns:
-            str: Извлеченный текст или 'N/A', если не найдено.
+        Приводит записи схемы раундов к записям FundingRound.
         """
-        element = parent.find(tag, class_=lambda x: x and class_name in x)
-        return element.text.strip() if element and element.text else 'N/A'
+        return [
+            FundingRound(
+                source="cryptorank",
+                name=record['type'],
+                date=record['date'],
+                raised=Value.parse(record['raised']),
+                price=Value.parse(record['price']),
+                roi=Value.parse(record['roi']),
+                ath_roi=Value.parse(record['ath_roi']),
+                platform=record['platform']
+            )
+            for record in records
+        ]
 
     @staticmethod
-    def _get_nested_text(parent: BeautifulSoup, div_tag: str, div_class: str, target_tag: str, target_class: str) -> str:
+    def _investor_rows(records: list) -> list:
+        """
+        Приводит записи схемы инвесторов к записям Investor.
         """
-        Извлекает вложенный текст из дочернего тега.
+        return [
+            Investor(
+                source="cryptorank",
+                name=record['name'],
+                tier=record['tier'],
+                investor_type=record['investor_type'],
+                stages=record['stages']
+            )
+            for record in records
+        ]
+
+    def fetch(self, token: str) -> FundraisingReport:
+        """
+        Получает данные о финансировании из Cryptorank без форматирования.
 
         Args:
-            parent (BeautifulSoup): Родительский тег.
-            div_tag (str): Имя дочернего div тега.
-            div_class (str): Класс дочернего div тега.
-            target_tag (str): Имя целевого тега для извлечения текста.
-            target_class (str): Класс целевого тега.
+            token (str): Идентификатор токена на CryptoRank.
 
         Returns:
-            str: Извлеченный текст или 'N/A', если не найдено.
+            FundraisingReport: Раунды финансирования и инвесторы.
         """
-        div_element = parent.find(div_tag, class_=lambda x: x and div_class in x)
-        if not div_element:
-            return 'N/A'
-        target_element = div_element.find(target_tag, class_=lambda x: x and target_class in x)
-        return target_element.text.strip() if target_element and target_element.text else 'N/A'
+        html_content = self.fetch_fundraising_page(token)
+        decoded_html = html.unescape(html_content)
+        soup = make_soup(decoded_html)
+        records = extract("cryptorank_ico", soup)
+        return FundraisingReport(
+            source="cryptorank",
+            rounds=tuple(self._funding_rows(records["funding_rounds"])),
+            investors=tuple(self._investor_rows(records["investors"]))
+        )
 
     def scrape(self, token: str) -> str:
         """
@@ -324,59 +280,11 @@ class CryptoRankFundraisingFetcher:
             str: Отформатированные данные о финансировании и инвесторах.
         """
         try:
-            html_content = self.fetch_fundraising_page(token)
-            decoded_html = html.unescape(html_content)
-            soup = BeautifulSoup(decoded_html, 'html.parser')
-
-            funding_rounds = self.extract_funding_rounds(soup)
-            investors = self.extract_investors(soup)
-
-            return self._format_results(funding_rounds, investors)
+            return render_fundraising(self.fetch(token))
         except Exception as e:
             logger.error(f"Ошибка при скрапинге данных из Cryptorank: {e}")
             raise Exception("Информация о Fundraising из Cryptorank не получена")
 
-    @staticmethod
-    def _format_results(funding_rounds: list, investors: list) -> str:
-        """
-        Форматирует результаты в строку.
-
-        Args:
-            funding_rounds (list): Данные о раундах финансирования.
-            investors (list): Данные об инвесторах.
-
-        Returns:
-            str: Отформатированная строка с результатами.
-        """
-        lines = ["## Source: Cryptorank ##\n\n"]
-
-        if investors:
-            lines.append("**Инвесторы и партнеры**\n")
-            lines.append(
-                "| Название                         | Уровень | Тип          | Этапы инвестирования    |\n"
-                "|----------------------------------|---------|--------------|-------------------------|\n"
-            )
-            for inv in investors:
-                lines.append(
-                    f"| {inv['Название']:<32} | {inv['Уровень']:<7} | "
-                    f"{inv['Тип']:<12} | {inv['Этапы инвестирования']:<23} |\n"
-                )
-        else:
-            lines.append("Инвесторы не найдены.\n")
-
-        lines.append("\n**Финансовые раунды, IEO и Launchpools**\n")
-        for idx, item in enumerate(funding_rounds, 1):
-            lines.append(
-                f"{idx}. **{item['Тип']} на платформе {item['Платформа']}**\n"
-                f"   - **Дата:** {item['Дата']}\n"
-                f"   - **Собранная сумма:** {item['Собрано']}\n"
-                f"   - **Цена токена:** {item['Цена']}\n"
-                f"   - **ROI:** {item['ROI']}\n"
-                f"   - **ATH ROI:** {item['ATH ROI']}\n"
-            )
-
-        return ''.join(lines)
-
 
 class GetFundraisingTool(BaseTool):
     """
@@ -389,6 +297,7 @@ class GetFundraisingTool(BaseTool):
         "для указанного токена криптовалюты."
     )
 
+    @traced("tool.get_fundraising_tool")
     def _run(self, token: str) -> str:
         """
         Выполняет инструмент для получения и форматирования данных.
@@ -400,41 +309,95 @@ class GetFundraisingTool(BaseTool):
             str: Объединенные отформатированные данные о финансировании.
         """
         try:
-            tokenomic_links_tool = GetTokenomicLinks()
-            tokenomic_links = tokenomic_links_tool._run(token)
+            return self.format(self.fetch(token))
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении GetFundraisingTool: {e}")
+            return f"Ошибка при выполнении GetFundraisingTool: {e}"
 
-            logger.info('Tokenomic links:', tokenomic_links)
+    def fetch(self, token: str) -> dict:
+        """
+        Получает данные о финансировании из Dropstab и Cryptorank параллельно.
 
-            token_dropstab = tokenomic_links.get('dropstab')
-            token_cryptorank = tokenomic_links.get('cryptorank')
+        Args:
+            token (str): Идентификатор токена.
 
-            fundraising_fetcher_dropstab = DropstabFundraisingFetcher()
-            fundraising_fetcher_cryptorank = CryptoRankFundraisingFetcher()
+        Returns:
+            dict: Источник ('dropstab', 'cryptorank') -> FundraisingReport или исключение, если источник не ответил.
+        """
+        results = run_with_deadline({
+            "dropstab": lambda: self._fetch_dropstab(token),
+            "cryptorank": lambda: self._fetch_cryptorank(token),
+        })
+        for source in ("dropstab", "cryptorank"):
+            if isinstance(results[source], Exception):
+                logger.error(f"Не удалось получить {source.capitalize()} Fundraising: {results[source]}")
+        return results
+
+    def format(self, results: dict) -> str:
+        """
+        Форматирует результаты fetch для агента с учетом бюджета инструмента.
 
-            combined_result = ""
+        Args:
+            results (dict): Результат fetch.
 
-            # Получение Dropstab Fundraising
-            try:
-                fundraising_data_dropstab = fundraising_fetcher_dropstab.get_fundraising(token_dropstab)
-                combined_result += fundraising_data_dropstab + "\n"
-            except Exception as e:
-                logger.error(f"Не удалось получить Dropstab Fundraising: {e}")
-                combined_result += "Не удалось получить данные о Dropstab Fundraising.\n\n"
+        Returns:
+            str: Объединенные отформатированные данные о финансировании.
+        """
+        # Экономия считается от плотной разметки, без второго рендера с выровненными таблицами
+        return compact_output(self.name, self.render(results))
 
-            # Получение Cryptorank Fundraising
-            try:
-                fundraising_data_cryptorank = fundraising_fetcher_cryptorank.scrape(token_cryptorank)
-                combined_result += fundraising_data_cryptorank + "\n"
-            except Exception as e:
-                logger.error(f"Не удалось получить Cryptorank Fundraising: {e}")
-                combined_result += "Не удалось получить данные о Cryptorank Fundraising.\n\n"
+    @staticmethod
+    def render(results: dict, dense: bool = None) -> str:
+        """
+        Объединяет данные о финансировании из обоих источников в Markdown.
 
-            return combined_result
-        except Exception as e:
-            logger.error(f"Ошибка при выполнении GetFundraisingTool: {e}")
-            return f"Ошибка при выполнении GetFundraisingTool: {e}"
+        Args:
+            results (dict): Результат fetch.
+            dense (bool): Компактные таблицы (по умолчанию - настройка markdown).
+
+        Returns:
+            str: Отформатированные данные; для неответившего источника - сообщение об ошибке.
+        """
+        combined_result = ""
+
+        # Получение Dropstab Fundraising
+        if isinstance(results["dropstab"], Exception):
+            combined_result += "Не удалось получить данные о Dropstab Fundraising.\n\n"
+        else:
+            combined_result += render_fundraising(results["dropstab"], dense) + "\n"
+
+        # Получение Cryptorank Fundraising
+        if isinstance(results["cryptorank"], Exception):
+            combined_result += "Не удалось получить данные о Cryptorank Fundraising.\n\n"
+        else:
+            combined_result += render_fundraising(results["cryptorank"], dense) + "\n"
+
+        return combined_result
+
+    @staticmethod
+    def _fetch_dropstab(token: str) -> FundraisingReport:
+        """
+        Находит ссылку на Dropstab и получает данные о финансировании.
 
+        Args:
+            token (str): Идентификатор токена.
 
-# Не забудьте определить класс GetTokenomicLinks или импортировать его, если он находится в другом модуле.
-# Например:
-# from src.crypto_crew.tools.get_tokenomic_links import GetTokenomicLinks
+        Returns:
+            FundraisingReport: Данные о финансировании из Dropstab.
+        """
+        token_dropstab = get_link_resolver().resolve("dropstab", token)
+        return DropstabFundraisingFetcher().get_fundraising_report(token_dropstab)
+
+    @staticmethod
+    def _fetch_cryptorank(token: str) -> FundraisingReport:
+        """
+        Находит ссылку на Cryptorank и получает данные о финансировании.
+
+        Args:
+            token (str): Идентификатор токена.
+
+        Returns:
+            FundraisingReport: Данные о финансировании из Cryptorank.
+        """
+        token_cryptorank = get_link_resolver().resolve("cryptorank", token)
+        return CryptoRankFundraisingFetcher().fetch(token_cryptorank)
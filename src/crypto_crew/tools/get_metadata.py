@@ -1,43 +1,230 @@
 ### src/crypto_crew/tools/get_metadata.py
 
-import requests
 import os
-from langchain.tools import tool
-import pandas as pd
+import csv
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import requests
+from dotenv import load_dotenv
+from src.crypto_crew.tools import http_client
+from src.crypto_crew.tools.endpoints import cmc_api_url
+
+load_dotenv()
+
+# Эндпоинт CoinMarketCap принимает до 100 символов через запятую за 1 кредит
+CMC_INFO_PATH = "/v2/cryptocurrency/info"
+CMC_MAX_SYMBOLS_PER_REQUEST = int(os.getenv("CMC_MAX_SYMBOLS_PER_REQUEST", "100"))
+CMC_SYMBOLS_PER_CREDIT = 100
+# Ограничение тарифа: кредитов на процесс (0 - без ограничения);
+# частота запросов (CMC_REQUESTS_PER_MINUTE) задается в tools/rate_limit.py
+CMC_CREDIT_BUDGET = int(os.getenv("CMC_CREDIT_BUDGET", "0"))
+# Какую монету выбирать, если символ неуникален: 'first' или 'oldest'
+CMC_METADATA_PICK = os.getenv("CMC_METADATA_PICK", "first")
+# Фоновая выгрузка найденных метаданных после запроса: '' (выключена), 'csv' или 'parquet'
+CMC_METADATA_EXPORT = os.getenv("CMC_METADATA_EXPORT", "").lower()
+DEFAULT_EXPORT_PATH = "./tmp/metadata_df"
+
+
+def flatten(data: dict, prefix: str = "") -> dict:
+    """
+    Разворачивает вложенные словари ответа в плоские ключи через точку ('urls.website').
+
+    Args:
+        data (dict): Метаданные монеты из ответа CoinMarketCap.
+        prefix (str): Префикс ключей вложенного словаря.
+
+    Returns:
+        dict: Плоский словарь; списки сохраняются как есть.
+    """
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _first(value) -> str:
+    if isinstance(value, list):
+        return value[0] if value else ""
+    return value or ""
+
+
+@dataclass(frozen=True, slots=True)
+class CoinMetadata:
+    """
+    Метаданные монеты: основные поля и плоский словарь всех полей ответа.
+    """
+
+    id: int = None
+    name: str = ""
+    symbol: str = ""
+    slug: str = ""
+    category: str = ""
+    date_added: str = None
+    website: str = ""
+    technical_doc: str = ""
+    data: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, coin_data: dict) -> "CoinMetadata":
+        """
+        Строит запись из метаданных монеты в ответе CoinMarketCap.
+        """
+        return cls.from_dict(flatten(coin_data or {}))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CoinMetadata":
+        """
+        Строит запись из плоского словаря (результат to_dict).
+        """
+        if not data:
+            return cls()
+        return cls(
+            id=data.get("id"),
+            name=data.get("name") or "",
+            symbol=data.get("symbol") or "",
+            slug=data.get("slug") or "",
+            category=data.get("category") or "",
+            date_added=data.get("date_added"),
+            website=_first(data.get("urls.website")),
+            technical_doc=_first(data.get("urls.technical_doc")),
+            data=dict(data),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.data)
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает плоский словарь всех полей (входные данные задач агентов).
+        """
+        return dict(self.data)
+
+    def to_row(self) -> dict:
+        """
+        Возвращает строку для выгрузки: списки и словари сериализуются в JSON.
+        """
+        return {
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+            for key, value in self.data.items()
+        }
+
+
+def export_metadata(records: list, path: str = None, fmt: str = None) -> str:
+    """
+    Выгружает метаданные монет в CSV или Parquet.
+
+    Args:
+        records (list): Записи CoinMetadata (пустые пропускаются).
+        path (str): Путь к файлу (по умолчанию ./tmp/metadata_df.<fmt>).
+        fmt (str): 'csv' или 'parquet' (по умолчанию - по расширению path, иначе CSV).
+
+    Returns:
+        str: Абсолютный путь к файлу.
+    """
+    fmt = fmt or ("parquet" if path and path.endswith(".parquet") else "csv")
+    path = os.path.abspath(path or f"{DEFAULT_EXPORT_PATH}.{fmt}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    rows = [record.to_row() for record in records if record]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    if fmt == "parquet":
+        # pandas и pyarrow нужны только для выгрузки в Parquet
+        import pandas as pd
+        pd.DataFrame(rows, columns=columns).to_parquet(path, index=False)
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+    return path
+
 
 class GetCoinMetadata:
 
-    @tool('save_dataset')
+    _export_lock = threading.Lock()
+    _exporter = None
+    # Кредиты CMC, потраченные процессом (запросы могут идти из нескольких потоков)
+    _credits_lock = threading.Lock()
+    credits_used = 0
+
     @staticmethod
-    def save_dataset(query: str) -> str:
+    def lookup(query: str) -> CoinMetadata:
         """
         Retrieves all static metadata for a cryptocurrency.
-        This tool returns the dataset of the metadata for the crypto project.
 
         Arguments:
             query (str): The symbol of the cryptocurrency (e.g., 'BTC' for Bitcoin').
 
         Returns:
-            str: A message indicating the success of the operation.
+            CoinMetadata: The coin metadata (empty if nothing was found).
+        """
+        record = CoinMetadata.from_json(GetCoinMetadata.get_coin_metadata_v2(query))
+        GetCoinMetadata.export_async([record])
+        return record
+
+    @staticmethod
+    def save_dataset(query: str) -> dict:
+        """
+        Retrieves all static metadata for a cryptocurrency as a flat dictionary.
+
+        Arguments:
+            query (str): The symbol of the cryptocurrency (e.g., 'BTC' for Bitcoin').
+
+        Returns:
+            dict: Flat metadata ('name', 'urls.website', ...), {} if nothing was found.
         """
         print('save_dataset:', query)
-        coin_data = GetCoinMetadata.get_coin_metadata_v2(query)
+        return GetCoinMetadata.lookup(query).to_dict()
 
-        # Конвертируем словарь данных монеты в DataFrame pandas
-        df = pd.json_normalize(coin_data)
+    @staticmethod
+    def save_datasets(symbols: list, pick=None) -> dict:
+        """
+        Получает метаданные для списка символов минимальным числом запросов.
 
-        # Убеждаемся, что директория вывода существует
-        output_dir = './tmp'
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Определяем путь к выходному CSV файлу
-        csv_file_path = os.path.join(output_dir, 'metadata_df.csv')
-        csv_file_path = os.path.abspath(csv_file_path)  # Получаем абсолютный путь
+        Результат для каждого символа имеет тот же вид, что и у save_dataset;
+        выгрузка (если включена CMC_METADATA_EXPORT) выполняется один раз для всех монет.
 
-        # Сохраняем DataFrame в CSV файл
-        df.to_csv(csv_file_path, index=False)
+        Arguments:
+            symbols (list): Символы криптовалют.
+            pick (str | callable): Стратегия выбора монеты при неуникальном символе.
 
-        return df.to_dict() #.to_string()
+        Returns:
+            dict: Символ -> датасет метаданных (пустой словарь, если монета не найдена,
+                None, если запрос не удался).
+        """
+        coins = GetCoinMetadata.get_coin_metadata_bulk(symbols, pick=pick)
+        records = {symbol: CoinMetadata.from_json(coin_data) for symbol, coin_data in coins.items()}
+        GetCoinMetadata.export_async(list(records.values()))
+        return {
+            symbol: None if coins[symbol] is None else record.to_dict()
+            for symbol, record in records.items()
+        }
+
+    @staticmethod
+    def export_async(records: list, fmt: str = None):
+        """
+        Выгружает метаданные в фоновом потоке, если выгрузка включена.
+
+        Arguments:
+            records (list): Записи CoinMetadata.
+            fmt (str): 'csv' или 'parquet' (по умолчанию CMC_METADATA_EXPORT).
+
+        Returns:
+            Future | None: Задача выгрузки или None, если выгрузка выключена или выгружать нечего.
+        """
+        fmt = fmt or CMC_METADATA_EXPORT
+        if not fmt or not any(records):
+            return None
+        with GetCoinMetadata._export_lock:
+            if GetCoinMetadata._exporter is None:
+                GetCoinMetadata._exporter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-export")
+        return GetCoinMetadata._exporter.submit(export_metadata, records, None, fmt)
 
     @staticmethod
     def get_coin_metadata_v2(query) -> dict:
@@ -50,34 +237,134 @@ class GetCoinMetadata:
         Returns:
             dict: A dictionary containing the cryptocurrency metadata.
         """
-        import json
-        # Конструируем URL API с указанным символом монеты
         print('get_coin_metadata_v2:', query)
+        coin_data = GetCoinMetadata.get_coin_metadata_bulk([query]).get(query) or {}
+        if not coin_data:
+            print(f"No data found")
+        return coin_data
+
+    @staticmethod
+    def get_coin_metadata_bulk(symbols: list, pick=None, chunk_size: int = None) -> dict:
+        """
+        Retrieves static metadata for many cryptocurrencies with batched CoinMarketCap requests.
+
+        Symbols are sent comma-separated, up to chunk_size per request (100 symbols cost
+        one credit). Requests share the 'cmc' rate limiter (CMC_REQUESTS_PER_MINUTE) and stop
+        once CMC_CREDIT_BUDGET is exhausted. A failed request only fails the symbols of its chunk.
+
+        Arguments:
+            symbols (list): Symbols of the cryptocurrencies (e.g., ['BTC', 'ETH']).
+            pick (str | callable): How to choose a coin when a symbol is not unique:
+                'first' (API order), 'oldest' (earliest date_added) or a callable
+                receiving the list of coins.
+            chunk_size (int): Maximum number of symbols per request.
+
+        Returns:
+            dict: Symbol -> coin metadata ({} if nothing was found, None if the request failed).
+        """
+        chunk_size = max(1, min(chunk_size or CMC_MAX_SYMBOLS_PER_REQUEST, CMC_MAX_SYMBOLS_PER_REQUEST))
+
+        unique = []
+        for symbol in symbols:
+            symbol = str(symbol).strip()
+            if symbol and symbol not in unique:
+                unique.append(symbol)
+
+        result = {symbol: {} for symbol in unique}
+        for start in range(0, len(unique), chunk_size):
+            chunk = unique[start:start + chunk_size]
+
+            credits = -(-len(chunk) // CMC_SYMBOLS_PER_CREDIT)
+            with GetCoinMetadata._credits_lock:
+                exhausted = CMC_CREDIT_BUDGET and GetCoinMetadata.credits_used + credits > CMC_CREDIT_BUDGET
+            if exhausted:
+                print(f"CMC credit budget exhausted, skipped {len(unique) - start} symbols")
+                break
+
+            try:
+                data = GetCoinMetadata._request_info(chunk)
+            except (requests.RequestException, ValueError) as e:
+                # Ошибка одного запроса не прерывает остальные пачки
+                print(f"CMC request failed for {', '.join(chunk)}: {e}")
+                for symbol in chunk:
+                    result[symbol] = None
+                continue
+            # CMC может вернуть ключи в другом регистре
+            data_upper = {key.upper(): value for key, value in data.items()}
+            for symbol in chunk:
+                coin_data_list = data.get(symbol) or data_upper.get(symbol.upper()) or []
+                result[symbol] = GetCoinMetadata._pick_coin(coin_data_list, pick)
+
+        return result
 
-        url = f"https://pro-api.coinmarketcap.com/v2/cryptocurrency/info?symbol={query}"
+    @staticmethod
+    def _pick_coin(coin_data_list: list, pick=None) -> dict:
+        """
+        Chooses one coin from the list returned for a symbol.
+
+        Arguments:
+            coin_data_list (list): Coins sharing the same symbol.
+            pick (str | callable): Selection strategy (see get_coin_metadata_bulk).
+
+        Returns:
+            dict: The selected coin metadata or {}.
+        """
+        if not coin_data_list:
+            return {}
+        if isinstance(coin_data_list, dict):
+            return coin_data_list
+
+        pick = pick or CMC_METADATA_PICK
+        if callable(pick):
+            return pick(coin_data_list) or {}
+        if pick == "oldest":
+            return min(coin_data_list, key=lambda coin: coin.get("date_added") or "9999")
+        # Выбираем первые данные монеты из списка
+        return coin_data_list[0]
+
+    @staticmethod
+    def _request_info(symbols: list) -> dict:
+        """
+        Sends one /v2/cryptocurrency/info request for a chunk of symbols.
+
+        Arguments:
+            symbols (list): Symbols of the cryptocurrencies.
 
-        payload = {}
-        
+        Returns:
+            dict: The 'data' section of the response ({} on an API error).
+
+        Raises:
+            requests.RequestException: On a network error or a second 429.
+            ValueError: If the response is not JSON.
+        """
         headers = {
             'X-CMC_PRO_API_KEY': os.getenv("COINMARKETCAP_API_KEY"),
         }
+        params = {
+            "symbol": ",".join(symbols),
+            "skip_invalid": "true",
+        }
 
-        response = requests.request("GET", url, headers=headers, data=payload)
+        # Частота запросов ограничивается общей корзиной 'cmc' (tools/rate_limit.py)
+        response = http_client.request("GET", cmc_api_url(CMC_INFO_PATH), upstream="cmc", headers=headers, params=params)
+        if response.status_code == 429:
+            # Лимит запросов исчерпан: корзина 'cmc' уже получила 429 через feedback, снизила
+            # скорость и выдержит Retry-After (для всех потоков) - повторяем один раз
+            print("CMC rate limit reached, retrying")
+            response = http_client.request(
+                "GET", cmc_api_url(CMC_INFO_PATH), upstream="cmc", headers=headers, params=params
+            )
+        if response.status_code == 429:
+            response.raise_for_status()
 
         json_object = response.json()
 
-        # Проверяем, есть ли данные по указанному символу
-        if 'data' not in json_object or query not in json_object['data']:
-            print(f"No data found")
-            return {}
-
-        # Поскольку символы могут быть не уникальными, API возвращает список монет с данным символом
-        coin_data_list = json_object['data'][query]
+        status = json_object.get('status') or {}
+        with GetCoinMetadata._credits_lock:
+            GetCoinMetadata.credits_used += status.get('credit_count') or 0
 
-        # Выбираем первые данные монеты из списка
-        if coin_data_list:
-            coin_data = coin_data_list[0]
-            return coin_data
-        else:
-            print(f"No coin data available")
+        # Проверяем, есть ли данные по указанным символам
+        if 'data' not in json_object:
+            print(f"No data found: {status.get('error_message')}")
             return {}
+        return json_object['data']
@@ -2,20 +2,24 @@
 
 from crewai_tools import BaseTool
 import os
-import requests
 import json
 from dotenv import load_dotenv
 import logging  # Добавлено импортирование logging
+import threading
+from concurrent.futures import Future
+from src.crypto_crew.tools.fan_out import run_with_deadline
+from src.crypto_crew.tools import http_client
+from src.crypto_crew.tools.endpoints import serper_url
+from src.crypto_crew.tracing import traced
 load_dotenv()
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GetDropstabTokenomicLinks(BaseTool):
     name: str = 'get dropstab tokenomic links'
     description: str = 'Получает ссылки на tokenomic данные Dropstab'
 
+    @traced("tool.dropstab_tokenomic_links")
     def _run(self, token_name: str) -> str:
         """
         Получает ссылку на tokenomic данные Dropstab.
@@ -26,7 +30,7 @@ class GetDropstabTokenomicLinks(BaseTool):
         Returns:
             str: Ссылка на Dropstab.
         """
-        url = "https://google.serper.dev/search"
+        url = serper_url()
         payload = json.dumps({"q": f"dropstab {token_name}"})
         headers = {
             'X-API-KEY': os.getenv('SERPER_API_KEY'),
@@ -34,7 +38,7 @@ class GetDropstabTokenomicLinks(BaseTool):
         }
 
         try:
-            response = requests.post(url, headers=headers, data=payload)
+            response = http_client.post(url, upstream="serper", headers=headers, data=payload)
             logger.info(f"Запрос к {url} с параметрами: {payload}")
             response.raise_for_status()
             response_data = response.json()
@@ -60,6 +64,7 @@ class GetCryptorankTokenomicLinks(BaseTool):
     name: str = 'get cryptorank tokenomic links'
     description: str = 'Получает ссылки на tokenomic данные Cryptorank'
 
+    @traced("tool.cryptorank_tokenomic_links")
     def _run(self, token_name: str) -> str:
         """
         Получает ссылку на tokenomic данные Cryptorank.
@@ -70,14 +75,14 @@ class GetCryptorankTokenomicLinks(BaseTool):
         Returns:
             str: Ссылка на Cryptorank.
         """
-        url = "https://google.serper.dev/search"
+        url = serper_url()
         payload = json.dumps({"q": f"cryptorank {token_name}"})
         headers = {
             'X-API-KEY': os.getenv('SERPER_API_KEY'),
             'Content-Type': 'application/json'
         }
 
-        response = requests.post(url, headers=headers, data=payload)
+        response = http_client.post(url, upstream="serper", headers=headers, data=payload)
         response.raise_for_status()
         response_data = response.json()
 
@@ -97,6 +102,7 @@ class GetTokenomicLinks(BaseTool):
     name: str = 'get tokenomic links'
     description: str = 'Получает ссылки на tokenomic данные Dropstab и Cryptorank'
 
+    @traced("tool.get_tokenomic_links")
     def _run(self, token_name: str) -> dict:
         """
         Получает ссылки на tokenomic данные Dropstab и Cryptorank.
@@ -107,19 +113,136 @@ class GetTokenomicLinks(BaseTool):
         Returns:
             dict: Ссылки на Dropstab и Cryptorank.
         """
-        get_dropstab = GetDropstabTokenomicLinks()
-        get_cryptorank = GetCryptorankTokenomicLinks()
+        resolver = get_link_resolver()
 
         try:
-            dropstab_link = get_dropstab._run(token_name)
-            cryptorank_link = get_cryptorank._run(token_name)
+            # Оба поисковых запроса выполняются одновременно
+            result = run_with_deadline({
+                "dropstab": lambda: resolver.resolve("dropstab", token_name),
+                "cryptorank": lambda: resolver.resolve("cryptorank", token_name),
+            })
+            for link in result.values():
+                if isinstance(link, Exception):
+                    raise link
 
-            result = {
-                "dropstab": dropstab_link,
-                "cryptorank": cryptorank_link
-            }
             logger.info(f"Полученные ссылки GetTokenomicLinks: {result}")
             return result
         except Exception as e:
             logger.error(f"Ошибка при получении tokenomic ссылок: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+
+class TokenomicLinkResolver:
+    """
+    Разрешает ссылки Dropstab и Cryptorank с кэшированием в рамках запуска.
+
+    Результаты запоминаются по нормализованному имени токена, а одновременные
+    запросы одного и того же ключа объединяются в один поисковый запрос.
+    """
+
+    def __init__(self):
+        self._lookups = {
+            "dropstab": lambda token: GetDropstabTokenomicLinks()._run(token),
+            "cryptorank": lambda token: GetCryptorankTokenomicLinks()._run(token),
+        }
+        self._lock = threading.Lock()
+        self._links = {}
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def normalize(token_name: str) -> str:
+        """
+        Нормализует имя токена для использования в качестве ключа кэша.
+
+        Args:
+            token_name (str): Название токена.
+
+        Returns:
+            str: Имя в нижнем регистре без лишних пробелов.
+        """
+        return " ".join(str(token_name).split()).lower()
+
+    def resolve(self, source: str, token_name: str) -> str:
+        """
+        Возвращает ссылку на токен для указанного источника.
+
+        Неудачные поиски не кэшируются, чтобы повторный вызов инструмента мог
+        повторить запрос.
+
+        Args:
+            source (str): Источник ('dropstab' или 'cryptorank').
+            token_name (str): Название токена.
+
+        Returns:
+            str: Идентификатор токена в URL источника.
+        """
+        key = (source, self.normalize(token_name))
+        owner = False
+
+        with self._lock:
+            if key in self._links:
+                self.hits += 1
+                return self._links[key]
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+                owner = True
+
+        # Запрос уже выполняется в другом потоке - ждем его результат
+        if not owner:
+            return future.result()
+
+        try:
+            link = self._lookups[source](token_name)
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._links[key] = link
+            del self._in_flight[key]
+        future.set_result(link)
+        return link
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики попаданий и промахов кэша.
+
+        Returns:
+            dict: Значения hits, misses, coalesced и размер кэша.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "cached": len(self._links),
+            }
+
+
+_resolver = TokenomicLinkResolver()
+
+
+def get_link_resolver() -> TokenomicLinkResolver:
+    """
+    Возвращает общий резолвер ссылок текущего запуска.
+    """
+    return _resolver
+
+
+def reset_link_resolver() -> TokenomicLinkResolver:
+    """
+    Начинает новый запуск: сбрасывает кэш ссылок и счетчики.
+    """
+    global _resolver
+    _resolver = TokenomicLinkResolver()
+    return _resolver
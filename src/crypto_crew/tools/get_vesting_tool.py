@@ -1,26 +1,35 @@
 # src/crypto_crew/tools/get_vesting_tool.py
 
 
-from src.crypto_crew.tools.get_tokenomic_links import GetTokenomicLinks
+from src.crypto_crew.tools.get_tokenomic_links import get_link_resolver
+from src.crypto_crew.tools.fan_out import run_with_deadline
+from src.crypto_crew.tools.render_proxy import render_page
+from src.crypto_crew.tools.http_client import get_session
+from src.crypto_crew.tools.html_parser import make_soup
+from src.crypto_crew.tools.extraction import extract, extract_records, page_strainer
+from src.crypto_crew.tools.records import DistributionProgress, Value, VestingAllocation, VestingReport
+from src.crypto_crew.tools.markdown import render_vesting
+from src.crypto_crew.tools.compaction import compact_output
+from src.crypto_crew.tracing import traced
 import json
 import html
 import requests
 from bs4 import BeautifulSoup
 from crewai_tools import BaseTool
-import pandas as pd
 import logging
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# При разборе строятся только карточки аллокаций, остальная разметка пропускается
+DROPSTAB_VESTING_STRAINER = page_strainer("dropstab_vesting")
+
 
 class DropstabVestingFetcher:
     """
     Класс для получения и парсинга данных о вестинге из Dropstab.
     """
 
-    def __init__(self, base_url: str = "http://212.113.117.33:8080"):
+    def __init__(self, base_url: str = None):
         self.base_url = base_url
 
     def get_html(self, token_drop_url: str) -> str:
@@ -40,15 +49,10 @@ class DropstabVestingFetcher:
         }
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(payload)
+            response_data = json.loads(
+                render_page(self.base_url, payload, source="dropstab", page="vesting")
             )
-            response.raise_for_status()
-            response_data = response.json()
             html_content = html.unescape(response_data.get('data', ''))
-            logger.info(f"Dropstab Vesting, status: {response.status_code}")
             return html_content
         except requests.HTTPError:
             logger.error("Информация о Vesting из Dropstab не получена из-за HTTP ошибки.")
@@ -59,33 +63,41 @@ class DropstabVestingFetcher:
 
     def parse_vesting_data(self, soup: BeautifulSoup) -> list:
         """
-        Извлекает и форматирует информацию о Vesting.
+        Извлекает информацию о Vesting.
 
         Args:
             soup (BeautifulSoup): HTML контент.
 
         Returns:
-            list: Список с информацией о Vesting.
+            list of VestingAllocation: Аллокации с текстовыми и числовыми значениями.
         """
-        vesting_info = []
+        return [
+            VestingAllocation(
+                source="dropstab",
+                name=record["title"],
+                total=Value.parse(record["total_supply"]),
+                unlocked=Value.parse(record["unlocked"]),
+                locked=Value.parse(record["value_locked"])
+            )
+            for record in extract_records("dropstab_vesting", "allocations", soup)
+        ]
 
-        for div in soup.find_all(
-            'div',
-            class_="group space-y-4 rounded-2xl shadow-md hover:bg-gray-100 active:bg-gray-300/50 dark:bg-zinc-800 dark:shadow-black dark:hover:bg-zinc-700 dark:active:bg-zinc-500/50"
-        ):
-            title = div.find('span', class_="truncate text-left text-lg font-bold").get_text(strip=True)
-            unlocked = div.find('span', class_="font-semibold").get_text(strip=True)
-            total_supply = div.find_all('span', class_="font-medium text-gray-600 dark:text-zinc-300")[-1].get_text(strip=True)
-            value_locked = div.find('div', class_="font-semibold").get_text(strip=True)
+    def get_vesting(self, token_drop_url: str) -> VestingReport:
+        """
+        Получает данные о вестинге из Dropstab без форматирования.
+
+        Args:
+            token_drop_url (str): URL токена на dropstab.com.
 
-            vesting_info.append({
-                "Название": title,
-                "Разблокировано": unlocked,
-                "Общий объем": total_supply,
-                "Заблокировано": value_locked
-            })
+        Returns:
+            VestingReport: Аллокации токена (пустые, если страница без данных).
+        """
+        html_content = self.get_html(token_drop_url)
+        if not html_content:
+            return VestingReport(source="dropstab")
 
-        return vesting_info
+        soup = make_soup(html_content, parse_only=DROPSTAB_VESTING_STRAINER)
+        return VestingReport(source="dropstab", allocations=tuple(self.parse_vesting_data(soup)))
 
     def get_vesting_lock(self, token_drop_url: str) -> str:
         """
@@ -98,24 +110,7 @@ class DropstabVestingFetcher:
             str: Отформатированные данные о вестинге.
         """
         try:
-            html_content = self.get_html(token_drop_url)
-            if not html_content:
-                return "Данные о вестинге не найдены."
-
-            soup = BeautifulSoup(html_content, "html.parser")
-            vesting_info = self.parse_vesting_data(soup)
-
-            if not vesting_info:
-                return "Данные о вестинге не найдены."
-
-            vesting_df = pd.DataFrame(vesting_info)
-            vesting_table = vesting_df.to_markdown(index=False)
-
-            result = "========== Vesting ============\n"
-            result += "## Source: Dropstab ##\n"
-            result += "# Vesting Information:\n"
-            result += f"{vesting_table}\n\n"
-
+            result = render_vesting(self.get_vesting(token_drop_url))
             logger.info("Вестинг из Dropstab успешно получен и отформатирован.")
             return result
         except Exception as e:
@@ -128,15 +123,11 @@ class CryptoRankVestingFetcher:
     Класс для получения и парсинга данных о вестинге из CryptoRank.
     """
 
-    def __init__(self, base_url: str = "http://212.113.117.33:8080"):
+    def __init__(self, base_url: str = None):
         self.base_url = base_url
-        self.headers = {
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.session = get_session()
 
-    def get_vesting_cryptorank(self, token: str) -> dict:
+    def get_vesting_cryptorank(self, token: str) -> VestingReport:
         """
         Получает данные о вестинге из Cryptorank для заданного токена.
 
@@ -144,7 +135,7 @@ class CryptoRankVestingFetcher:
             token (str): Имя токена.
 
         Returns:
-            dict: Содержит информацию о распределении и аллокации.
+            VestingReport: Прогресс распределения и аллокации токена.
         """
         payload = {
             "goto": f"https://cryptorank.io/price/{token}/vesting",
@@ -153,23 +144,19 @@ class CryptoRankVestingFetcher:
         }
 
         try:
-            response = self.session.post(
-                self.base_url,
-                data=json.dumps(payload)
+            response_data = json.loads(
+                render_page(self.base_url, payload, source="cryptorank", page="vesting", session=self.session)
             )
-            logger.info(f"Cryptorank Vesting, status: {response.status_code}")
-            response.raise_for_status()
-
-            decoded_html = html.unescape(response.json().get('data', ''))
-            soup = BeautifulSoup(decoded_html, 'html.parser')
 
-            distribution_progress = self.extract_distribution_progress(soup)
-            allocation = self.extract_allocation_data(soup)
+            decoded_html = html.unescape(response_data.get('data', ''))
+            soup = make_soup(decoded_html)
+            records = extract("cryptorank_vesting", soup)
 
-            return {
-                'distribution_progress': distribution_progress,
-                'allocation_data': allocation
-            }
+            return VestingReport(
+                source="cryptorank",
+                allocations=tuple(self._allocation_rows(records['allocation_data'])),
+                distribution=tuple(self._distribution_rows(records['distribution_progress']))
+            )
         except requests.HTTPError:
             logger.error("Информация о Vesting из Cryptorank не получена из-за HTTP ошибки.")
             raise Exception("Информация о Vesting из Cryptorank не получена")
@@ -186,30 +173,11 @@ class CryptoRankVestingFetcher:
             soup (BeautifulSoup): Парсенный HTML.
 
         Returns:
-            list: Список словарей с данными о распределении.
-        """
-        distribution_data = []
-        section = soup.find('h2', string=lambda x: x and 'Total Distribution Progress' in x)
-        if section:
-            parent_div = section.find_parent('div', class_='sc-2328569c-0')
-            if parent_div:
-                entries = parent_div.find_all('div', class_='sc-2ecfa897-0')
-                for entry in entries:
-                    dist_type = entry.find('p', class_='sc-56567222-0').get_text().split()[0] if entry.find('p', class_='sc-56567222-0') else 'N/A'
-                    percentage = entry.find('span', class_='sc-56567222-0 sc-92cddc74-0').text.strip() if entry.find('span', class_='sc-56567222-0 sc-92cddc74-0') else 'N/A'
-                    amount_elem = entry.find('p', class_='sc-56567222-0 ebjuzh')
-                    if amount_elem:
-                        amount_text = amount_elem.text.strip()
-                        token_amount, usd_amount = amount_text.split(' ~ ') if ' ~ ' in amount_text else (amount_text, 'N/A')
-                    else:
-                        token_amount = usd_amount = 'N/A'
-                    distribution_data.append({
-                        'Тип': dist_type,
-                        'Процент': percentage,
-                        'Количество токенов': token_amount,
-                        'Долларовый эквивалент': usd_amount
-                    })
-        return distribution_data
+            list of DistributionProgress: Данные о распределении.
+        """
+        return CryptoRankVestingFetcher._distribution_rows(
+            extract_records("cryptorank_vesting", "distribution_progress", soup)
+        )
 
     @staticmethod
     def extract_allocation_data(soup: BeautifulSoup) -> list:
@@ -220,64 +188,43 @@ class CryptoRankVestingFetcher:
             soup (BeautifulSoup): Парсенный HTML.
 
         Returns:
-            list: Список словарей с данными об аллокации.
-        """
-        allocation_data = []
-        section = soup.find('h2', string=lambda x: x and 'Allocation' in x)
-        if section:
-            parent_div = section.find_parent('div', class_='sc-2328569c-0')
-            if parent_div:
-                table = parent_div.find('table')
-                if table:
-                    tbody = table.find('tbody')
-                    if tbody:
-                        rows = tbody.find_all('tr')
-                        for row in rows:
-                            cols = row.find_all('td')
-                            if len(cols) >= 4:
-                                name = cols[0].get_text(strip=True)
-                                total = cols[1].get_text(strip=True)
-                                unlocked = cols[2].get_text(strip=True)
-                                locked = cols[3].get_text(strip=True)
-                                allocation_data.append({
-                                    'Name': name,
-                                    'Total': total,
-                                    'Unlocked': unlocked,
-                                    'Locked': locked
-                                })
-        return allocation_data
-
-    def _format_results(self, distribution_progress: list, allocation_data: list) -> str:
-        """
-        Форматирует результаты в строку.
-
-        Args:
-            distribution_progress (list): Данные о распределении.
-            allocation_data (list): Данные об аллокации.
+            list of VestingAllocation: Данные об аллокации.
+        """
+        return CryptoRankVestingFetcher._allocation_rows(
+            extract_records("cryptorank_vesting", "allocation_data", soup)
+        )
 
-        Returns:
-            str: Отформатированная строка с результатами.
-        """
-        lines = []
-        for item in distribution_progress:
-            lines.append(
-                f"Тип: {item['Тип']}, Процент: {item['Процент']}, "
-                f"Количество токенов: {item['Количество токенов']}, "
-                f"Долларовый эквивалент: {item['Долларовый эквивалент']}"
+    @staticmethod
+    def _distribution_rows(records: list) -> list:
+        """
+        Приводит записи схемы распределения к записям DistributionProgress.
+        """
+        return [
+            DistributionProgress(
+                source="cryptorank",
+                type=record['type'],
+                percentage=Value.parse(record['percentage']),
+                token_amount=Value.parse(record['token_amount']),
+                usd_amount=Value.parse(record['usd_amount'])
             )
-        lines.append("\nДанные об аллокации:\n")
-        lines.append(
-            "| Name                        | Total  | Unlocked | Locked |\n"
-            "|-----------------------------|--------|----------|--------|\n"
-        )
-        for item in allocation_data:
-            name = item.get('Name', 'N/A')
-            total = item.get('Total', 'N/A')
-            unlocked = item.get('Unlocked', 'N/A')
-            locked = item.get('Locked', 'N/A')
-            lines.append(f"| {name:<27} | {total:<6} | {unlocked:<8} | {locked:<6} |\n")
+            for record in records
+        ]
 
-        return ''.join(lines)
+    @staticmethod
+    def _allocation_rows(records: list) -> list:
+        """
+        Приводит записи схемы аллокации к записям VestingAllocation.
+        """
+        return [
+            VestingAllocation(
+                source="cryptorank",
+                name=record['name'],
+                total=Value.parse(record['total']),
+                unlocked=Value.parse(record['unlocked']),
+                locked=Value.parse(record['locked'])
+            )
+            for record in records
+        ]
 
 
 class CryptoRankVestingTool(BaseTool):
@@ -288,6 +235,7 @@ class CryptoRankVestingTool(BaseTool):
     name: str = "cryptorank_vesting_tool"
     description: str = "Получает информацию о вестинге из Cryptorank для указанного токена криптовалюты."
 
+    @traced("tool.cryptorank_vesting_tool")
     def _run(self, token: str) -> str:
         """
         Выполняет инструмент для получения и форматирования данных.
@@ -299,13 +247,7 @@ class CryptoRankVestingTool(BaseTool):
             str: Отформатированные данные о вестинге или сообщение об ошибке.
         """
         try:
-            fetcher = CryptoRankVestingFetcher()
-            vesting_data = fetcher.get_vesting_cryptorank(token)
-            result = fetcher._format_results(
-                vesting_data.get('distribution_progress', []),
-                vesting_data.get('allocation_data', [])
-            )
-            return result
+            return render_vesting(CryptoRankVestingFetcher().get_vesting_cryptorank(token))
         except requests.HTTPError as http_err:
             return f"HTTP ошибка при выполнении CryptoRankVestingTool: {http_err}"
         except Exception as err:
@@ -323,6 +265,7 @@ class GetVestingTool(BaseTool):
         "для указанного токена криптовалюты."
     )
 
+    @traced("tool.get_vesting_tool")
     def _run(self, token: str) -> str:
         """
         Выполняет инструмент для получения и форматирования данных о вестинге.
@@ -334,57 +277,95 @@ class GetVestingTool(BaseTool):
             str: Объединенные отформатированные данные о вестинге.
         """
         try:
-            tokenomic_links_tool = GetTokenomicLinks()
-            tokenomic_links = tokenomic_links_tool._run(token)
-
-            logger.info('Tokenomic links:', tokenomic_links)
-
-            token_dropstab = tokenomic_links.get('dropstab')
-            token_cryptorank = tokenomic_links.get('cryptorank')
-
-            vesting_fetcher_dropstab = DropstabVestingFetcher()
-            vesting_fetcher_cryptorank = CryptoRankVestingFetcher()
-
-            combined_result = ""
-
-            # Получение Dropstab Vesting
-            try:
-                vesting_data_dropstab = vesting_fetcher_dropstab.get_vesting_lock(token_dropstab)
-                combined_result += vesting_data_dropstab + "\n\n"
-            except Exception as e:
-                logger.error(f"Не удалось получить Dropstab Vesting: {e}")
-                combined_result += "Не удалось получить данные о Dropstab Vesting.\n\n"
-
-            # Получение Cryptorank Vesting
-            try:
-                vesting_data_cryptorank = vesting_fetcher_cryptorank.get_vesting_cryptorank(token_cryptorank)
-                distribution_progress = "\n".join([
-                    f"Тип: {item['Тип']}, Процент: {item['Процент']}, "
-                    f"Количество токенов: {item['Количество токенов']}, "
-                    f"Долларовый эквивалент: {item['Долларовый эквивалент']}"
-                    for item in vesting_data_cryptorank.get('distribution_progress', [])
-                ])
-                allocation_data = "Данные об аллокации:\n"
-                allocation_data += "| Name                        | Total  | Unlocked | Locked |\n"
-                allocation_data += "|-----------------------------|--------|----------|--------|\n"
-                for item in vesting_data_cryptorank.get('allocation_data', []):
-                    name = item.get('Name', 'N/A')
-                    total = item.get('Total', 'N/A')
-                    unlocked = item.get('Unlocked', 'N/A')
-                    locked = item.get('Locked', 'N/A')
-                    allocation_data += f"| {name:<27} | {total:<6} | {unlocked:<8} | {locked:<6} |\n"
-
-                combined_result += f"{distribution_progress}\n{allocation_data}\n"
-            except Exception as e:
-                logger.error(f"Не удалось получить Cryptorank Vesting: {e}")
-                combined_result += "Не удалось получить данные о Cryptorank Vesting.\n"
-
-            return combined_result
+            return self.format(self.fetch(token))
         except Exception as e:
             logger.error(f"Ошибка при выполнении GetVestingTool: {e}")
             return f"Ошибка при выполнении GetVestingTool: {e}"
 
+    def fetch(self, token: str) -> dict:
+        """
+        Получает данные о вестинге из Dropstab и Cryptorank параллельно.
 
-# Не забудьте определить класс GetTokenomicLinks или импортировать его, если он находится в другом модуле.
-# Например:
-# from src.crypto_crew.tools.get_tokenomic_links import GetTokenomicLinks
+        Args:
+            token (str): Идентификатор токена.
+
+        Returns:
+            dict: Источник ('dropstab', 'cryptorank') -> VestingReport или исключение, если источник не ответил.
+        """
+        results = run_with_deadline({
+            "dropstab": lambda: self._fetch_dropstab(token),
+            "cryptorank": lambda: self._fetch_cryptorank(token),
+        })
+        for source in ("dropstab", "cryptorank"):
+            if isinstance(results[source], Exception):
+                logger.error(f"Не удалось получить {source.capitalize()} Vesting: {results[source]}")
+        return results
+
+    def format(self, results: dict) -> str:
+        """
+        Форматирует результаты fetch для агента с учетом бюджета инструмента.
+
+        Args:
+            results (dict): Результат fetch.
+
+        Returns:
+            str: Объединенные отформатированные данные о вестинге.
+        """
+        # Экономия считается от плотной разметки, без второго рендера с выровненными таблицами
+        return compact_output(self.name, self.render(results))
+
+    @staticmethod
+    def render(results: dict, dense: bool = None) -> str:
+        """
+        Объединяет данные о вестинге из обоих источников в Markdown.
+
+        Args:
+            results (dict): Результат fetch.
+            dense (bool): Компактные таблицы (по умолчанию - настройка markdown).
+
+        Returns:
+            str: Отформатированные данные; для неответившего источника - сообщение об ошибке.
+        """
+        combined_result = ""
+
+        # Получение Dropstab Vesting
+        if isinstance(results["dropstab"], Exception):
+            combined_result += "Не удалось получить данные о Dropstab Vesting.\n\n"
+        else:
+            combined_result += render_vesting(results["dropstab"], dense) + "\n\n"
+
+        # Получение Cryptorank Vesting
+        if isinstance(results["cryptorank"], Exception):
+            combined_result += "Не удалось получить данные о Cryptorank Vesting.\n"
+        else:
+            combined_result += render_vesting(results["cryptorank"], dense)
+
+        return combined_result
+
+    @staticmethod
+    def _fetch_dropstab(token: str) -> VestingReport:
+        """
+        Находит ссылку на Dropstab и получает данные о вестинге.
+
+        Args:
+            token (str): Идентификатор токена.
+
+        Returns:
+            VestingReport: Данные о вестинге из Dropstab.
+        """
+        token_dropstab = get_link_resolver().resolve("dropstab", token)
+        return DropstabVestingFetcher().get_vesting(token_dropstab)
+
+    @staticmethod
+    def _fetch_cryptorank(token: str) -> VestingReport:
+        """
+        Находит ссылку на Cryptorank и получает данные о вестинге.
+
+        Args:
+            token (str): Идентификатор токена.
+
+        Returns:
+            VestingReport: Данные о вестинге из Cryptorank.
+        """
+        token_cryptorank = get_link_resolver().resolve("cryptorank", token)
+        return CryptoRankVestingFetcher().get_vesting_cryptorank(token_cryptorank)
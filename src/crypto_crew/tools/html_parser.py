@@ -0,0 +1,95 @@
+# src/crypto_crew/tools/html_parser.py
+
+import os
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from src.crypto_crew.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Бэкенд парсинга: 'auto', 'lxml', 'html.parser' или 'html5lib'.
+# 'auto' выбирает lxml для разбора с SoupStrainer (страницы Dropstab), а полные страницы
+# (CryptoRank, сайты) разбирает html.parser: на них lxml в benchmarks.parser_backends
+# то быстрее, то медленнее (до 0.62x на cryptorank_ico/medium)
+HTML_PARSER = os.getenv("CRYPTO_CREW_HTML_PARSER", "auto")
+
+_OPTIONAL_BACKENDS = {
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+}
+
+
+def available_backends() -> list:
+    """
+    Возвращает список бэкендов парсинга, доступных в текущем окружении.
+
+    Returns:
+        list: Имена бэкендов, понятные BeautifulSoup.
+    """
+    backends = ["html.parser"]
+    for backend, module in _OPTIONAL_BACKENDS.items():
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def resolve_backend(backend: str = None, strained: bool = False) -> str:
+    """
+    Определяет бэкенд парсинга с учетом настройки и установленных пакетов.
+
+    Args:
+        backend (str): Явно заданный бэкенд (по умолчанию CRYPTO_CREW_HTML_PARSER).
+        strained (bool): Разбирается только часть страницы (parse_only).
+
+    Returns:
+        str: Имя бэкенда для BeautifulSoup.
+    """
+    backend = backend or HTML_PARSER
+    if backend == "auto":
+        return "lxml" if strained and "lxml" in available_backends() else "html.parser"
+    if backend != "html.parser" and backend not in available_backends():
+        logger.warning(f"Бэкенд {backend} не установлен, используется html.parser")
+        return "html.parser"
+    return backend
+
+
+def make_soup(markup: str, parse_only: SoupStrainer = None, backend: str = None) -> BeautifulSoup:
+    """
+    Строит дерево BeautifulSoup выбранным бэкендом.
+
+    Если передан parse_only, в дерево попадают только совпавшие элементы
+    вместе с их содержимым, остальная разметка пропускается при разборе.
+
+    Args:
+        markup (str): HTML для разбора.
+        parse_only (SoupStrainer): Фильтр элементов, которые нужно построить.
+        backend (str): Бэкенд парсинга (по умолчанию CRYPTO_CREW_HTML_PARSER).
+
+    Returns:
+        BeautifulSoup: Дерево разобранного HTML.
+    """
+    backend = resolve_backend(backend, strained=parse_only is not None)
+    with span("parse.make_soup", backend=backend, strained=parse_only is not None) as current:
+        if current.recording:
+            current.set(html_bytes=len(markup.encode("utf-8")))
+        return BeautifulSoup(markup, backend, parse_only=parse_only)
+
+
+def strainer(names, classes) -> SoupStrainer:
+    """
+    Создает фильтр для разбора только нужных секций страницы.
+
+    Классы сравниваются так же, как в find_all(class_=...): строка с пробелами
+    должна совпадать со значением атрибута class целиком.
+
+    Args:
+        names (str | list): Имена тегов.
+        classes (str | list): Значения атрибута class.
+
+    Returns:
+        SoupStrainer: Фильтр для параметра parse_only.
+    """
+    return SoupStrainer(names, class_=classes)
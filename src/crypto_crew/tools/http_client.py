@@ -0,0 +1,146 @@
+# src/crypto_crew/tools/http_client.py
+
+import os
+import asyncio
+import threading
+import weakref
+import logging
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from src.crypto_crew.tools.rate_limit import get_limiter
+from src.crypto_crew.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Число пулов (хостов), которые держит адаптер, и размер пула соединений на хост
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
+# Таймауты на установку соединения и чтение ответа (в секундах)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+
+DEFAULT_HEADERS = {
+    "User-Agent": os.getenv("HTTP_USER_AGENT", "crypto_crew/0.1"),
+}
+
+
+class PooledSession(requests.Session):
+    """
+    Сессия requests с пулом keep-alive соединений и таймаутами по умолчанию.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.headers.update(DEFAULT_HEADERS)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        with span("http", method=method, host=urlsplit(url).netloc) as current:
+            response = super().request(method, url, **kwargs)
+            if current.recording:
+                # Потоковый ответ не читается ради размера - берется заголовок
+                size = response.headers.get("Content-Length") if kwargs.get("stream") else len(response.content)
+                current.set(status=response.status_code, response_bytes=int(size or 0))
+            return response
+
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """
+    Возвращает общую для процесса сессию с пулом соединений.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
+
+
+def request(method: str, url: str, upstream: str = None, **kwargs) -> requests.Response:
+    """
+    Выполняет HTTP-запрос через общую сессию.
+
+    Args:
+        method (str): HTTP-метод.
+        url (str): Адрес запроса.
+        upstream (str): Имя сервиса для ограничения частоты ('cmc', 'serper'); None - без ограничения.
+        **kwargs: Аргументы requests.Session.request.
+
+    Returns:
+        requests.Response: Ответ сервера.
+    """
+    if upstream is None:
+        return get_session().request(method, url, **kwargs)
+
+    limiter = get_limiter(upstream)
+    limiter.acquire()
+    response = get_session().request(method, url, **kwargs)
+    limiter.feedback(response.status_code, response.headers.get("Retry-After"))
+    return response
+
+
+def get(url: str, upstream: str = None, **kwargs) -> requests.Response:
+    return request("GET", url, upstream, **kwargs)
+
+
+def post(url: str, upstream: str = None, **kwargs) -> requests.Response:
+    return request("POST", url, upstream, **kwargs)
+
+
+def get_async_client():
+    """
+    Возвращает асинхронный клиент httpx для текущего event loop.
+
+    Клиент создается один раз на event loop и использует те же размеры пула,
+    таймауты и заголовки, что и синхронная сессия. Требует установленного httpx.
+
+    Returns:
+        httpx.AsyncClient: Асинхронный клиент с пулом соединений.
+    """
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("Для асинхронного клиента установите httpx: pip install httpx") from e
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose() -> None:
+    """
+    Закрывает асинхронный клиент текущего event loop.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def close() -> None:
+    """
+    Закрывает общую синхронную сессию.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
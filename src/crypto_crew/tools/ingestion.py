@@ -0,0 +1,322 @@
+# src/crypto_crew/tools/ingestion.py
+
+import os
+import codecs
+import tempfile
+import threading
+import logging
+from itertools import chain
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from src.crypto_crew.tools import http_client
+from src.crypto_crew.tools.compaction import compact_output
+from src.crypto_crew.tools.embedding_store import (
+    CHUNK_SIZE, EMBEDDING_BATCH_SIZE, chunk_id, chunk_text, content_hash, get_embedding_store
+)
+from src.crypto_crew.tools.fan_out import run_with_deadline
+from src.crypto_crew.tracing import run_in_context, span
+
+logger = logging.getLogger(__name__)
+
+# Размер блока при потоковом чтении ответа и предельный размер документа (в байтах)
+INGEST_READ_BYTES = int(os.getenv("INGEST_READ_BYTES", str(64 * 1024)))
+INGEST_MAX_BYTES = int(os.getenv("INGEST_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# PDF держится в памяти до этого размера, больший сбрасывается во временный файл
+INGEST_SPOOL_BYTES = int(os.getenv("INGEST_SPOOL_BYTES", str(1024 * 1024)))
+
+# Параллельные запросы эмбеддингов на документ; пачек в очереди не больше 2 * INGEST_WORKERS
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+
+# Сколько фрагментов на каждый вопрос анализа передается агенту
+INGEST_TOP_K = int(os.getenv("INGEST_TOP_K", "3"))
+
+# Вопросы, по которым отбираются фрагменты сайта и whitepaper (разделы отчета technology_analyst_task)
+INGEST_QUERIES = (
+    "market sector and role of the project in the blockchain ecosystem",
+    "technical architecture, consensus mechanism and scalability",
+    "proprietary technology, cryptography and innovations",
+    "security, risks and competitive advantages",
+)
+
+# Теги, текст которых не индексируется, и теги, завершающие абзац
+SKIPPED_TAGS = {"script", "style", "noscript", "svg", "nav", "footer", "head", "template"}
+BLOCK_TAGS = {"p", "div", "section", "article", "li", "tr", "br", "h1", "h2", "h3", "h4", "h5", "h6",
+              "pre", "blockquote", "table", "ul", "ol", "header", "main"}
+
+NOT_INGESTED = (
+    "Сайт и документация не были проиндексированы заранее. "
+    "Изучите их с помощью инструмента 'ScrapeWebsiteTool'."
+)
+
+
+class DocumentTooLarge(requests.RequestException):
+    """
+    Документ больше INGEST_MAX_BYTES.
+    """
+
+
+class HTMLTextStream(HTMLParser):
+    """
+    Инкрементальное извлечение текста из HTML: разметка подается блоками по мере
+    загрузки, готовые абзацы забираются через drain, поэтому страница целиком
+    в памяти не хранится.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip = 0
+        self._paragraph = []
+        self._paragraphs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self._end_paragraph()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._end_paragraph()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._paragraph.append(data)
+
+    def _end_paragraph(self):
+        text = " ".join("".join(self._paragraph).split())
+        self._paragraph = []
+        if text:
+            self._paragraphs.append(text)
+
+    def drain(self) -> str:
+        """
+        Возвращает абзацы, извлеченные с прошлого вызова.
+        """
+        text = "\n".join(self._paragraphs)
+        self._paragraphs = []
+        return text
+
+    def close(self):
+        super().close()
+        self._end_paragraph()
+
+
+def _limited(blocks, url: str):
+    """
+    Пропускает блоки ответа, прерываясь на INGEST_MAX_BYTES.
+    """
+    total = 0
+    for block in blocks:
+        total += len(block)
+        if total > INGEST_MAX_BYTES:
+            raise DocumentTooLarge(f"{url}: документ больше {INGEST_MAX_BYTES} байт")
+        yield block
+
+
+def _html_text(blocks, encoding: str):
+    """
+    Извлекает текст HTML по мере загрузки.
+    """
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    parser = HTMLTextStream()
+    for block in blocks:
+        parser.feed(decoder.decode(block))
+        yield parser.drain()
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    yield parser.drain()
+
+
+def _pdf_text(blocks, url: str):
+    """
+    Извлекает текст PDF постранично.
+
+    Таблица ссылок PDF находится в конце файла, поэтому документ сначала
+    загружается потоком во временный файл (в памяти - только до INGEST_SPOOL_BYTES),
+    а затем страницы читаются по одной.
+    """
+    from pypdf import PdfReader
+
+    with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_BYTES) as spool:
+        for block in blocks:
+            spool.write(block)
+        spool.seek(0)
+        reader = PdfReader(spool)
+        for number, page in enumerate(reader.pages, 1):
+            try:
+                yield page.extract_text() or ""
+            except Exception as e:
+                logger.warning(f"{url}: страница {number} не извлечена: {e}")
+
+
+def stream_text(url: str):
+    """
+    Скачивает документ (HTML или PDF) потоком и возвращает его текст частями.
+
+    Args:
+        url (str): Адрес страницы или PDF.
+
+    Yields:
+        str: Очередная часть текста.
+    """
+    with http_client.get(url, stream=True) as response:
+        response.raise_for_status()
+        blocks = _limited(response.iter_content(chunk_size=INGEST_READ_BYTES), url)
+        first = next(blocks, b"")
+        content_type = response.headers.get("Content-Type", "").lower()
+        blocks = chain([first], blocks)
+        if "pdf" in content_type or first.startswith(b"%PDF"):
+            yield from _pdf_text(blocks, url)
+        else:
+            # Без charset в заголовке requests считает text/html кодировкой ISO-8859-1
+            yield from _html_text(blocks, response.encoding if "charset" in content_type else "utf-8")
+
+
+def iter_chunks(pieces, size: int = None):
+    """
+    Делит поток текста на фрагменты по мере поступления.
+
+    В буфере держится не больше двух фрагментов: все, кроме последнего
+    (он может продолжиться в следующей части), отдаются сразу.
+
+    Args:
+        pieces (iterable): Части текста.
+        size (int): Размер фрагмента (по умолчанию EMBEDDING_CHUNK_SIZE).
+
+    Yields:
+        str: Фрагмент текста.
+    """
+    size = size or CHUNK_SIZE
+    buffer = ""
+    # Хэши отданных фрагментов: повторяющиеся блоки (меню, колонтитулы PDF) индексируются один раз
+    seen = set()
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer = f"{buffer}\n{piece}" if buffer else piece
+        if len(buffer) < 2 * size:
+            continue
+        chunks = chunk_text(buffer, size)
+        buffer = chunks.pop() if chunks else ""
+        for chunk in chunks:
+            if content_hash(chunk) not in seen:
+                seen.add(content_hash(chunk))
+                yield chunk
+    for chunk in chunk_text(buffer, size):
+        if content_hash(chunk) not in seen:
+            seen.add(content_hash(chunk))
+            yield chunk
+
+
+def _batches(chunks, size: int):
+    batch = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(token: str, url: str, store=None, workers: int = None) -> int:
+    """
+    Индексирует документ в коллекции токена: загрузка, извлечение текста, разбиение
+    и эмбеддинги идут конвейером, пачки эмбеддингов отправляются параллельно.
+
+    Документ, проиндексированный не позже EMBEDDING_TTL назад, не скачивается.
+
+    Args:
+        token (str): Символ токена.
+        url (str): Адрес страницы или PDF.
+        store (EmbeddingStore): Хранилище (по умолчанию общее для процесса).
+        workers (int): Параллельные пачки эмбеддингов (по умолчанию INGEST_WORKERS).
+
+    Returns:
+        int: Число фрагментов документа (0, если документ уже проиндексирован).
+    """
+    store = store or get_embedding_store()
+    if store.is_fresh(token, url):
+        return 0
+
+    workers = max(1, workers or INGEST_WORKERS)
+    # Ограничение очереди: загрузка ждет, пока эмбеддинги догонят, и память не растет
+    slots = threading.BoundedSemaphore(2 * workers)
+    chunks = added = 0
+    futures = []
+    # Идентификаторы новой версии документа: фрагменты прежней версии удаляются после индексации
+    ids = set()
+    with span("ingest", url=url) as current, ThreadPoolExecutor(max_workers=workers,
+                                                                 thread_name_prefix="ingest") as executor:
+        def index_batch(batch):
+            try:
+                return store.add_chunks(token, url, batch)
+            finally:
+                slots.release()
+
+        for batch in _batches(iter_chunks(stream_text(url)), EMBEDDING_BATCH_SIZE):
+            slots.acquire()
+            chunks += len(batch)
+            ids.update(chunk_id(url, chunk) for chunk in batch)
+            futures.append(executor.submit(run_in_context(lambda batch=batch: index_batch(batch))))
+        added = sum(future.result() for future in futures)
+        removed = store.remove_stale(token, url, ids)
+        current.set(chunks=chunks, added=added, removed=removed)
+
+    store.mark_indexed(token, url, chunks)
+    logger.info(f"{url}: {added} новых фрагментов из {chunks}, {removed} устаревших удалено")
+    return chunks
+
+
+def relevant_chunks(token: str, urls: list, queries=INGEST_QUERIES, k: int = None, store=None) -> list:
+    """
+    Отбирает фрагменты документов, ближайшие к вопросам анализа (без повторов).
+
+    Returns:
+        list of dict: text, url, distance.
+    """
+    store = store or get_embedding_store()
+    selected = {}
+    for query in queries:
+        for item in store.search(token, query, k=k or INGEST_TOP_K, url=urls):
+            known = selected.get(item["text"])
+            if known is None or item["distance"] < known["distance"]:
+                selected[item["text"]] = item
+    return sorted(selected.values(), key=lambda item: item["distance"])
+
+
+def prepare_documents(token: str, urls: list, deadline: float = None) -> str:
+    """
+    Индексирует сайт и whitepaper токена и возвращает для агента только релевантные фрагменты.
+
+    Args:
+        token (str): Символ токена.
+        urls (list): Адреса документов (пустые пропускаются).
+        deadline (float): Дедлайн индексации в секундах.
+
+    Returns:
+        str: Фрагменты с указанием источника или NOT_INGESTED, если проиндексировать не удалось.
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return NOT_INGESTED
+
+    results = run_with_deadline({url: lambda url=url: ingest(token, url) for url in urls}, deadline=deadline)
+    indexed = []
+    for url, result in results.items():
+        if isinstance(result, Exception):
+            logger.error(f"Индексация {url} не удалась: {result}")
+        else:
+            indexed.append(url)
+    if not indexed:
+        return NOT_INGESTED
+
+    chunks = relevant_chunks(token, indexed)
+    if not chunks:
+        return NOT_INGESTED
+    text = "\n\n".join(f"[{idx}] {item['url']}\n{item['text']}" for idx, item in enumerate(chunks, 1))
+    return compact_output("technology documents", text)
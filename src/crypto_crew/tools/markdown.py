@@ -0,0 +1,141 @@
+# src/crypto_crew/tools/markdown.py
+
+import os
+from src.crypto_crew.tools.records import FundraisingReport, VestingReport
+
+# Плотные таблицы без выравнивания пробелами (меньше токенов в промпте)
+DENSE_TABLES = os.getenv("CRYPTO_CREW_DENSE_TABLES", "1").lower() not in ("0", "false", "no")
+
+
+def table(headers: list, rows: list, dense: bool = None) -> str:
+    """
+    Форматирует таблицу Markdown (pipe).
+
+    В плотном режиме ячейки не выравниваются пробелами, а внешние '|' опускаются.
+
+    Args:
+        headers (list): Заголовки столбцов.
+        rows (list): Строки таблицы (значения приводятся к str).
+        dense (bool): Плотный режим (по умолчанию CRYPTO_CREW_DENSE_TABLES).
+
+    Returns:
+        str: Таблица Markdown без завершающего перевода строки.
+    """
+    if dense is None:
+        dense = DENSE_TABLES
+
+    cells = [[str(value).replace("|", "\\|") for value in row] for row in rows]
+    if dense:
+        lines = ["|".join(str(header) for header in headers), "|".join("---" for _ in headers)]
+        lines.extend("|".join(row) for row in cells)
+        return "\n".join(lines)
+
+    widths = [len(str(header)) for header in headers]
+    for row in cells:
+        for idx, value in enumerate(row):
+            widths[idx] = max(widths[idx], len(value))
+
+    lines = [
+        "| " + " | ".join(f"{header:<{width}}" for header, width in zip(headers, widths)) + " |",
+        "|" + "|".join(":" + "-" * (width + 1) for width in widths) + "|",
+    ]
+    for row in cells:
+        lines.append("| " + " | ".join(f"{value:<{width}}" for value, width in zip(row, widths)) + " |")
+    return "\n".join(lines)
+
+
+def render_vesting(report: VestingReport, dense: bool = None) -> str:
+    """
+    Форматирует данные о вестинге для отчета агента.
+
+    Args:
+        report (VestingReport): Данные о вестинге из одного источника.
+        dense (bool): Плотные таблицы (по умолчанию CRYPTO_CREW_DENSE_TABLES).
+
+    Returns:
+        str: Отформатированный текст с таблицами Markdown.
+    """
+    if report.source == "dropstab":
+        if not report.allocations:
+            return "Данные о вестинге не найдены."
+        result = "========== Vesting ============\n"
+        result += "## Source: Dropstab ##\n"
+        result += "# Vesting Information:\n"
+        result += table(
+            ["Название", "Разблокировано", "Общий объем", "Заблокировано"],
+            [(item.name, item.unlocked, item.total, item.locked) for item in report.allocations],
+            dense
+        )
+        return result + "\n\n"
+
+    lines = [
+        f"Тип: {item.type}, Процент: {item.percentage}, "
+        f"Количество токенов: {item.token_amount}, "
+        f"Долларовый эквивалент: {item.usd_amount}"
+        for item in report.distribution
+    ]
+    lines.append("\nДанные об аллокации:")
+    lines.append(table(
+        ["Name", "Total", "Unlocked", "Locked"],
+        [(item.name, item.total, item.unlocked, item.locked) for item in report.allocations],
+        dense
+    ))
+    return "\n".join(lines) + "\n"
+
+
+def render_fundraising(report: FundraisingReport, dense: bool = None) -> str:
+    """
+    Форматирует данные о финансировании для отчета агента.
+
+    Args:
+        report (FundraisingReport): Данные о финансировании из одного источника.
+        dense (bool): Плотные таблицы (по умолчанию CRYPTO_CREW_DENSE_TABLES).
+
+    Returns:
+        str: Отформатированный текст с таблицами Markdown.
+    """
+    if report.source == "dropstab":
+        result = "========== Fundraising ============\n"
+        result += "## Source: Dropstab ##\n"
+        result += "# Инвесторы\n"
+        if report.investors:
+            result += table(
+                ["#", "Имя", "Tier", "Тип", "Стадия"],
+                [(item.number, item.name, item.tier, item.investor_type, item.stages) for item in report.investors],
+                dense
+            ) + "\n\n"
+        else:
+            result += "Инвесторы не найдены.\n\n"
+
+        result += "# Раунды финансирования:\n"
+        if report.rounds:
+            result += "\n".join(
+                f"Раунд: {item.name}, Дата: {item.date}, Собрано средств: {item.raised}"
+                for item in report.rounds
+            ) + "\n\n"
+        else:
+            result += "Раунды финансирования не найдены.\n\n"
+        return result
+
+    lines = ["## Source: Cryptorank ##\n\n"]
+    if report.investors:
+        lines.append("**Инвесторы и партнеры**\n")
+        lines.append(table(
+            ["Название", "Уровень", "Тип", "Этапы инвестирования"],
+            [(item.name, item.tier, item.investor_type, item.stages) for item in report.investors],
+            dense
+        ) + "\n")
+    else:
+        lines.append("Инвесторы не найдены.\n")
+
+    lines.append("\n**Финансовые раунды, IEO и Launchpools**\n")
+    for idx, item in enumerate(report.rounds, 1):
+        lines.append(
+            f"{idx}. **{item.name} на платформе {item.platform}**\n"
+            f"   - **Дата:** {item.date}\n"
+            f"   - **Собранная сумма:** {item.raised}\n"
+            f"   - **Цена токена:** {item.price}\n"
+            f"   - **ROI:** {item.roi}\n"
+            f"   - **ATH ROI:** {item.ath_roi}\n"
+        )
+    return ''.join(lines)
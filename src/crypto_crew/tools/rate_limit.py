@@ -0,0 +1,309 @@
+# src/crypto_crew/tools/rate_limit.py
+
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+import logging
+from collections import deque
+from src.crypto_crew.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# Лимиты по умолчанию: запросов в секунду и емкость корзины (всплеск).
+# Переопределяются переменной RATE_LIMIT_<UPSTREAM>='<rate>/<burst>', например RATE_LIMIT_SERPER=5/10;
+# RATE_LIMIT_<UPSTREAM>=0 снимает ограничение.
+DEFAULT_RATE_LIMITS = {
+    # Тариф Basic CoinMarketCap: 30 запросов в минуту
+    "cmc": (int(os.getenv("CMC_REQUESTS_PER_MINUTE", "30")) / 60, 1),
+    "serper": (5.0, 10),
+    "render": (4.0, 8),
+}
+
+# Общее состояние корзин для нескольких процессов (например, параллельных run_batch); пусто - в памяти процесса
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", "")
+
+# AIMD: после 429 скорость умножается на DECREASE (не ниже MIN_FRACTION от настроенной),
+# после каждого успешного ответа растет на INCREASE от настроенной (не выше нее)
+RATE_LIMIT_DECREASE = float(os.getenv("RATE_LIMIT_DECREASE", "0.5"))
+RATE_LIMIT_INCREASE = float(os.getenv("RATE_LIMIT_INCREASE", "0.05"))
+RATE_LIMIT_MIN_FRACTION = float(os.getenv("RATE_LIMIT_MIN_FRACTION", "0.1"))
+
+
+class LocalBucketStore:
+    """
+    Состояние корзин в памяти процесса.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def transact(self, name: str, initial: dict, update):
+        """
+        Атомарно применяет update к состоянию корзины.
+
+        Args:
+            name (str): Имя корзины.
+            initial (dict): Состояние новой корзины.
+            update (callable): Функция, изменяющая словарь состояния и возвращающая результат.
+
+        Returns:
+            Any: Результат update.
+        """
+        with self._lock:
+            state = self._states.setdefault(name, dict(initial))
+            return update(state)
+
+
+class SQLiteBucketStore:
+    """
+    Состояние корзин в SQLite: процессы на одной машине делят общий лимит.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " rate REAL NOT NULL,"
+                " blocked_until REAL NOT NULL)"
+            )
+        return self._conn
+
+    def transact(self, name: str, initial: dict, update):
+        with self._lock:
+            conn = self._connect()
+            # BEGIN IMMEDIATE берет блокировку записи сразу: чтение и запись состояния атомарны между процессами
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated, rate, blocked_until FROM buckets WHERE name = ?", (name,)
+                ).fetchone()
+                state = dict(zip(("tokens", "updated", "rate", "blocked_until"), row)) if row else dict(initial)
+                result = update(state)
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated, rate, blocked_until) VALUES (?, ?, ?, ?, ?)",
+                    (name, state["tokens"], state["updated"], state["rate"], state["blocked_until"])
+                )
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class TokenBucket:
+    """
+    Корзина токенов одного внешнего сервиса.
+
+    Запрос резервирует токен (баланс может уйти в минус) и ждет, пока резерв
+    не покроется пополнением, поэтому ожидающие обслуживаются по очереди и
+    одинаково для потоков (acquire) и asyncio (aacquire). Ответ 429 снижает
+    скорость вдвое и блокирует корзину на Retry-After, успешные ответы
+    постепенно возвращают скорость к настроенной.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, store=None):
+        self.name = name
+        self.max_rate = rate
+        self.burst = max(1.0, burst)
+        self.store = store or LocalBucketStore()
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1000)
+        self.acquired = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.throttled = 0
+        self.rate = rate
+
+    def _initial(self) -> dict:
+        return {"tokens": self.burst, "updated": time.time(), "rate": self.max_rate, "blocked_until": 0.0}
+
+    def _reserve(self, tokens: float) -> float:
+        def update(state):
+            now = time.time()
+            # Лимит в общей базе мог остаться от запуска с большей скоростью
+            state["rate"] = min(state["rate"], self.max_rate)
+            # Пока корзина заблокирована после 429, токены не накапливаются
+            elapsed = max(0.0, now - max(state["updated"], state["blocked_until"]))
+            state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+            state["updated"] = now
+            state["tokens"] -= tokens
+            self.rate = state["rate"]
+            deficit = -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0.0
+            return max(deficit, state["blocked_until"] - now)
+
+        return self.store.transact(self.name, self._initial(), update)
+
+    def _record_wait(self, wait: float) -> None:
+        with self._lock:
+            self.acquired += 1
+            self._waits.append(wait)
+            if wait > 0:
+                self.waited += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+        if wait > 0:
+            current_span().set(queue_wait_s=round(wait, 3))
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Ждет токен в текущем потоке.
+
+        Returns:
+            float: Время ожидания в очереди (в секундах).
+        """
+        wait = self._reserve(tokens)
+        self._record_wait(wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 1) -> float:
+        """
+        Ждет токен, не блокируя event loop.
+
+        Returns:
+            float: Время ожидания в очереди (в секундах).
+        """
+        wait = self._reserve(tokens)
+        self._record_wait(wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def feedback(self, status: int, retry_after: str = None) -> None:
+        """
+        Подстраивает скорость по ответу сервиса (AIMD).
+
+        Args:
+            status (int): HTTP-статус ответа.
+            retry_after (str): Заголовок Retry-After (в секундах).
+        """
+        if status == 429:
+            try:
+                block = float(retry_after) if retry_after else 0.0
+            except ValueError:
+                block = 0.0
+            with self._lock:
+                self.throttled += 1
+
+            def decrease(state):
+                now = time.time()
+                # Накопленные токены сгорают, уже выданные резервы сохраняются
+                refilled = state["tokens"] + (now - state["updated"]) * state["rate"]
+                state["tokens"] = min(refilled, 0.0)
+                state["updated"] = now
+                state["rate"] = max(self.max_rate * RATE_LIMIT_MIN_FRACTION, state["rate"] * RATE_LIMIT_DECREASE)
+                state["blocked_until"] = max(state["blocked_until"], now + block)
+                return state["rate"]
+
+            self.rate = self.store.transact(self.name, self._initial(), decrease)
+            logger.warning(f"{self.name}: 429, скорость снижена до {self.rate:.2f} запросов/с")
+        elif status < 400 and self.rate < self.max_rate:
+            def increase(state):
+                state["rate"] = min(self.max_rate, state["rate"] + self.max_rate * RATE_LIMIT_INCREASE)
+                return state["rate"]
+
+            self.rate = self.store.transact(self.name, self._initial(), increase)
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики корзины и время ожидания в очереди (p95 по последним 1000 запросам).
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "rate": round(self.rate, 3),
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "throttled": self.throttled,
+                "wait_total_s": round(self.wait_total, 2),
+                "wait_p95_s": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 3) if waits else 0.0,
+                "wait_max_s": round(self.wait_max, 2),
+            }
+
+
+class _Unlimited:
+    """
+    Заглушка для сервиса без ограничения: не ждет и не ведет счетчиков.
+    """
+
+    def acquire(self, tokens: float = 1) -> float:
+        return 0.0
+
+    async def aacquire(self, tokens: float = 1) -> float:
+        return 0.0
+
+    def feedback(self, status: int, retry_after: str = None) -> None:
+        pass
+
+
+UNLIMITED = _Unlimited()
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_store = None
+
+
+def rate_limit_config(upstream: str) -> tuple:
+    """
+    Возвращает (rate, burst) сервиса с учетом RATE_LIMIT_<UPSTREAM>.
+
+    Returns:
+        tuple | None: Лимит или None, если ограничение снято.
+    """
+    value = os.getenv(f"RATE_LIMIT_{upstream.upper()}")
+    if value is None:
+        rate, burst = DEFAULT_RATE_LIMITS.get(upstream, (0, 0))
+    else:
+        rate, _, burst = value.partition("/")
+        rate = float(rate or 0)
+        burst = float(burst) if burst else max(1.0, rate)
+    return (rate, burst) if rate > 0 else None
+
+
+def get_limiter(upstream: str):
+    """
+    Возвращает общую для процесса корзину сервиса ('cmc', 'serper', 'render').
+
+    Args:
+        upstream (str): Имя сервиса.
+
+    Returns:
+        TokenBucket: Корзина (или объект без ограничения, если лимит снят).
+    """
+    global _store
+    with _limiters_lock:
+        limiter = _limiters.get(upstream)
+        if limiter is None:
+            config = rate_limit_config(upstream)
+            if config is None:
+                limiter = UNLIMITED
+            else:
+                if _store is None:
+                    _store = SQLiteBucketStore(RATE_LIMIT_DB) if RATE_LIMIT_DB else LocalBucketStore()
+                limiter = TokenBucket(upstream, *config, store=_store)
+            _limiters[upstream] = limiter
+        return limiter
+
+
+def rate_limit_stats() -> dict:
+    """
+    Возвращает счетчики всех ограниченных сервисов.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.items())
+    return {name: limiter.stats() for name, limiter in limiters if isinstance(limiter, TokenBucket)}
@@ -0,0 +1,228 @@
+# src/crypto_crew/tools/records.py
+
+import re
+from dataclasses import dataclass, fields
+from typing import Optional
+
+# Множители сокращений и слов в суммах: $1.2M, 350K TON, 1.5B, 12.5 Million
+_MULTIPLIERS = {
+    "": 1.0,
+    "k": 1e3,
+    "thousand": 1e3,
+    "m": 1e6,
+    "mn": 1e6,
+    "mln": 1e6,
+    "million": 1e6,
+    "b": 1e9,
+    "bn": 1e9,
+    "billion": 1e9,
+    "t": 1e12,
+    "trillion": 1e12,
+}
+
+# Целая часть - группы по три цифры через пробел или запятую ('1 234 567', '1,000,000') или просто цифры
+_NUMBER = re.compile(
+    r"(-?(?:\d{1,3}(?:[ ,]\d{3})+(?!\d)|\d+)(?:[.,]\d+)?)"
+    r"(?:\s?(thousand|million|billion|trillion|mln|mn|bn|[kmbt])(?![a-z]))?",
+    re.IGNORECASE,
+)
+
+# Буква перед числом или сразу после него - часть слова ('Q1', '1st'); 'x' - множитель ROI ('x12.5', '3.5x')
+_ROI_MARK = "xX"
+
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Извлекает первое число из текста страницы с учетом разделителей разрядов и сокращений.
+
+    Args:
+        text (str): Текст ячейки (например, '$1.25M', '45.2%', '1 234 567 TON', '12.5 Million', 'x12.5').
+
+    Returns:
+        float | None: Числовое значение или None, если числа в тексте нет или
+        первое число - часть слова ('Q1 2024').
+    """
+    if not text:
+        return None
+    text = text.replace("\xa0", " ").replace("\u202f", " ")
+    match = _NUMBER.search(text)
+    if match is None:
+        return None
+    before = text[match.start() - 1] if match.start() else ""
+    after = text[match.end():match.end() + 1]
+    if (before.isalpha() and before not in _ROI_MARK) or (after.isalpha() and after not in _ROI_MARK):
+        return None
+
+    digits, suffix = match.groups()
+    digits = digits.replace(" ", "")
+    # Запятая - разделитель разрядов, если за ней ровно три цифры, иначе десятичная
+    if "," in digits and "." not in digits and not re.fullmatch(r"-?\d{1,3}(,\d{3})+", digits):
+        digits = digits.replace(",", ".")
+    else:
+        digits = digits.replace(",", "")
+    try:
+        return float(digits) * _MULTIPLIERS[(suffix or "").lower()]
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class Value:
+    """
+    Значение ячейки: исходный текст со страницы и разобранное число.
+    """
+
+    text: str
+    number: Optional[float] = None
+
+    @classmethod
+    def parse(cls, text: str) -> "Value":
+        return cls(text, parse_number(text))
+
+    def __str__(self) -> str:
+        return self.text
+
+
+NA = Value("N/A")
+
+
+class Record:
+    """
+    Общие методы сериализации записей.
+
+    Поля Value сериализуются плоско: '<поле>' - исходный текст,
+    '<поле>_value' - число (None, если не распознано).
+    """
+
+    __slots__ = ()
+
+    def to_dict(self) -> dict:
+        data = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, Value):
+                data[field.name] = value.text
+                data[f"{field.name}_value"] = value.number
+            else:
+                data[field.name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        kwargs = {}
+        for field in fields(cls):
+            if field.name not in data:
+                continue
+            value = data[field.name]
+            if f"{field.name}_value" in data:
+                value = Value(value, data[f"{field.name}_value"])
+            kwargs[field.name] = value
+        return cls(**kwargs)
+
+
+@dataclass(frozen=True, slots=True)
+class VestingAllocation(Record):
+    """
+    Аллокация токенов: категория получателей и объемы разблокировки.
+    """
+
+    source: str
+    name: str
+    total: Value = NA
+    unlocked: Value = NA
+    locked: Value = NA
+
+
+@dataclass(frozen=True, slots=True)
+class DistributionProgress(Record):
+    """
+    Прогресс распределения токенов (разблокировано / заблокировано / ...).
+    """
+
+    source: str
+    type: str
+    percentage: Value = NA
+    token_amount: Value = NA
+    usd_amount: Value = NA
+
+
+@dataclass(frozen=True, slots=True)
+class FundingRound(Record):
+    """
+    Раунд финансирования, IEO или Launchpool.
+    """
+
+    source: str
+    name: str
+    date: str = "N/A"
+    raised: Value = NA
+    price: Value = NA
+    roi: Value = NA
+    ath_roi: Value = NA
+    platform: str = "N/A"
+
+
+@dataclass(frozen=True, slots=True)
+class Investor(Record):
+    """
+    Инвестор проекта.
+    """
+
+    source: str
+    name: str
+    tier: str = "N/A"
+    investor_type: str = "N/A"
+    stages: str = "N/A"
+    number: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class VestingReport(Record):
+    """
+    Данные о вестинге из одного источника.
+    """
+
+    source: str
+    allocations: tuple = ()
+    distribution: tuple = ()
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "allocations": [item.to_dict() for item in self.allocations],
+            "distribution": [item.to_dict() for item in self.distribution],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VestingReport":
+        return cls(
+            source=data["source"],
+            allocations=tuple(VestingAllocation.from_dict(item) for item in data.get("allocations", [])),
+            distribution=tuple(DistributionProgress.from_dict(item) for item in data.get("distribution", [])),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FundraisingReport(Record):
+    """
+    Данные о финансировании из одного источника.
+    """
+
+    source: str
+    rounds: tuple = ()
+    investors: tuple = ()
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "rounds": [item.to_dict() for item in self.rounds],
+            "investors": [item.to_dict() for item in self.investors],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FundraisingReport":
+        return cls(
+            source=data["source"],
+            rounds=tuple(FundingRound.from_dict(item) for item in data.get("rounds", [])),
+            investors=tuple(Investor.from_dict(item) for item in data.get("investors", [])),
+        )
@@ -0,0 +1,346 @@
+# src/crypto_crew/tools/render_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Время жизни записей по умолчанию (в секундах) для пары (источник, тип страницы)
+DEFAULT_TTLS = {
+    ("dropstab", "vesting"): 6 * 3600,
+    ("dropstab", "fundraising"): 24 * 3600,
+    ("cryptorank", "vesting"): 6 * 3600,
+    ("cryptorank", "ico"): 24 * 3600,
+}
+DEFAULT_TTL = 6 * 3600
+
+# Сколько секунд после истечения TTL запись еще можно отдавать, обновляя ее в фоне
+DEFAULT_STALE_TTL = 7 * 24 * 3600
+
+DEFAULT_CACHE_PATH = "./tmp/render_cache.sqlite3"
+
+
+class RenderCache:
+    """
+    Постоянный кэш ответов прокси рендеринга в SQLite.
+
+    Ключ записи - пара (goto, sel) из payload запроса. Свежие записи отдаются
+    без обращения к прокси, устаревшие (в пределах stale-окна) отдаются сразу
+    и обновляются в фоновом потоке.
+    """
+
+    def __init__(self, path: str = None, enabled: bool = None):
+        self.path = os.path.abspath(path or os.getenv("RENDER_CACHE_PATH", DEFAULT_CACHE_PATH))
+        if enabled is None:
+            enabled = os.getenv("RENDER_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+        self.enabled = enabled
+        self.stale_ttl = int(os.getenv("RENDER_CACHE_STALE_TTL", DEFAULT_STALE_TTL))
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._conn = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открывает соединение с базой кэша и создает таблицу при первом обращении.
+        """
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " source TEXT NOT NULL,"
+                " page TEXT NOT NULL,"
+                " goto TEXT NOT NULL,"
+                " sel TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(payload: dict) -> str:
+        """
+        Строит ключ кэша по адресу страницы и CSS-селектору.
+
+        Args:
+            payload (dict): Payload запроса к прокси рендеринга.
+
+        Returns:
+            str: SHA-256 от пары (goto, sel).
+        """
+        raw = json.dumps({"goto": payload.get("goto"), "sel": payload.get("sel")}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def ttl(source: str, page: str) -> int:
+        """
+        Возвращает TTL для источника и типа страницы.
+
+        Значение можно переопределить переменной окружения
+        RENDER_CACHE_TTL_<SOURCE>_<PAGE>, например RENDER_CACHE_TTL_DROPSTAB_VESTING=3600.
+
+        Args:
+            source (str): Источник данных ('dropstab', 'cryptorank').
+            page (str): Тип страницы ('vesting', 'fundraising', 'ico').
+
+        Returns:
+            int: Время жизни записи в секундах.
+        """
+        override = os.getenv(f"RENDER_CACHE_TTL_{source.upper()}_{page.upper()}")
+        if override:
+            return int(override)
+        return DEFAULT_TTLS.get((source, page), DEFAULT_TTL)
+
+    def get(self, payload: dict):
+        """
+        Возвращает запись кэша без учета TTL.
+
+        Args:
+            payload (dict): Payload запроса к прокси рендеринга.
+
+        Returns:
+            tuple | None: (body, fetched_at) или None, если записи нет.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, fetched_at FROM entries WHERE key = ?",
+                (self.make_key(payload),)
+            ).fetchone()
+        return row
+
+    def put(self, source: str, page: str, payload: dict, body: str) -> None:
+        """
+        Сохраняет ответ прокси в кэш.
+
+        Args:
+            source (str): Источник данных.
+            page (str): Тип страницы.
+            payload (dict): Payload запроса к прокси рендеринга.
+            body (str): Тело ответа прокси.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, source, page, goto, sel, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(payload), source, page, payload.get("goto", ""),
+                 payload.get("sel", ""), body, time.time())
+            )
+            conn.commit()
+
+    def get_or_fetch(self, source: str, page: str, payload: dict, fetch, cacheable=None) -> str:
+        """
+        Возвращает ответ из кэша или получает его через fetch.
+
+        Args:
+            source (str): Источник данных.
+            page (str): Тип страницы.
+            payload (dict): Payload запроса к прокси рендеринга.
+            fetch (callable): Функция без аргументов, возвращающая тело ответа.
+            cacheable (callable): Проверка, стоит ли сохранять полученный ответ.
+
+        Returns:
+            str: Тело ответа прокси.
+        """
+        if not self.enabled:
+            return fetch()
+
+        row = self.get(payload)
+        if row is not None:
+            body, fetched_at = row
+            age = time.time() - fetched_at
+            ttl = self.ttl(source, page)
+            if age <= ttl:
+                self.hits += 1
+                logger.info(f"Render cache hit: {source}/{page} ({payload.get('goto')})")
+                return body
+            if age <= ttl + self.stale_ttl:
+                self.stale_hits += 1
+                logger.info(f"Render cache stale hit, обновляем в фоне: {source}/{page} ({payload.get('goto')})")
+                self._revalidate(source, page, payload, fetch, cacheable)
+                return body
+
+        self.misses += 1
+        body = fetch()
+        if cacheable is None or cacheable(body):
+            self.put(source, page, payload, body)
+        return body
+
+    def _revalidate(self, source: str, page: str, payload: dict, fetch, cacheable) -> None:
+        """
+        Запускает фоновое обновление записи, если оно еще не выполняется.
+        """
+        key = self.make_key(payload)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                body = fetch()
+                if cacheable is None or cacheable(body):
+                    self.put(source, page, payload, body)
+            except Exception as e:
+                logger.warning(f"Не удалось обновить запись кэша {source}/{page}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=refresh, name="render-cache-refresh", daemon=True).start()
+
+    def entries(self, source: str = None, page: str = None) -> list:
+        """
+        Возвращает список записей кэша с их возрастом и статусом.
+
+        Args:
+            source (str): Фильтр по источнику.
+            page (str): Фильтр по типу страницы.
+
+        Returns:
+            list of dict: Описание записей без тела ответа.
+        """
+        query = "SELECT source, page, goto, sel, length(body), fetched_at FROM entries"
+        conditions, params = self._filters(source, page)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY fetched_at DESC"
+
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+
+        now = time.time()
+        result = []
+        for src, pg, goto, sel, size, fetched_at in rows:
+            age = now - fetched_at
+            ttl = self.ttl(src, pg)
+            if age <= ttl:
+                status = "fresh"
+            elif age <= ttl + self.stale_ttl:
+                status = "stale"
+            else:
+                status = "expired"
+            result.append({
+                "source": src,
+                "page": pg,
+                "goto": goto,
+                "sel": sel,
+                "bytes": size,
+                "age": age,
+                "status": status,
+            })
+        return result
+
+    def purge(self, source: str = None, page: str = None, expired_only: bool = False) -> int:
+        """
+        Удаляет записи кэша.
+
+        Args:
+            source (str): Фильтр по источнику.
+            page (str): Фильтр по типу страницы.
+            expired_only (bool): Удалять только записи за пределами stale-окна.
+
+        Returns:
+            int: Количество удаленных записей.
+        """
+        if expired_only:
+            keys = [
+                self.make_key(entry)
+                for entry in self.entries(source, page)
+                if entry["status"] == "expired"
+            ]
+            with self._lock:
+                conn = self._connect()
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+                conn.commit()
+            return len(keys)
+
+        query = "DELETE FROM entries"
+        conditions, params = self._filters(source, page)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute(query, params).rowcount
+            conn.commit()
+        return deleted
+
+    @staticmethod
+    def _filters(source: str, page: str) -> tuple:
+        conditions, params = [], []
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if page:
+            conditions.append("page = ?")
+            params.append(page)
+        return conditions, params
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики обращений к кэшу в текущем процессе.
+        """
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """
+    Возвращает общий для процесса кэш прокси рендеринга.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenderCache()
+        return _cache
+
+
+def main():
+    """
+    CLI для просмотра и очистки кэша прокси рендеринга.
+    """
+    parser = argparse.ArgumentParser(description="Кэш ответов прокси рендеринга")
+    parser.add_argument("--path", help="Путь к базе кэша (по умолчанию RENDER_CACHE_PATH)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="Показать записи кэша")
+    list_parser.add_argument("--source")
+    list_parser.add_argument("--page")
+
+    purge_parser = subparsers.add_parser("purge", help="Удалить записи кэша")
+    purge_parser.add_argument("--source")
+    purge_parser.add_argument("--page")
+    purge_parser.add_argument("--expired", action="store_true", help="Только просроченные записи")
+
+    args = parser.parse_args()
+    cache = RenderCache(path=args.path, enabled=True)
+
+    if args.command == "list":
+        entries = cache.entries(args.source, args.page)
+        for entry in entries:
+            print(
+                f"{entry['status']:<8} {entry['source']:<11} {entry['page']:<12} "
+                f"{entry['age'] / 3600:>8.1f} h {entry['bytes']:>9} B  {entry['goto']}"
+            )
+        print(f"Всего записей: {len(entries)}")
+    elif args.command == "purge":
+        deleted = cache.purge(args.source, args.page, expired_only=args.expired)
+        print(f"Удалено записей: {deleted}")
+
+
+if __name__ == "__main__":
+    main()
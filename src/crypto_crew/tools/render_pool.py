@@ -0,0 +1,270 @@
+# src/crypto_crew/tools/render_pool.py
+
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+import requests
+from src.crypto_crew.tools.endpoints import render_proxy_urls
+from src.crypto_crew.tools.http_client import get_session
+from src.crypto_crew.tools.resilience import ResilientCaller
+
+logger = logging.getLogger(__name__)
+
+# Одновременных запросов на один узел рендеринга (браузер обрабатывает ограниченное число вкладок)
+RENDER_ENDPOINT_CONCURRENCY = int(os.getenv("RENDER_ENDPOINT_CONCURRENCY", "4"))
+# Сколько ждать свободного узла, прежде чем вернуть ошибку (в секундах)
+RENDER_POOL_WAIT = float(os.getenv("RENDER_POOL_WAIT", "60"))
+# Узел исключается после N ошибок подряд и возвращается после проверки здоровья, но не раньше чем через
+# RENDER_EJECT_DURATION секунд
+RENDER_EJECT_FAILURES = int(os.getenv("RENDER_EJECT_FAILURES", "3"))
+RENDER_EJECT_DURATION = float(os.getenv("RENDER_EJECT_DURATION", "30"))
+# Периодическая проверка здоровья: интервал в секундах (0 - выключена) и путь запроса
+RENDER_HEALTH_INTERVAL = float(os.getenv("RENDER_HEALTH_INTERVAL", "15"))
+RENDER_HEALTH_PATH = os.getenv("RENDER_HEALTH_PATH", "/")
+RENDER_HEALTH_TIMEOUT = float(os.getenv("RENDER_HEALTH_TIMEOUT", "5"))
+
+
+class RenderPoolExhausted(requests.RequestException):
+    """
+    Все узлы пула заняты дольше RENDER_POOL_WAIT.
+    """
+
+
+class RenderEndpoint:
+    """
+    Узел рендеринга и его счетчики.
+    """
+
+    __slots__ = ("url", "outstanding", "requests", "failures", "consecutive_failures", "ejected_at",
+                 "ejections", "last_used")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_at = None
+        self.ejections = 0
+        self.last_used = 0.0
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_at is not None
+
+    def stats(self) -> dict:
+        return {
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejected": self.ejected,
+            "ejections": self.ejections,
+        }
+
+
+class RenderPool:
+    """
+    Пул узлов прокси рендеринга.
+
+    Запрос получает узел с наименьшим числом выполняющихся запросов среди узлов,
+    которые не исключены и не достигли лимита concurrency. Узел исключается после серии
+    ошибок и возвращается, когда проверка здоровья проходит (не раньше eject_duration);
+    без проверок здоровья - просто по истечении eject_duration.
+    """
+
+    def __init__(self, urls: list = None, concurrency: int = None, wait: float = None,
+                 eject_failures: int = None, eject_duration: float = None, health_interval: float = None,
+                 health_path: str = None):
+        self.endpoints = [RenderEndpoint(url) for url in (urls or render_proxy_urls())]
+        self.concurrency = max(1, concurrency or RENDER_ENDPOINT_CONCURRENCY)
+        self.wait = RENDER_POOL_WAIT if wait is None else wait
+        self.eject_failures = max(1, eject_failures or RENDER_EJECT_FAILURES)
+        self.eject_duration = RENDER_EJECT_DURATION if eject_duration is None else eject_duration
+        self.health_interval = RENDER_HEALTH_INTERVAL if health_interval is None else health_interval
+        self.health_path = health_path or RENDER_HEALTH_PATH
+        self._condition = threading.Condition()
+        self._health_thread = None
+        self._stopped = threading.Event()
+
+    def _available(self) -> list:
+        now = time.monotonic()
+        candidates = []
+        for endpoint in self.endpoints:
+            if endpoint.ejected:
+                # Без проверок здоровья узел возвращается в пул по таймеру
+                if self._health_checked() or now - endpoint.ejected_at < self.eject_duration:
+                    continue
+                self._readmit(endpoint)
+            if endpoint.outstanding < self.concurrency:
+                candidates.append(endpoint)
+        if not candidates and all(endpoint.ejected for endpoint in self.endpoints):
+            # Исключены все узлы: запрос все же отправляется (автоматы защиты узлов в resilience
+            # прекратят попытки, если прокси действительно недоступен)
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.outstanding < self.concurrency]
+        return candidates
+
+    def acquire(self, timeout: float = None) -> RenderEndpoint:
+        """
+        Занимает наименее загруженный доступный узел, ожидая освобождения при необходимости.
+
+        Args:
+            timeout (float): Максимальное ожидание в секундах (по умолчанию RENDER_POOL_WAIT).
+
+        Returns:
+            RenderEndpoint: Занятый узел (освобождается через release).
+
+        Raises:
+            RenderPoolExhausted: Если свободный узел не появился за timeout.
+        """
+        self._start_health_checks()
+        deadline = time.monotonic() + (self.wait if timeout is None else timeout)
+        with self._condition:
+            while True:
+                candidates = self._available()
+                if candidates:
+                    endpoint = min(candidates, key=lambda item: (item.outstanding, item.last_used))
+                    endpoint.outstanding += 1
+                    endpoint.requests += 1
+                    endpoint.last_used = time.monotonic()
+                    return endpoint
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RenderPoolExhausted(f"Нет свободных узлов рендеринга за {self.wait:.0f} s")
+                # Узел может вернуться по таймеру исключения, поэтому ожидание ограничено
+                self._condition.wait(min(remaining, 1.0))
+
+    def release(self, endpoint: RenderEndpoint, ok: bool = True) -> None:
+        """
+        Освобождает узел и учитывает результат запроса.
+
+        Args:
+            endpoint (RenderEndpoint): Узел, полученный из acquire.
+            ok (bool): False - ошибка соединения, таймаут или 5xx.
+        """
+        with self._condition:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                if endpoint.ejected:
+                    # Запрос на исключенный узел (все узлы были исключены) прошел успешно
+                    self._readmit(endpoint)
+            else:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.eject_failures and not endpoint.ejected:
+                    self._eject(endpoint, f"ошибок подряд: {endpoint.consecutive_failures}")
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Занимает узел на время блока.
+
+        Yields:
+            str: Адрес узла.
+        """
+        endpoint = self.acquire(timeout)
+        try:
+            yield endpoint.url
+        except Exception as e:
+            self.release(endpoint, ok=not ResilientCaller.retryable(e))
+            raise
+        else:
+            self.release(endpoint, ok=True)
+
+    def _eject(self, endpoint: RenderEndpoint, reason: str) -> None:
+        endpoint.ejected_at = time.monotonic()
+        endpoint.ejections += 1
+        logger.warning(f"Узел рендеринга {endpoint.url} исключен из пула: {reason}")
+
+    def _readmit(self, endpoint: RenderEndpoint) -> None:
+        endpoint.ejected_at = None
+        endpoint.consecutive_failures = 0
+        logger.info(f"Узел рендеринга {endpoint.url} возвращен в пул")
+
+    def check_health(self) -> dict:
+        """
+        Проверяет все узлы запросом GET RENDER_HEALTH_PATH (ответ без 5xx - узел жив).
+
+        Неответивший узел исключается; исключенный узел возвращается, если ответил
+        и с момента исключения прошло не меньше eject_duration.
+
+        Returns:
+            dict: Адрес -> результат проверки.
+        """
+        results = {}
+        for endpoint in self.endpoints:
+            try:
+                response = get_session().get(
+                    endpoint.url + self.health_path, timeout=(RENDER_HEALTH_TIMEOUT, RENDER_HEALTH_TIMEOUT)
+                )
+                healthy = response.status_code < 500
+            except requests.RequestException:
+                healthy = False
+            results[endpoint.url] = healthy
+
+            with self._condition:
+                if healthy and endpoint.ejected and time.monotonic() - endpoint.ejected_at >= self.eject_duration:
+                    self._readmit(endpoint)
+                    self._condition.notify_all()
+                elif not healthy and not endpoint.ejected:
+                    self._eject(endpoint, "проверка здоровья не пройдена")
+        return results
+
+    def _health_checked(self) -> bool:
+        # С одним узлом исключать не из чего - проверки здоровья не нужны
+        return self.health_interval > 0 and len(self.endpoints) > 1
+
+    def _start_health_checks(self) -> None:
+        if not self._health_checked() or self._health_thread is not None:
+            return
+        with self._condition:
+            if self._health_thread is not None:
+                return
+
+            def loop():
+                while not self._stopped.wait(self.health_interval):
+                    try:
+                        self.check_health()
+                    except Exception as e:
+                        logger.warning(f"Проверка здоровья узлов рендеринга не удалась: {e}")
+
+            self._health_thread = threading.Thread(target=loop, name="render-health", daemon=True)
+            self._health_thread.start()
+
+    def stop(self) -> None:
+        """
+        Останавливает периодические проверки здоровья.
+        """
+        self._stopped.set()
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики по узлам.
+        """
+        with self._condition:
+            return {endpoint.url: endpoint.stats() for endpoint in self.endpoints}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """
+    Возвращает общий для процесса пул узлов рендеринга (RENDER_PROXY_URLS).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool()
+        return _pool
+
+
+def render_pool_stats() -> dict:
+    """
+    Возвращает счетчики пула или пустой словарь, если пул еще не создавался.
+    """
+    return _pool.stats() if _pool is not None else {}
@@ -0,0 +1,89 @@
+# src/crypto_crew/tools/render_proxy.py
+
+import os
+import json
+import logging
+import requests
+from src.crypto_crew.tools.render_cache import get_render_cache
+from src.crypto_crew.tools.http_client import get_session
+from src.crypto_crew.tools.render_pool import get_render_pool
+from src.crypto_crew.tools.resilience import NeverOpenBreaker, get_caller
+from src.crypto_crew.tools.rate_limit import get_limiter
+from src.crypto_crew.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Таймаут соединения с прокси и запас к таймауту рендеринга из payload при чтении ответа (в секундах)
+RENDER_CONNECT_TIMEOUT = float(os.getenv("RENDER_CONNECT_TIMEOUT", "5"))
+RENDER_READ_MARGIN = float(os.getenv("RENDER_READ_MARGIN", "10"))
+
+
+def render_timeout(payload: dict) -> tuple:
+    """
+    Возвращает клиентские таймауты (connect, read): прокси ждет страницу payload['timeout'] мс,
+    поэтому ответ читается чуть дольше.
+    """
+    return RENDER_CONNECT_TIMEOUT, payload.get("timeout", 30000) / 1000 + RENDER_READ_MARGIN
+
+
+def _has_data(body: str) -> bool:
+    """
+    Проверяет, что прокси вернул непустой HTML (пустые ответы не кэшируются).
+    """
+    try:
+        return bool(json.loads(body).get("data"))
+    except (ValueError, AttributeError):
+        return False
+
+
+def render_page(base_url: str, payload: dict, source: str, page: str, session: requests.Session = None) -> str:
+    """
+    Отправляет запрос к прокси рендеринга с учетом кэша.
+
+    Без явного base_url запрос отправляется на наименее загруженный узел пула
+    RENDER_PROXY_URLS. Запрос выполняется через ResilientCaller: повторы с джиттером
+    при сетевых ошибках и 429/5xx (повтор может уйти на другой узел), автомат защиты
+    на каждый узел и (по RESILIENCE_HEDGE) хеджирование.
+
+    Args:
+        base_url (str): Адрес прокси рендеринга (None - пул RENDER_PROXY_URLS / RENDER_PROXY_URL).
+        payload (dict): Payload запроса (goto, sel, timeout).
+        source (str): Источник данных ('dropstab', 'cryptorank').
+        page (str): Тип страницы ('vesting', 'fundraising', 'ico').
+        session (requests.Session): Сессия для запроса (по умолчанию общая сессия с пулом).
+
+    Returns:
+        str: Тело ответа прокси (JSON с полем 'data').
+
+    Raises:
+        requests.HTTPError: Если прокси вернул ошибочный статус.
+        CircuitOpenError: Если автомат защиты прокси разомкнут.
+    """
+    def attempt(url: str) -> str:
+        limiter = get_limiter("render")
+        limiter.acquire()
+        response = (session or get_session()).post(
+            url,
+            headers={"Content-Type": "application/json"},
+            data=json.dumps(payload),
+            timeout=render_timeout(payload)
+        )
+        logger.info(f"Render proxy {source}/{page}, status: {response.status_code}")
+        limiter.feedback(response.status_code, response.headers.get("Retry-After"))
+        response.raise_for_status()
+        return response.text
+
+    def pooled_attempt() -> str:
+        with get_render_pool().lease() as url:
+            current.set(endpoint=url)
+            # Автомат защиты - у каждого узла; повторы и хеджирование - у вызова через пул
+            return get_caller(url, retries=0, hedge=False).call(lambda: attempt(url))
+
+    def fetch() -> str:
+        current.set(cached=False)
+        if base_url:
+            return get_caller(base_url).call(lambda: attempt(base_url))
+        return get_caller("render-pool", breaker=NeverOpenBreaker()).call(pooled_attempt)
+
+    with span("render", source=source, page=page, cached=True) as current:
+        return get_render_cache().get_or_fetch(source, page, payload, fetch, cacheable=_has_data)
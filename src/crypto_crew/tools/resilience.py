@@ -0,0 +1,340 @@
+# src/crypto_crew/tools/resilience.py
+
+import os
+import time
+import random
+import threading
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import requests
+from src.crypto_crew.tracing import current_span, run_in_context
+
+logger = logging.getLogger(__name__)
+
+# Повторы: число дополнительных попыток и экспоненциальная задержка с полным джиттером (в секундах)
+RESILIENCE_RETRIES = int(os.getenv("RESILIENCE_RETRIES", "2"))
+RESILIENCE_BACKOFF_BASE = float(os.getenv("RESILIENCE_BACKOFF_BASE", "0.5"))
+RESILIENCE_BACKOFF_MAX = float(os.getenv("RESILIENCE_BACKOFF_MAX", "8"))
+
+# Автомат размыкается после N ошибок подряд и пропускает пробный запрос через cooldown секунд
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+# Хеджирование: дублирующий запрос, если ответа нет дольше квантиля задержки (0 - выключено)
+HEDGE_ENABLED = os.getenv("RESILIENCE_HEDGE", "0").lower() in ("1", "true", "yes")
+HEDGE_QUANTILE = float(os.getenv("RESILIENCE_HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("RESILIENCE_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("RESILIENCE_HEDGE_MIN_DELAY", "1"))
+HEDGE_WORKERS = int(os.getenv("RESILIENCE_HEDGE_WORKERS", "16"))
+
+# Статусы, при которых запрос повторяется; остальные ошибки 4xx возвращаются сразу
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Автомат разомкнут: запрос к недоступному сервису не отправляется.
+    """
+
+
+class CircuitBreaker:
+    """
+    Автомат защиты для одного адреса: closed -> open после серии ошибок,
+    open -> half_open по истечении cooldown, half_open -> closed после успешной пробы.
+    """
+
+    def __init__(self, failure_threshold: int = None, cooldown: float = None):
+        self.failure_threshold = failure_threshold or BREAKER_FAILURE_THRESHOLD
+        self.cooldown = BREAKER_COOLDOWN if cooldown is None else cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли отправить запрос. В состоянии half_open пропускается одна проба.
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Освобождает пробу half_open, не меняя состояния: исход запроса ничего не говорит о сервисе.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """
+        Учитывает ошибку.
+
+        Returns:
+            bool: True, если автомат только что разомкнулся.
+        """
+        with self._lock:
+            self._failures += 1
+            was_open = self._opened_at is not None
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+            return self._opened_at is not None and not was_open
+
+
+class NeverOpenBreaker(CircuitBreaker):
+    """
+    Автомат, который не размыкается: для вызовов через пул узлов, где у каждого
+    узла свой автомат, а недоступные узлы исключает пул.
+    """
+
+    def record_failure(self) -> bool:
+        return False
+
+
+class LatencyTracker:
+    """
+    Скользящее окно задержек успешных запросов.
+    """
+
+    def __init__(self, size: int = 200):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 1):
+        """
+        Возвращает квантиль задержки или None, если замеров меньше min_samples.
+        """
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ResilientCaller:
+    """
+    Вызов внешнего сервиса с повторами, таймаутами, автоматом защиты и хеджированием.
+
+    Счетчики: calls, attempts, retries, failures, timeouts, rejected (автомат разомкнут),
+    breaker_opened, hedges, hedge_wins.
+    """
+
+    COUNTERS = ("calls", "attempts", "retries", "failures", "timeouts", "rejected", "breaker_opened",
+                "hedges", "hedge_wins")
+
+    def __init__(self, name: str, retries: int = None, backoff_base: float = None, backoff_max: float = None,
+                 breaker: CircuitBreaker = None, hedge: bool = None):
+        self.name = name
+        self.retries = RESILIENCE_RETRIES if retries is None else retries
+        self.backoff_base = RESILIENCE_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = RESILIENCE_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = HEDGE_ENABLED if hedge is None else hedge
+        self.latency = LatencyTracker()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _incr(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> dict:
+        """
+        Возвращает счетчики, состояние автомата и p50/p95 задержки.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["breaker"] = self.breaker.state
+        for q in (0.5, 0.95):
+            value = self.latency.quantile(q)
+            stats[f"p{int(q * 100)}_s"] = round(value, 3) if value is not None else None
+        return stats
+
+    def backoff(self, attempt: int, error: Exception = None) -> float:
+        """
+        Задержка перед повтором: случайная в [0, base * 2^attempt] с учетом Retry-After.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass
+        return delay
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        """
+        Проверяет, имеет ли смысл повторять запрос после ошибки.
+        """
+        if isinstance(error, requests.HTTPError):
+            response = getattr(error, "response", None)
+            return response is None or response.status_code in RETRYABLE_STATUSES
+        if isinstance(error, CircuitOpenError):
+            # Автомат одного узла пула разомкнут - повтор может уйти на другой узел
+            return True
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def call(self, func):
+        """
+        Выполняет func с повторами и автоматом защиты.
+
+        Args:
+            func (callable): Функция без аргументов, выполняющая один запрос.
+
+        Returns:
+            Any: Результат func.
+
+        Raises:
+            CircuitOpenError: Если автомат разомкнут.
+            Exception: Последняя ошибка func, если повторы исчерпаны или ошибка не повторяемая.
+        """
+        self._incr("calls")
+        attempts = 0
+        try:
+            for attempt in range(self.retries + 1):
+                if not self.breaker.allow():
+                    self._incr("rejected")
+                    raise CircuitOpenError(f"{self.name}: автомат разомкнут, запрос не отправлен")
+                attempts += 1
+                self._incr("attempts")
+                try:
+                    result = self._attempt(func)
+                except Exception as e:
+                    if isinstance(e, requests.Timeout):
+                        self._incr("timeouts")
+                    if not self.retryable(e):
+                        status = getattr(getattr(e, "response", None), "status_code", None)
+                        if isinstance(e, requests.HTTPError) and status is not None and 400 <= status < 500:
+                            # Ошибка клиента - сервис отвечает
+                            self.breaker.record_success()
+                        else:
+                            # Прочие ошибки (RenderPoolExhausted, ошибки разбора) не говорят
+                            # о состоянии сервиса - автомат не меняется
+                            self.breaker.release_probe()
+                        raise
+                    self._incr("failures")
+                    if self.breaker.record_failure():
+                        self._incr("breaker_opened")
+                        logger.warning(f"{self.name}: автомат разомкнут на {self.breaker.cooldown:.0f} s")
+                    if attempt == self.retries:
+                        raise
+                    delay = self.backoff(attempt, e)
+                    self._incr("retries")
+                    logger.info(f"{self.name}: {e}, повтор через {delay:.1f} s")
+                    time.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            current_span().set(attempts=attempts)
+
+    def _timed(self, func):
+        def run():
+            started = time.perf_counter()
+            result = func()
+            self.latency.add(time.perf_counter() - started)
+            return result
+        return run
+
+    def _attempt(self, func):
+        """
+        Одна попытка; при включенном хеджировании после квантиля задержки отправляется дубликат
+        и возвращается первый успешный ответ.
+        """
+        timed = self._timed(func)
+        delay = self.latency.quantile(HEDGE_QUANTILE, HEDGE_MIN_SAMPLES) if self.hedge else None
+        if delay is None:
+            return timed()
+
+        pool = _hedge_pool()
+        primary = pool.submit(run_in_context(timed))
+        done, _ = wait([primary], timeout=max(delay, HEDGE_MIN_DELAY))
+        if done:
+            return primary.result()
+
+        self._incr("hedges")
+        current_span().set(hedged=True)
+        hedge = pool.submit(run_in_context(timed))
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._incr("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+
+_callers = {}
+_callers_lock = threading.Lock()
+_pool = None
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _callers_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+        return _pool
+
+
+def get_caller(endpoint: str, **options) -> ResilientCaller:
+    """
+    Возвращает общий для процесса ResilientCaller адреса (свой автомат защиты на каждый адрес).
+
+    Args:
+        endpoint (str): Адрес сервиса.
+        **options: Параметры ResilientCaller (retries, breaker, hedge), учитываются при создании.
+
+    Returns:
+        ResilientCaller: Обертка вызовов адреса.
+    """
+    with _callers_lock:
+        caller = _callers.get(endpoint)
+        if caller is None:
+            caller = _callers[endpoint] = ResilientCaller(endpoint, **options)
+        return caller
+
+
+def resilience_stats() -> dict:
+    """
+    Возвращает счетчики всех адресов.
+    """
+    with _callers_lock:
+        callers = list(_callers.items())
+    return {endpoint: caller.stats() for endpoint, caller in callers}
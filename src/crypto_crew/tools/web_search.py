@@ -1,14 +1,21 @@
 from crewai_tools import BaseTool
 import os
-import requests
 import json
+from src.crypto_crew.tools import http_client
+from src.crypto_crew.tools.endpoints import serper_url
+from src.crypto_crew.tools.compaction import compact_output, count_tokens, dedupe, select_fields
+from src.crypto_crew.tracing import traced
 from dotenv import load_dotenv
 load_dotenv()
 
+# Поля результата Serper, которые передаются агенту
+SEARCH_FIELDS = ("title", "link", "date", "snippet")
+
 class WebSearchTool(BaseTool):
     name: str = 'search technology'
     description: str = 'Search for information on the internet about the technology used by the project'
 
+    @traced("tool.search_technology")
     def _run(self, name: str) -> str:
         """
         Search for information on the internet about the technology used by the project
@@ -35,7 +42,7 @@ class WebSearchTool(BaseTool):
 
         print('Parsed token name:', name)
 
-        url = "https://google.serper.dev/search"
+        url = serper_url()
 
         # Correctly format the query string
         payload = json.dumps({
@@ -49,10 +56,26 @@ class WebSearchTool(BaseTool):
             'Content-Type': 'application/json'
         }
 
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = http_client.request("POST", url, upstream="serper", headers=headers, data=payload)
 
         response_data = response.json()
 
         tech_data = response_data.get('organic', [])
 
-        return json.dumps(tech_data, indent=2)
+        # В промпт попадают только заголовок, ссылка, дата и сниппет без почти одинаковых результатов
+        results = dedupe(
+            select_fields(tech_data, SEARCH_FIELDS),
+            key=lambda item: f"{item.get('title', '')} {item.get('snippet', '')}"
+        )
+        lines = []
+        for idx, item in enumerate(results, 1):
+            title = item.get('title', '')
+            if item.get('date'):
+                title += f" ({item['date']})"
+            lines.append(f"{idx}. {title}\n{item.get('link', '')}\n{item.get('snippet', '')}")
+
+        return compact_output(
+            self.name,
+            "\n".join(lines),
+            original_tokens=count_tokens(json.dumps(tech_data, indent=2))
+        )
@@ -0,0 +1,73 @@
+# src/crypto_crew/tools/website_search.py
+
+from crewai_tools import BaseTool
+import os
+from urllib.parse import urlparse
+from src.crypto_crew.tools import http_client
+from src.crypto_crew.tools.compaction import compact_output
+from src.crypto_crew.tools.embedding_store import chunk_text, get_embedding_store
+from src.crypto_crew.tools.html_parser import make_soup
+from src.crypto_crew.tracing import traced
+from src.crypto_crew.usage import current_usage
+
+# Сколько фрагментов страницы передается агенту
+WEBSITE_SEARCH_TOP_K = int(os.getenv("WEBSITE_SEARCH_TOP_K", "5"))
+
+# Элементы, текст которых не индексируется
+SKIPPED_TAGS = ("script", "style", "noscript", "svg", "nav", "footer")
+
+
+def page_text(url: str) -> str:
+    """
+    Скачивает страницу и возвращает ее текст без скриптов, стилей и навигации.
+    """
+    response = http_client.get(url, timeout=30)
+    response.raise_for_status()
+    soup = make_soup(response.text)
+    for element in soup(SKIPPED_TAGS):
+        element.decompose()
+    return soup.get_text("\n")
+
+
+def collection_token(website: str) -> str:
+    """
+    Возвращает токен текущей задачи (usage_scope), вне задачи - домен сайта.
+    """
+    usage = current_usage()
+    if usage is not None and usage.token:
+        return usage.token
+    return urlparse(website).netloc or "shared"
+
+
+class WebsiteSearchTool(BaseTool):
+    name: str = 'Search in a specific website'
+    description: str = (
+        'Semantic search of a query in the content of a specific website. '
+        'Arguments: search_query - what to look for, website - the page URL'
+    )
+
+    @traced("tool.website_search")
+    def _run(self, search_query: str, website: str) -> str:
+        """
+        Ищет фрагменты страницы, ближайшие к запросу.
+
+        Страница индексируется в коллекцию токена один раз за EMBEDDING_TTL,
+        эмбеддинги уже встречавшихся фрагментов берутся из кэша.
+
+        Args:
+            search_query (str): Поисковый запрос.
+            website (str): Адрес страницы.
+
+        Returns:
+            str: Наиболее релевантные фрагменты страницы.
+        """
+        store = get_embedding_store()
+        token = collection_token(website)
+        if not store.is_fresh(token, website):
+            store.index(token, website, chunk_text(page_text(website)))
+
+        results = store.search(token, search_query, k=WEBSITE_SEARCH_TOP_K, url=website)
+        if not results:
+            return compact_output(self.name, f"Nothing relevant found on {website}")
+        lines = [f"{idx}. {item['text']}" for idx, item in enumerate(results, 1)]
+        return compact_output(self.name, f"Relevant content from {website}:\n\n" + "\n\n".join(lines))
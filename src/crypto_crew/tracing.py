@@ -0,0 +1,430 @@
+### src/crypto_crew/tracing.py
+
+import os
+import sys
+import json
+import time
+import uuid
+import inspect
+import argparse
+import threading
+import functools
+import contextvars
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Файл трассировки JSON-lines: путь или "1" для ./tmp/trace.jsonl (пусто - трассировка выключена)
+DEFAULT_TRACE_PATH = "./tmp/trace.jsonl"
+
+# Дублировать спаны в OpenTelemetry (нужен пакет opentelemetry-api, экспорт - opentelemetry-sdk и OTLP)
+TRACE_OTEL = os.getenv("CRYPTO_CREW_TRACE_OTEL", "").lower() in ("1", "true", "yes")
+
+# Атрибуты, которые суммируются в сводке (колонки KiB и tokens)
+BYTES_ATTRIBUTES = ("response_bytes", "html_bytes", "output_bytes")
+TOKEN_ATTRIBUTES = ("prompt_tokens", "completion_tokens", "output_tokens")
+
+_current = contextvars.ContextVar("crypto_crew_span", default=None)
+
+
+class _NoopSpan:
+    """
+    Спан выключенной трассировки: ничего не записывает.
+    """
+
+    __slots__ = ()
+    recording = False
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """
+    Интервал выполнения с атрибутами (байты, статус, токены и т.п.).
+
+    Родитель берется из контекста (contextvars), поэтому вложенные спаны
+    связываются автоматически, в том числе в asyncio-задачах и в потоках,
+    запущенных через run_in_context.
+    """
+
+    __slots__ = ("tracer", "name", "parent", "trace_id", "span_id", "start_ns", "end_ns",
+                 "attributes", "error", "_token", "_otel")
+    recording = True
+
+    def __init__(self, tracer, name: str, attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.error = None
+        parent = _current.get()
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self._otel = None
+        self._token = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        if self.tracer.otel is not None:
+            self._otel = self.tracer.otel.start(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.finish(self)
+        return False
+
+    @property
+    def parent_id(self):
+        return self.parent.span_id if self.parent is not None else None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _OtelBridge:
+    """
+    Передает спаны в OpenTelemetry с теми же именами, атрибутами и вложенностью.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace
+
+        if type(trace.get_tracer_provider()).__name__ == "ProxyTracerProvider":
+            self._configure_sdk(trace)
+        self._trace = trace
+        self._tracer = trace.get_tracer("crypto_crew")
+
+    @staticmethod
+    def _configure_sdk(trace) -> None:
+        """
+        Настраивает экспорт OTLP, если провайдер не настроен приложением.
+        """
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("opentelemetry-sdk или OTLP-экспортер не установлены, спаны OpenTelemetry не экспортируются")
+            return
+        provider = TracerProvider(resource=Resource.create({"service.name": "crypto_crew"}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(provider)
+
+    def start(self, span: Span):
+        context = None
+        if span.parent is not None and span.parent._otel is not None:
+            context = self._trace.set_span_in_context(span.parent._otel)
+        return self._tracer.start_span(span.name, context=context)
+
+    def end(self, span: Span) -> None:
+        otel = span._otel
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel.set_attribute(key, value)
+        if span.error:
+            otel.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel.end()
+
+
+class Tracer:
+    """
+    Записывает завершенные спаны в JSON-lines и накапливает сводку по именам.
+    """
+
+    def __init__(self, path: str = None, otel: bool = False):
+        self.path = os.path.abspath(path) if path else None
+        self._lock = threading.Lock()
+        self._file = None
+        self._durations = {}
+        self._errors = {}
+        self._totals = {}
+        self.otel = None
+        if otel:
+            try:
+                self.otel = _OtelBridge()
+            except ImportError:
+                logger.warning("opentelemetry-api не установлен, спаны пишутся только в JSON-lines")
+
+    def finish(self, span: Span) -> None:
+        if self.otel is not None and span._otel is not None:
+            self.otel.end(span)
+
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" if self.path else None
+        with self._lock:
+            self._durations.setdefault(span.name, []).append(span.duration_ms)
+            if span.error:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+            _add_totals(self._totals.setdefault(span.name, {"bytes": 0, "tokens": 0}), span.attributes)
+            if line is not None:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._file.write(line)
+
+    def summary(self) -> list:
+        with self._lock:
+            return _summarize(self._durations, self._errors, self._totals)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _add_totals(totals: dict, attributes: dict) -> None:
+    for key in BYTES_ATTRIBUTES:
+        totals["bytes"] += attributes.get(key) or 0
+    for key in TOKEN_ATTRIBUTES:
+        totals["tokens"] += attributes.get(key) or 0
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _summarize(durations: dict, errors: dict, totals: dict) -> list:
+    rows = []
+    for name, values in durations.items():
+        rows.append({
+            "name": name,
+            "count": len(values),
+            "total_s": sum(values) / 1000,
+            "mean_ms": sum(values) / len(values),
+            "p95_ms": _percentile(values, 0.95),
+            "max_ms": max(values),
+            "errors": errors.get(name, 0),
+            "bytes": totals.get(name, {}).get("bytes", 0),
+            "tokens": totals.get(name, {}).get("tokens", 0),
+        })
+    return sorted(rows, key=lambda row: -row["total_s"])
+
+
+def _trace_path_from_env():
+    value = os.getenv("CRYPTO_CREW_TRACE", "")
+    if value.lower() in ("", "0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return DEFAULT_TRACE_PATH
+    return value
+
+
+_tracer = None
+_trace_path = _trace_path_from_env()
+if _trace_path or TRACE_OTEL:
+    _tracer = Tracer(_trace_path, otel=TRACE_OTEL)
+
+
+def configure(path: str = None, otel: bool = False):
+    """
+    Включает трассировку в текущем процессе.
+
+    Args:
+        path (str): Файл JSON-lines (None - только сводка в памяти).
+        otel (bool): Дублировать спаны в OpenTelemetry.
+
+    Returns:
+        Tracer: Активный трассировщик.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path, otel=otel)
+    return _tracer
+
+
+def disable() -> None:
+    """
+    Выключает трассировку.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes):
+    """
+    Открывает спан; при выключенной трассировке возвращает общий пустой спан.
+
+    Args:
+        name (str): Имя спана, например 'tool.get_vesting_tool' или 'http'.
+        **attributes: Начальные атрибуты.
+
+    Returns:
+        Span | _NoopSpan: Контекстный менеджер спана.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, attributes)
+
+
+def current_span():
+    """
+    Возвращает текущий спан (пустой спан, если трассировка выключена или спана нет).
+    """
+    if _tracer is None:
+        return _NOOP
+    return _current.get() or _NOOP
+
+
+def traced(name: str):
+    """
+    Декоратор: выполняет функцию (синхронную или асинхронную) внутри спана.
+
+    Args:
+        name (str): Имя спана.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with span(name) as current:
+                result = func(*args, **kwargs)
+                if isinstance(result, str):
+                    current.set(output_bytes=len(result.encode("utf-8")))
+                return result
+        return wrapper
+    return decorator
+
+
+def run_in_context(func):
+    """
+    Оборачивает функцию так, чтобы в другом потоке она выполнялась в текущем контексте
+    (спаны потока становятся дочерними для текущего спана).
+
+    Args:
+        func (callable): Функция.
+
+    Returns:
+        callable: Функция, выполняющаяся в копии текущего контекста.
+    """
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+def summary() -> list:
+    """
+    Возвращает сводку по спанам текущего процесса.
+
+    Returns:
+        list of dict: name, count, total_s, mean_ms, p95_ms, max_ms, errors, bytes, tokens.
+    """
+    return _tracer.summary() if _tracer is not None else []
+
+
+def print_summary(rows: list = None) -> None:
+    """
+    Печатает сводку по спанам (ничего не печатает, если трассировка выключена).
+    """
+    rows = summary() if rows is None else rows
+    if not rows:
+        return
+    print("\n", "="*25, "Trace summary", "="*25, "\n")
+    print(f"{'Span':<36} {'count':>6} {'total, s':>9} {'mean, ms':>9} {'p95, ms':>9} {'max, ms':>9} "
+          f"{'errors':>6} {'KiB':>9} {'tokens':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:<36} {row['count']:>6} {row['total_s']:>9.2f} {row['mean_ms']:>9.1f} "
+            f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f} {row['errors']:>6} "
+            f"{row['bytes'] / 1024:>9.1f} {row['tokens']:>8}"
+        )
+    if _tracer is not None and _tracer.path:
+        print("Trace:", _tracer.path)
+
+
+def summarize_file(path: str, trace_id: str = None) -> list:
+    """
+    Строит сводку по файлу трассировки JSON-lines.
+
+    Args:
+        path (str): Путь к файлу.
+        trace_id (str): Учитывать только спаны одной трассы.
+
+    Returns:
+        list of dict: Сводка в формате summary().
+    """
+    durations, errors, totals = {}, {}, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if trace_id and record["trace_id"] != trace_id:
+                continue
+            name = record["name"]
+            durations.setdefault(name, []).append(record["duration_ms"])
+            if record["status"]["code"] == "ERROR":
+                errors[name] = errors.get(name, 0) + 1
+            _add_totals(totals.setdefault(name, {"bytes": 0, "tokens": 0}), record["attributes"])
+    return _summarize(durations, errors, totals)
+
+
+def main():
+    """
+    CLI: сводка по файлу трассировки.
+    """
+    parser = argparse.ArgumentParser(description="Сводка по файлу трассировки JSON-lines")
+    parser.add_argument("path", nargs="?", default=_trace_path or DEFAULT_TRACE_PATH)
+    parser.add_argument("--trace-id", help="Только спаны одной трассы (одного запуска)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Файл трассировки не найден: {args.path}")
+        sys.exit(1)
+    print_summary(summarize_file(args.path, args.trace_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+### src/crypto_crew/usage.py
+
+import os
+import re
+import threading
+import contextvars
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+import yaml
+from src.crypto_crew.tools.compaction import count_tokens, fit_to_budget
+
+logger = logging.getLogger(__name__)
+
+# Цены моделей и бюджеты агентов (по умолчанию config/budgets.yaml пакета)
+BUDGETS_PATH = os.getenv(
+    "CRYPTO_CREW_BUDGETS",
+    os.path.join(os.path.dirname(__file__), "config", "budgets.yaml")
+)
+
+# До скольких токенов сокращается старый шаг агента при превышении max_prompt_tokens
+TRIMMED_STEP_TOKENS = 200
+
+# Сообщение, после которого агент должен завершить задачу
+FORCE_FINAL_ANSWER = (
+    "The token budget for this task is exhausted. Do not use any more tools. "
+    "Give your best Final Answer now, based only on the information above."
+)
+
+# Final Answer задачи, остановленной из-за бюджета
+BUDGET_EXHAUSTED_ANSWER = (
+    "The analysis was stopped because the token budget for this task ran out before the report was finished."
+)
+
+_ACTION = re.compile(r"Action\s*\d*\s*:")
+_FINAL_ANSWER = re.compile(r"Final Answer\s*:")
+
+_scope = contextvars.ContextVar("crypto_crew_usage", default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    """
+    Ограничения агента; None - без ограничения.
+    """
+
+    max_prompt_tokens: int = None
+    max_task_tokens: int = None
+    max_calls: int = None
+
+
+@lru_cache(maxsize=1)
+def _load_budgets() -> dict:
+    try:
+        with open(BUDGETS_PATH, encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        logger.warning(f"Файл бюджетов не найден: {BUDGETS_PATH}, ограничения не применяются")
+        return {}
+
+
+def agent_budget(agent: str) -> Budget:
+    """
+    Возвращает бюджет агента: значения по умолчанию, переопределенные настройками агента.
+
+    Args:
+        agent (str): Имя агента из agents.yaml.
+
+    Returns:
+        Budget: Ограничения агента.
+    """
+    config = _load_budgets()
+    values = dict(config.get("defaults") or {})
+    values.update((config.get("agents") or {}).get(agent) or {})
+    return Budget(**{field: values.get(field) for field in Budget.__dataclass_fields__})
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int):
+    """
+    Оценивает стоимость вызова по таблице цен.
+
+    Args:
+        model (str): Имя модели (например, 'gpt-4o-mini' или 'openai/gpt-4o-mini').
+        prompt_tokens (int): Токены запроса.
+        completion_tokens (int): Токены ответа.
+
+    Returns:
+        float | None: Стоимость в USD или None, если цены модели нет в таблице.
+    """
+    name = (model or "").split("/")[-1]
+    prices = _load_budgets().get("prices") or {}
+    matches = [key for key in prices if name.startswith(key)]
+    if not matches:
+        return None
+    price = prices[max(matches, key=len)]
+    return (prompt_tokens * price["input"] + completion_tokens * price["output"]) / 1_000_000
+
+
+class TaskUsage:
+    """
+    Расход одной задачи: вызовы и токены, по которым проверяется бюджет.
+    """
+
+    def __init__(self, token: str = None, task: str = None):
+        self.token = token
+        self.task = task
+        self.calls = 0
+        self.tokens = 0
+        self.forced = False
+
+    def exhausted(self, budget: Budget) -> bool:
+        """
+        Проверяет, исчерпан ли бюджет задачи.
+        """
+        return bool(
+            (budget.max_calls and self.calls >= budget.max_calls)
+            or (budget.max_task_tokens and self.tokens >= budget.max_task_tokens)
+        )
+
+
+@contextmanager
+def usage_scope(token: str = None, task: str = None):
+    """
+    Учитывает вызовы LLM внутри блока как расход задачи токена.
+
+    Args:
+        token (str): Символ токена.
+        task (str): Имя задачи в tasks.yaml.
+
+    Yields:
+        TaskUsage: Расход задачи.
+    """
+    usage = TaskUsage(token, task)
+    reset = _scope.set(usage)
+    try:
+        yield usage
+    finally:
+        _scope.reset(reset)
+
+
+def current_usage():
+    """
+    Возвращает расход текущей задачи или None вне usage_scope.
+    """
+    return _scope.get()
+
+
+def trim_messages(messages: list, max_prompt_tokens: int) -> tuple:
+    """
+    Сокращает старые шаги агента, чтобы запрос уложился в бюджет.
+
+    Системный промпт и описание задачи (первые два сообщения) не меняются;
+    промежуточные шаги, начиная со старых, сокращаются до TRIMMED_STEP_TOKENS,
+    последний шаг - только если этого не хватило.
+
+    Args:
+        messages (list): Сообщения запроса.
+        max_prompt_tokens (int): Бюджет запроса в токенах (None - без ограничения).
+
+    Returns:
+        tuple: (сообщения, число сокращенных сообщений).
+    """
+    sizes = [count_tokens(str(message.get("content") or "")) for message in messages]
+    total = sum(sizes)
+    if not max_prompt_tokens or total <= max_prompt_tokens or len(messages) <= 2:
+        return messages, 0
+
+    result = [dict(message) for message in messages]
+    trimmed = 0
+    last = len(result) - 1
+    for index in list(range(2, last)) + [last]:
+        if total <= max_prompt_tokens:
+            break
+        if index == last:
+            limit = max(TRIMMED_STEP_TOKENS, max_prompt_tokens - (total - sizes[index]))
+        else:
+            limit = TRIMMED_STEP_TOKENS
+        if sizes[index] <= limit:
+            continue
+        result[index]["content"] = fit_to_budget(str(result[index]["content"]), limit)
+        size = count_tokens(result[index]["content"])
+        total -= sizes[index] - size
+        sizes[index] = size
+        trimmed += 1
+    return result, trimmed
+
+
+def budget_final_answer(messages: list) -> str:
+    """
+    Ответ вместо вызова LLM, если агент продолжил работу после требования завершить задачу.
+
+    Последнее сообщение агента в этот момент - шаг с инструментом; его Action и
+    Observation отбрасываются (парсер crewai не принимает ответ, в котором есть и
+    Final Answer, и Action), в ответ попадают только рассуждения агента.
+
+    Args:
+        messages (list): Сообщения запроса.
+
+    Returns:
+        str: Final Answer с сообщением об исчерпании бюджета.
+    """
+    last = next(
+        (str(message.get("content") or "") for message in reversed(messages) if message.get("role") == "assistant"),
+        ""
+    )
+    thought = _ACTION.split(last, maxsplit=1)[0]
+    thought = _FINAL_ANSWER.sub("", thought.replace("Thought:", "")).strip()
+    answer = BUDGET_EXHAUSTED_ANSWER
+    if thought:
+        answer += f"\n\nLast reasoning step of the agent:\n{thought}"
+    return f"Thought: The budget for this task is exhausted.\nFinal Answer: {answer}"
+
+
+class UsageLedger:
+    """
+    Журнал расхода LLM по токенам, агентам и задачам.
+    """
+
+    FIELDS = ("calls", "cached_calls", "prompt_tokens", "completion_tokens", "latency_s", "cost_usd",
+              "trimmed_messages", "forced_answers")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def record(self, token: str, agent: str, task: str, model: str, prompt_tokens: int, completion_tokens: int,
+               latency: float, cached: bool = False, trimmed: int = 0, forced: bool = False) -> None:
+        """
+        Добавляет вызов LLM в журнал.
+        """
+        cost = 0.0 if cached else estimate_cost(model, prompt_tokens, completion_tokens)
+        key = (token or "", agent or "", task or "")
+        with self._lock:
+            row = self._rows.setdefault(key, dict.fromkeys(self.FIELDS, 0))
+            row["calls"] += 1
+            row["cached_calls"] += int(cached)
+            row["prompt_tokens"] += prompt_tokens
+            row["completion_tokens"] += completion_tokens
+            row["latency_s"] += latency
+            row["cost_usd"] += cost or 0.0
+            row["trimmed_messages"] += trimmed
+            row["forced_answers"] += int(forced)
+
+    def rows(self, token: str = None) -> list:
+        """
+        Возвращает расход по агентам и задачам.
+
+        Args:
+            token (str): Фильтр по токену.
+
+        Returns:
+            list of dict: token, agent, task и счетчики FIELDS.
+        """
+        with self._lock:
+            return [
+                {"token": key[0], "agent": key[1], "task": key[2], **row}
+                for key, row in self._rows.items()
+                if token is None or key[0] == token
+            ]
+
+
+_ledger = UsageLedger()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """
+    Возвращает общий для процесса журнал расхода.
+    """
+    return _ledger
+
+
+def aggregate(rows: list, by: str = "agent") -> dict:
+    """
+    Суммирует строки журнала по полю.
+
+    Args:
+        rows (list): Строки UsageLedger.rows (или из результатов пакетного запуска).
+        by (str): Поле группировки: 'agent', 'task' или 'token'.
+
+    Returns:
+        dict: Значение поля -> суммы счетчиков.
+    """
+    result = {}
+    for row in rows:
+        totals = result.setdefault(row[by], dict.fromkeys(UsageLedger.FIELDS, 0))
+        for field in UsageLedger.FIELDS:
+            totals[field] += row[field]
+    return result
+
+
+def format_usage(rows: list, by: str = "agent") -> str:
+    """
+    Формирует таблицу расхода LLM.
+
+    Args:
+        rows (list): Строки журнала.
+        by (str): Поле группировки.
+
+    Returns:
+        str: Текстовая таблица (пустая строка, если вызовов не было).
+    """
+    groups = aggregate(rows, by)
+    if not groups:
+        return ""
+    lines = [f"{by.capitalize():<32} {'calls':>6} {'cached':>6} {'prompt':>9} {'compl.':>8} "
+             f"{'LLM, s':>8} {'cost, $':>9} {'trimmed':>7} {'forced':>6}"]
+    total = dict.fromkeys(UsageLedger.FIELDS, 0)
+    for name, row in sorted(groups.items()):
+        for field in UsageLedger.FIELDS:
+            total[field] += row[field]
+        lines.append(_usage_line(name, row))
+    if len(groups) > 1:
+        lines.append(_usage_line("total", total))
+    return "\n".join(lines)
+
+
+def _usage_line(name: str, row: dict) -> str:
+    return (
+        f"{name:<32} {row['calls']:>6} {row['cached_calls']:>6} {row['prompt_tokens']:>9} "
+        f"{row['completion_tokens']:>8} {row['latency_s']:>8.1f} {row['cost_usd']:>9.4f} "
+        f"{row['trimmed_messages']:>7} {row['forced_answers']:>6}"
+    )
@@ -1,47 +1,101 @@
 ### src/crypto_crew/workflow.py
 
 import asyncio
-import pandas as pd
-from crewai.flow.flow import Flow, listen, router, start, or_
-from src.crypto_crew.crew import CryptocrewCrew
-from src.crypto_crew.tools.get_metadata import GetCoinMetadata
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from crewai.flow.flow import Flow, listen, router, start, or_, and_
+from src.crypto_crew.tools.get_metadata import CoinMetadata, GetCoinMetadata
+from src.crypto_crew.tools.compaction import compaction_stats
+from src.crypto_crew.incremental import INCREMENTAL, find_unchanged, task_fingerprint
+from src.crypto_crew.report_store import get_report_store, new_run_id
+from src.crypto_crew.tracing import print_summary, run_in_context, span
+from src.crypto_crew.usage import format_usage, get_usage_ledger, usage_scope
 from pydantic import BaseModel
 from datetime import datetime
-from crewai import Crew, Agent, Process
-from io import StringIO
-from langchain_openai import ChatOpenAI
-
-llm=ChatOpenAI(model_name="gpt-4o-mini")
 
 # Define the current date
 current_date = datetime.now().strftime("%Y-%m-%d")
 
+# Максимальное число веток анализа, выполняемых одновременно (1 - последовательный режим)
+ANALYSIS_CONCURRENCY = int(os.getenv("CRYPTO_CREW_ANALYSIS_CONCURRENCY", "4"))
+
 # Define the state model
 class UserState(BaseModel):
     name: str
     token: str
     date: str = current_date
+    run_id: str = ""
     metadata: dict
+    branch_timings: dict = {}
+    branch_errors: dict = {}
+    analysis_results: dict = {}
+    prefetched: dict = {}
+    skipped_tasks: list = []
 
 # Define the WorkFlow class
 class WorkFlow(Flow):
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = None, token: str = None, metadata: dict = None,
+                 incremental: bool = None, batch: bool = None):
         super().__init__()
-        self._state = UserState(name="", token="", metadata={})
-        self.fa_crew = CryptocrewCrew()
+        self._state = UserState(name="", token="", metadata={}, run_id=new_run_id())
+        # Экипаж (crewai_tools, инструменты с bs4) создается при запуске первой задачи
+        self._fa_crew = None
+        self._fa_crew_lock = threading.Lock()
+        self.max_concurrency = max(1, max_concurrency or ANALYSIS_CONCURRENCY)
+        self._executor = None
+        # Если символ передан заранее (пакетный режим), ввод от пользователя не запрашивается
+        self.preset_token = token
+        # Метаданные, заранее полученные пакетным запросом к CoinMarketCap
+        self.preset_metadata = metadata
+        # Инкрементальный режим: задачи с неизменными входными данными не перезапускаются
+        self.incremental = INCREMENTAL if incremental is None else incremental
+        # Пакетный режим: политика хранения и сводка трассировки применяются после всех токенов
+        self.batch = token is not None if batch is None else batch
+        self.report_store = get_report_store()
 
     @property
     def state(self):
         return self._state
 
+    # Обычные методы, а не свойства: Flow.__init__ читает getattr(self, name) для всех
+    # имен из dir(self) до того, как созданы _state и _fa_crew_lock
+    def _crew(self):
+        """
+        Возвращает экипаж, создавая его при первом обращении.
+        """
+        with self._fa_crew_lock:
+            if self._fa_crew is None:
+                from src.crypto_crew.crew import CryptocrewCrew
+                self._fa_crew = CryptocrewCrew()
+            return self._fa_crew
+
+    def _coin(self) -> CoinMetadata:
+        """
+        Метаданные токена с типизированным доступом к полям.
+        """
+        return CoinMetadata.from_dict(self.state.metadata)
+
     @start()
     def token_input(self):
         """
         Стартовая функция, ожидающая ввод от пользователя.
+        Если символ передан в конструктор (run_batch, flow_cli), ввод не запрашивается.
         """
-        # Get cryptocurrency symbol from input
-        coin_symbol = input("Введите символ или название криптовалюты (например, BTC, ETH, TON): ")
+        if not self.batch:
+            # Новый запуск - кэш ссылок Dropstab/Cryptorank и его счетчики начинаются с нуля;
+            # в пакетном режиме кэш общий для всех токенов, а счетчики печатает run_batch
+            from src.crypto_crew.tools.get_tokenomic_links import reset_link_resolver
+            reset_link_resolver()
+
+        if self.preset_token:
+            coin_symbol = self.preset_token
+        else:
+            # Get cryptocurrency symbol from input
+            coin_symbol = input("Введите символ или название криптовалюты (например, BTC, ETH, TON): ")
         self._state.token = coin_symbol  # Сохраняем символ токена в состоянии
         return coin_symbol
 
@@ -52,37 +106,240 @@ class WorkFlow(Flow):
         Вызывается как из стартовой функции, так и из обработки повторной попытки.
         """
         print("\n", "="*20, "Fetching metadata", "="*20, "\n")
-        metadata = GetCoinMetadata.save_dataset.invoke(coin_symbol)
-        # print(metadata)
-
-        # Check if metadata is a dictionary
-        if isinstance(metadata, dict) and metadata:
-            # Update the state
-            self._state.token = coin_symbol
-            self._state.name = metadata.get('name', "")
-            self._state.metadata = metadata
-            return metadata
-        else:
-            print("Ошибка: Полученные метаданные не являются словарем или пусты.")
-            return "Empty DataFrame"
+        started = time.perf_counter()
+        with span("flow.fetch_coin_metadata", token=coin_symbol) as current:
+            if self.preset_metadata is not None and coin_symbol == self.preset_token:
+                metadata = self.preset_metadata
+                current.set(preset=True)
+            else:
+                metadata = GetCoinMetadata.save_dataset(coin_symbol)
+        self._state.branch_timings["fetch_coin_metadata"] = time.perf_counter() - started
+
+        if not metadata:
+            print("Ошибка: метаданные токена не найдены.")
+            self._state.metadata = {}
+            return None
+
+        self._state.token = coin_symbol
+        self._state.metadata = metadata
+        self._state.name = self._coin().name
+        return metadata
 
     @router(fetch_coin_metadata)
     def check_status(self):
         # Проверяем наличие данных в метаданных
-        if self.state.metadata and "Empty DataFrame" not in self.state.metadata:
+        if self.state.metadata:
             return "proceed_to_analysis"  # Переход к анализу метаданных
         else:
             return "retry_get_metadata"  # Запрос на повторный ввод символа
 
     @listen("retry_get_metadata")
     def handle_retry(self):
+        if self.preset_token:
+            # В пакетном режиме повторный ввод невозможен - завершаем поток для этого токена
+            raise ValueError(f"Метаданные для токена {self.preset_token} не найдены")
+
         print("Данные не найдены. Пожалуйста, скорректируйте название токена.")
         # Используем сохраненный символ токена для повторной попытки
         coin_symbol = input("Введите символ или название криптовалюты (например, BTC, ETH, TON): ")
-        return
+        return coin_symbol
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Возвращает пул потоков для веток анализа, создавая его при первом обращении.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="analysis",
+            )
+        return self._executor
+
+    async def _run_branch(self, name: str, func):
+        """
+        Выполняет блокирующую ветку анализа в пуле потоков.
+
+        Ошибка одной ветки сохраняется в состоянии и не прерывает остальные.
+
+        Args:
+            name (str): Имя ветки (используется в отчете о времени выполнения).
+            func (callable): Блокирующая функция ветки.
+
+        Returns:
+            Any: Результат функции или None, если ветка завершилась с ошибкой.
+        """
+        def timed():
+            started = time.perf_counter()
+            try:
+                with span(f"flow.{name}"):
+                    return func()
+            finally:
+                self._state.branch_timings[name] = time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), run_in_context(timed))
+            self._state.analysis_results[name] = str(result)
+            return result
+        except Exception as e:
+            print(f"Ошибка в ветке {name}: {e}")
+            self._state.branch_errors[name] = str(e)
+            return None
 
     @listen("proceed_to_analysis")
-    def metadata_analysis(self):
+    async def prefetch_data(self):
+        """
+        Собирает ссылки, вестинг, финансирование, результаты поиска и фрагменты сайта
+        и whitepaper до запуска агентов.
+        Агенты получают готовые данные во входных параметрах задач вместо вызова инструментов.
+        """
+        print("\n", "="*22, "Prefetching data", "="*22, "\n")
+
+        from src.crypto_crew.prefetch import NOT_PREFETCHED, prefetch
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                with span("flow.prefetch_data"):
+                    return prefetch(
+                        self.state.name, token=self.state.token,
+                        documents=[self._coin().website, self._coin().technical_doc],
+                    )
+            finally:
+                self._state.branch_timings["prefetch_data"] = time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            self._state.prefetched = await loop.run_in_executor(self._get_executor(), run_in_context(timed))
+        except Exception as e:
+            # Как и в ветках анализа: ошибка сохраняется, а зависимые ветки запускаются
+            # с подсказками NOT_PREFETCHED и собирают данные инструментами сами
+            print(f"Ошибка в ветке prefetch_data: {e}")
+            self._state.branch_errors["prefetch_data"] = str(e)
+            self._state.prefetched = dict(NOT_PREFETCHED)
+        return self._state.prefetched
+
+    @listen("proceed_to_analysis")
+    async def metadata_analysis(self):
+        return await self._run_branch("metadata_analysis", self._metadata_analysis)
+
+    @listen(prefetch_data)
+    async def technology_analysis(self):
+        return await self._run_branch("technology_analysis", self._technology_analysis)
+
+    @listen(prefetch_data)
+    async def tokenomics_analysis(self):
+        return await self._run_branch("tokenomics_analysis", self._tokenomics_analysis)
+
+    @listen(prefetch_data)
+    async def fundraising_analysis(self):
+        return await self._run_branch("fundraising_analysis", self._fundraising_analysis)
+
+    @listen(and_(metadata_analysis, technology_analysis, tokenomics_analysis, fundraising_analysis))
+    def report_timings(self):
+        """
+        Печатает время выполнения каждой ветки анализа и освобождает пул потоков.
+        """
+        from src.crypto_crew.tools.get_tokenomic_links import get_link_resolver
+        from src.crypto_crew.tools.resilience import resilience_stats
+        from src.crypto_crew.tools.render_pool import render_pool_stats
+        from src.crypto_crew.tools.rate_limit import rate_limit_stats
+        from src.crypto_crew.tools.embedding_store import embedding_stats
+        from src.crypto_crew.llm_cache import get_llm_cache
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        print("\n", "="*23, "Branch timings", "="*23, "\n")
+        for name, elapsed in sorted(self._state.branch_timings.items(), key=lambda item: -item[1]):
+            status = "error" if name in self._state.branch_errors else "ok"
+            print(f"{name:<25} {elapsed:>8.1f} s  {status}")
+        if not self.batch:
+            print("Tokenomic links cache:", get_link_resolver().stats())
+        print("LLM response cache:", get_llm_cache().stats())
+        if embedding_stats():
+            print("Embedding cache:", embedding_stats())
+        for endpoint, stats in resilience_stats().items():
+            print(f"Resilience {endpoint}:", stats)
+        for endpoint, stats in render_pool_stats().items():
+            print(f"Render node {endpoint}:", stats)
+        for upstream, stats in rate_limit_stats().items():
+            print(f"Rate limit {upstream}:", stats)
+        if self._state.skipped_tasks:
+            print("Skipped unchanged tasks:", ", ".join(self._state.skipped_tasks))
+        print("Reports:", self.report_store.run_dir(self.state.token, self.state.date, self.state.run_id))
+
+        # В пакетном режиме политика хранения применяется один раз после всех токенов
+        if not self.batch:
+            self.report_store.apply_retention()
+        for tool, stats in compaction_stats().items():
+            print(f"{tool}: {stats['calls']} calls, {stats['tokens_saved']} prompt tokens saved")
+        usage = format_usage(get_usage_ledger().rows(token=self.state.token))
+        if usage:
+            print(f"\nLLM usage ({self.state.token}):\n{usage}")
+        # Сводка трассировки в пакетном режиме печатается один раз после всех токенов
+        if not self.batch:
+            print_summary()
+        return self._state.branch_timings
+
+    def _kickoff(self, task_name: str, agent, task, inputs: dict):
+        """
+        Запускает задачу в отдельном экипаже.
+
+        Отчет сохраняется в хранилище отчетов (<TOKEN>/<date>/<run_id>/) вместе
+        с отпечатком задачи: шаблон, агент, модель и входные данные. В инкрементальном
+        режиме задача пропускается, если последний отчет построен по тому же отпечатку.
+
+        Args:
+            task_name (str): Имя задачи в tasks.yaml.
+            agent (Agent): Агент задачи.
+            task (Task): Задача.
+            inputs (dict): Входные данные задачи.
+
+        Returns:
+            Any: Результат экипажа или текст сохраненного отчета.
+        """
+        # Имя файла берется из crew.py, но crewai не пишет его в общий каталог:
+        # параллельные и пакетные запуски иначе перезаписывают отчеты друг друга
+        report_name = os.path.basename(task.output_file)
+        task.output_file = None
+
+        with span("task", task=task_name) as current, usage_scope(token=self.state.token, task=task_name):
+            fingerprint = task_fingerprint(task_name, inputs, model=getattr(agent.llm, "model", None))
+            if self.incremental:
+                report = find_unchanged(self.report_store, self.state.token, task_name, fingerprint)
+                if report is not None:
+                    print(f"Входные данные {task_name} не изменились, отчет взят из предыдущего запуска")
+                    self._state.skipped_tasks.append(task_name)
+                    self._save_report(report_name, report, task_name, fingerprint)
+                    current.set(skipped=True)
+                    return report
+
+            from crewai import Crew
+
+            # Create a crew with only this agent and task
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process='sequential',
+                verbose=True,
+            )
+            result = crew.kickoff(inputs=inputs)
+            raw = getattr(result, "raw", str(result))
+            current.set(skipped=False, output_bytes=len(raw.encode("utf-8")))
+            self._save_report(report_name, raw, task_name, fingerprint)
+            return result
+
+    def _save_report(self, name: str, content: str, task_name: str, fingerprint: str) -> str:
+        path = self.report_store.write(
+            self.state.token, self.state.date, self.state.run_id, name, content,
+            task=task_name, fingerprint=fingerprint
+        )
+        print(f"Отчет сохранен: {path}")
+        return path
+
+    def _metadata_analysis(self):
         # Analyze the retrieved metadata
         print("\n", "="*23, "Metadata analysis", "="*23, "\n")
         
@@ -93,60 +350,32 @@ class WorkFlow(Flow):
         }
 
         # Get the agent and task
-        agent = self.fa_crew.researcher()
-        task = self.fa_crew.research_task()
-
-        # Create a crew with only this agent and task
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process='sequential',
-            verbose=True,
-        )
-        result = crew.kickoff(inputs=inputs)
+        agent = self._crew().researcher()
+        task = self._crew().research_task()
 
-    @listen("proceed_to_analysis")
-    def technology_analysis(self):
+        return self._kickoff("research_task", agent, task, inputs)
+
+    def _technology_analysis(self):
         # Analyze the technology
         print("\n", "="*23, "Technology analysis", "="*23, "\n")
 
-        # Извлекаем значения как строки
-        token_name = self.state.metadata.get('name', "")
-        website = self.state.metadata.get('urls', {}).get('website', "")
-        whitepaper = self.state.metadata.get('urls', {}).get('technical_doc', "")
-
-        # Если значения извлекаются как словари, берем значение по ключу 0
-        if isinstance(token_name, dict):
-            token_name = token_name.get(0, "")
-        if isinstance(website, dict):
-            website = website.get(0, [""])[0] if website.get(0) else ""
-        if isinstance(whitepaper, dict):
-            whitepaper = whitepaper.get(0, [""])[0] if whitepaper.get(0) else ""
-
+        coin = self._coin()
         inputs = {
-            "token_name": token_name,
-            "website": website,
-            "whitepaper": whitepaper,
+            "token_name": coin.name,
+            "website": coin.website,
+            "whitepaper": coin.technical_doc,
+            "search_results": self.state.prefetched["search_results"],
+            "documents": self.state.prefetched["documents"],
         }
 
         print("Inputs for technology analysis:", inputs)
         # Get the agent and task
-        agent = self.fa_crew.technology_analyst()
-        task = self.fa_crew.technology_analyst_task()
-
-        # Create a crew with only this agent and task
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process='sequential',
-            verbose=True,
-        )
+        agent = self._crew().technology_analyst()
+        task = self._crew().technology_analyst_task()
 
-        result = crew.kickoff(inputs=inputs)
-        # Add additional metadata analysis logic here
+        return self._kickoff("technology_analyst_task", agent, task, inputs)
 
-    @listen("proceed_to_analysis")
-    def tokenomics_analysis(self):
+    def _tokenomics_analysis(self):
         # Analyze the tokenomics
         print("\n", "="*23, "Tokenomics analysis", "="*23, "\n")
 
@@ -154,23 +383,17 @@ class WorkFlow(Flow):
             "token_name": self.state.name,
             'coin_symbol': self.state.token,
             'coin_metadata': self.state.metadata,
+            'tokenomic_links': self.state.prefetched["tokenomic_links"],
+            'vesting_data': self.state.prefetched["vesting_data"],
         }
 
         # Get the agent and task
-        agent = self.fa_crew.crypto_tokenomics_analyst()
-        task = self.fa_crew.crypto_tokenomics_analysis_task()
-
-        # Create a crew with only this agent and task
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process='sequential',
-            verbose=True,
-        )
-        result = crew.kickoff(inputs=inputs)
-    
-    @listen("proceed_to_analysis")
-    def fundraising_analysis(self):
+        agent = self._crew().crypto_tokenomics_analyst()
+        task = self._crew().crypto_tokenomics_analysis_task()
+
+        return self._kickoff("crypto_tokenomics_analysis_task", agent, task, inputs)
+
+    def _fundraising_analysis(self):
         # Analyze the fundraising
         print("\n", "="*23, "Fundraising analysis", "="*23, "\n")
 
@@ -178,37 +401,37 @@ class WorkFlow(Flow):
             "token_name": self.state.name,
             'coin_symbol': self.state.token,
             'coin_metadata': self.state.metadata,
+            'tokenomic_links': self.state.prefetched["tokenomic_links"],
+            'fundraising_data': self.state.prefetched["fundraising_data"],
         }
 
         # Get the agent and task
-        agent = self.fa_crew.fundraising_analyst()
-        task = self.fa_crew.fundraising_analysis_task()
-
-        # Create a crew with only this agent and task
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process='sequential',
-            verbose=True,
-        )
-        result = crew.kickoff(inputs=inputs)
+        agent = self._crew().fundraising_analyst()
+        task = self._crew().fundraising_analysis_task()
+
+        return self._kickoff("fundraising_analysis_task", agent, task, inputs)
 
 # Define the async run function
-async def run():
+async def run(token: str = None, metadata: dict = None):
     """
     Run the flow.
+
+    Args:
+        token (str): Символ токена (None - запросить ввод в потоке).
+        metadata (dict): Уже найденные метаданные токена.
     """
     # Initialize the workflow
-    workflow = WorkFlow()
+    workflow = WorkFlow(token=token, metadata=metadata, batch=False)
     # Start the workflow process
-    await workflow.kickoff()
+    with span("flow.run"):
+        await workflow.kickoff()
 
 # Define the main function to run the flow
 def main():
-    asyncio.run(run())
+    from src.crypto_crew.flow_cli import main as cli_main
+    cli_main()
 
 
 def plot_flow():
-    workflow = WorkFlow()
-    workflow.plot()
-
+    from src.crypto_crew.flow_cli import plot_flow as cli_plot_flow
+    cli_plot_flow()
@@ -0,0 +1,28 @@
+# tests/test_compaction.py
+
+import sys
+import types
+import logging
+from src.crypto_crew.tools import compaction
+
+
+def test_count_tokens_falls_back_when_encoding_cannot_load(monkeypatch, caplog):
+    calls = []
+
+    def encoding_for_model(model):
+        calls.append(model)
+        raise OSError("network is unreachable")
+
+    tiktoken = types.ModuleType("tiktoken")
+    tiktoken.encoding_for_model = encoding_for_model
+    monkeypatch.setitem(sys.modules, "tiktoken", tiktoken)
+    compaction._encoding.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger=compaction.__name__):
+            assert compaction.count_tokens("abcdefgh") == 2
+            assert compaction.count_tokens("abcdefghi") == 3
+    finally:
+        compaction._encoding.cache_clear()
+
+    assert len(calls) == 1
+    assert len([record for record in caplog.records if "tiktoken" in record.getMessage()]) == 1
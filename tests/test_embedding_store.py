@@ -0,0 +1,58 @@
+# tests/test_embedding_store.py
+
+import hashlib
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.crypto_crew.tools.embedding_store import EmbeddingStore, collection_name
+
+PAGE_A = "https://a.example.com/"
+PAGE_B = "https://b.example.com/"
+SHARED = "Shared disclaimer paragraph"
+
+
+def fake_embed(texts, model):
+    # Детерминированные векторы без обращения к API
+    return [[byte / 255 for byte in hashlib.sha256(text.encode("utf-8")).digest()[:8]] for text in texts]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(path=str(tmp_path / "db"), cache_path=str(tmp_path / "cache.sqlite3"), embed=fake_embed)
+
+
+def page_texts(store, url):
+    return {item["text"] for item in store.search("TKN", "paragraph", k=10, url=url)}
+
+
+def test_shared_chunk_is_indexed_for_each_page(store):
+    store.index("TKN", PAGE_A, [SHARED, "Only on page A"])
+    store.index("TKN", PAGE_B, [SHARED, "Only on page B"])
+    # Эмбеддинг общего фрагмента запрашивается один раз
+    assert store.stats()["misses"] == 3
+
+    assert page_texts(store, PAGE_A) == {SHARED, "Only on page A"}
+    assert page_texts(store, PAGE_B) == {SHARED, "Only on page B"}
+
+
+def test_expired_page_does_not_remove_chunks_of_other_pages(store):
+    store.index("TKN", PAGE_A, [SHARED, "Only on page A"])
+    store.index("TKN", PAGE_B, [SHARED, "Only on page B"])
+    conn = store._connect()
+    conn.execute("UPDATE sources SET indexed_at = 0 WHERE token = ? AND url = ?", (collection_name("TKN"), PAGE_A))
+    conn.commit()
+
+    assert store.compact()["pages"] == 1
+    assert page_texts(store, PAGE_B) == {SHARED, "Only on page B"}
+    assert page_texts(store, PAGE_A) == set()
+
+
+def test_reindexing_a_changed_page_removes_its_old_chunks(store):
+    store.index("TKN", PAGE_A, [SHARED, "Old paragraph"])
+    store.index("TKN", PAGE_B, [SHARED])
+    store.index("TKN", PAGE_A, [SHARED, "New paragraph"])
+
+    assert page_texts(store, PAGE_A) == {SHARED, "New paragraph"}
+    assert page_texts(store, PAGE_B) == {SHARED}
+    assert store.collection("TKN").count() == 3
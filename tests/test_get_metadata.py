@@ -0,0 +1,63 @@
+# tests/test_get_metadata.py
+
+import requests
+from src.crypto_crew.tools import get_metadata
+from src.crypto_crew.tools.get_metadata import GetCoinMetadata
+
+
+def test_failed_chunk_does_not_abort_other_chunks(monkeypatch):
+    def request_info(symbols):
+        if "ETH" in symbols:
+            raise requests.ConnectionError("connection reset")
+        return {symbol: [{"id": 1, "name": f"{symbol} coin", "symbol": symbol}] for symbol in symbols}
+
+    monkeypatch.setattr(GetCoinMetadata, "_request_info", staticmethod(request_info))
+
+    result = GetCoinMetadata.get_coin_metadata_bulk(["BTC", "ETH", "TON"], chunk_size=1)
+
+    assert result["BTC"]["name"] == "BTC coin"
+    assert result["ETH"] is None
+    assert result["TON"]["name"] == "TON coin"
+
+
+def test_failed_symbols_are_none_in_datasets(monkeypatch):
+    monkeypatch.setattr(GetCoinMetadata, "get_coin_metadata_bulk",
+                        staticmethod(lambda symbols, pick=None: {"BTC": {"name": "Bitcoin"}, "ETH": None, "XYZ": {}}))
+    monkeypatch.setattr(get_metadata, "CMC_METADATA_EXPORT", "")
+
+    datasets = GetCoinMetadata.save_datasets(["BTC", "ETH", "XYZ"])
+
+    assert datasets == {"BTC": {"name": "Bitcoin"}, "ETH": None, "XYZ": {}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.headers = {}
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+def test_rate_limited_request_is_retried_once_without_fixed_sleep(monkeypatch):
+    responses = [
+        FakeResponse(429, {"status": {"error_code": 1008, "credit_count": 0}}),
+        FakeResponse(200, {"status": {"credit_count": 1}, "data": {"BTC": [{"name": "Bitcoin"}]}}),
+    ]
+    calls = []
+
+    def request(method, url, upstream=None, **kwargs):
+        calls.append(upstream)
+        return responses.pop(0)
+
+    monkeypatch.setattr(get_metadata.http_client, "request", request)
+    monkeypatch.setattr(GetCoinMetadata, "credits_used", 0)
+
+    assert GetCoinMetadata._request_info(["BTC"]) == {"BTC": [{"name": "Bitcoin"}]}
+    assert calls == ["cmc", "cmc"]
+    assert GetCoinMetadata.credits_used == 1
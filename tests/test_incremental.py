@@ -0,0 +1,26 @@
+# tests/test_incremental.py
+
+import pytest
+
+pytest.importorskip("crewai_tools")
+
+from src.crypto_crew.incremental import task_fingerprint
+
+INPUTS = {
+    "name": "Bitcoin",
+    "token": "BTC",
+    "search_results": "1. Bitcoin consensus overview",
+    "documents": "[1] https://bitcoin.org\nPeer-to-peer electronic cash",
+}
+
+
+def test_search_results_do_not_change_the_fingerprint():
+    rerun = dict(INPUTS, search_results="1. Another article from today")
+
+    assert task_fingerprint("technology_analyst_task", INPUTS) == task_fingerprint("technology_analyst_task", rerun)
+
+
+def test_documents_change_the_fingerprint():
+    changed = dict(INPUTS, documents="[1] https://bitcoin.org\nUpdated whitepaper")
+
+    assert task_fingerprint("technology_analyst_task", INPUTS) != task_fingerprint("technology_analyst_task", changed)
@@ -0,0 +1,25 @@
+# tests/test_ingestion.py
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.crypto_crew.tools import ingestion
+from src.crypto_crew.tools.embedding_store import EmbeddingStore
+from tests.test_embedding_store import PAGE_A, PAGE_B, SHARED, fake_embed
+
+
+def test_ingest_replaces_chunks_of_a_changed_document(tmp_path, monkeypatch):
+    # ttl=-1: документ всегда считается устаревшим и индексируется заново
+    store = EmbeddingStore(path=str(tmp_path / "db"), cache_path=str(tmp_path / "cache.sqlite3"), ttl=-1,
+                           embed=fake_embed)
+    pages = {PAGE_A: [SHARED, "Old paragraph"], PAGE_B: [SHARED]}
+    monkeypatch.setattr(ingestion, "stream_text", lambda url: iter(pages[url]))
+
+    ingestion.ingest("TKN", PAGE_A, store=store, workers=2)
+    ingestion.ingest("TKN", PAGE_B, store=store, workers=2)
+    pages[PAGE_A] = [SHARED, "New paragraph"]
+    ingestion.ingest("TKN", PAGE_A, store=store, workers=2)
+
+    texts = {url: {item["text"] for item in store.search("TKN", "paragraph", k=10, url=url)} for url in pages}
+    assert texts == {PAGE_A: {f"{SHARED}\nNew paragraph"}, PAGE_B: {SHARED}}
@@ -0,0 +1,38 @@
+# tests/test_records.py
+
+import pytest
+from src.crypto_crew.tools.records import Value, parse_number
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$1.25M", 1.25e6),
+    ("45.2%", 45.2),
+    ("1,000,000 TON", 1e6),
+    ("1,5", 1.5),
+    ("350K TON", 350e3),
+    ("x12.5", 12.5),
+    ("3.5x", 3.5),
+    ("-12.3%", -12.3),
+    ("1 234 567", 1234567.0),
+    ("1\xa0234\xa0567 TON", 1234567.0),
+    ("1 234,5", 1234.5),
+    ("12.5 Million", 12.5e6),
+    ("$2 billion", 2e9),
+    ("7 thousand", 7e3),
+    ("1.2bn", 1.2e9),
+    ("150 TON", 150.0),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["", "N/A", "TBA", "Q1 2024", "1st round", "ABC123"])
+def test_parse_number_without_number(text):
+    assert parse_number(text) is None
+
+
+def test_value_keeps_text():
+    value = Value.parse("12.5 Million")
+
+    assert value.text == "12.5 Million"
+    assert value.number == pytest.approx(12.5e6)
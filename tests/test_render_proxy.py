@@ -0,0 +1,61 @@
+# tests/test_render_proxy.py
+
+import json
+import pytest
+import requests
+from src.crypto_crew.tools import render_proxy, resilience
+from src.crypto_crew.tools.render_cache import RenderCache
+from src.crypto_crew.tools.render_pool import RenderPool
+
+NODE_A = "http://node-a:8080"
+NODE_B = "http://node-b:8080"
+
+
+class FakeLimiter:
+    def acquire(self):
+        pass
+
+    def feedback(self, status, retry_after=None):
+        pass
+
+
+class FakeSession:
+    """
+    Узел A не отвечает, узел B возвращает страницу.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append(url)
+        if url == NODE_A:
+            raise requests.ConnectionError("connection refused")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"data": "<html></html>"}).encode("utf-8")
+        return response
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    pool = RenderPool([NODE_A, NODE_B], eject_failures=100, health_interval=0)
+    monkeypatch.setattr(resilience, "_callers", {})
+    monkeypatch.setattr(render_proxy, "get_render_pool", lambda: pool)
+    monkeypatch.setattr(render_proxy, "get_limiter", lambda upstream: FakeLimiter())
+    monkeypatch.setattr(render_proxy, "get_render_cache",
+                        lambda: RenderCache(path=str(tmp_path / "render.sqlite3"), enabled=False))
+    monkeypatch.setattr(resilience.ResilientCaller, "backoff", lambda self, attempt, error=None: 0)
+    return pool
+
+
+def test_failing_node_opens_only_its_own_breaker(pool):
+    session = FakeSession()
+    for _ in range(10):
+        body = render_proxy.render_page(None, {"goto": "https://example.com"}, "dropstab", "vesting",
+                                        session=session)
+        assert json.loads(body)["data"]
+
+    assert resilience.get_caller(NODE_A).breaker.state == "open"
+    assert resilience.get_caller(NODE_B).breaker.state == "closed"
+    assert resilience.get_caller("render-pool").breaker.state == "closed"
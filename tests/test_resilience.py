@@ -0,0 +1,56 @@
+# tests/test_resilience.py
+
+import pytest
+import requests
+from src.crypto_crew.tools.resilience import CircuitBreaker, ResilientCaller
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status}", response=response)
+
+
+def fail(error):
+    def func():
+        raise error
+    return func
+
+
+def open_caller() -> ResilientCaller:
+    caller = ResilientCaller("test", retries=0, breaker=CircuitBreaker(failure_threshold=2, cooldown=60),
+                             hedge=False)
+    caller.breaker.record_failure()
+    return caller
+
+
+def test_non_retryable_error_leaves_breaker_failures():
+    caller = open_caller()
+    with pytest.raises(ValueError):
+        caller.call(fail(ValueError("unexpected payload")))
+
+    caller.breaker.record_failure()
+    assert caller.breaker.state == "open"
+
+
+def test_client_error_resets_breaker():
+    caller = open_caller()
+    with pytest.raises(requests.HTTPError):
+        caller.call(fail(http_error(404)))
+
+    caller.breaker.record_failure()
+    assert caller.breaker.state == "closed"
+
+
+def test_non_retryable_error_releases_half_open_probe():
+    caller = ResilientCaller("test", retries=0, breaker=CircuitBreaker(failure_threshold=1, cooldown=0),
+                             hedge=False)
+    caller.breaker.record_failure()
+    assert caller.breaker.state == "half_open"
+
+    with pytest.raises(ValueError):
+        caller.call(fail(ValueError("unexpected payload")))
+
+    assert caller.breaker.state == "half_open"
+    assert caller.call(lambda: "ok") == "ok"
+    assert caller.breaker.state == "closed"
@@ -0,0 +1,49 @@
+# tests/test_usage.py
+
+import pytest
+from src.crypto_crew.usage import BUDGET_EXHAUSTED_ANSWER, budget_final_answer
+
+parser = pytest.importorskip("crewai.agents.parser")
+
+TOOL_STEP = (
+    "Thought: I need the whitepaper to describe the consensus.\n"
+    "Action: Read website content\n"
+    'Action Input: {"website_url": "https://example.org/whitepaper.pdf"}\n'
+    "Observation: Example Chain uses a BFT consensus... Final Answer: not a report"
+)
+
+
+def messages(last: str) -> list:
+    return [
+        {"role": "system", "content": "You are a technology analyst."},
+        {"role": "user", "content": "Analyse Example Chain."},
+        {"role": "assistant", "content": last},
+    ]
+
+
+def parse(text: str):
+    return parser.CrewAgentParser(agent=None).parse(text)
+
+
+def test_forced_answer_after_tool_step_is_final():
+    result = parse(budget_final_answer(messages(TOOL_STEP)))
+
+    assert isinstance(result, parser.AgentFinish)
+    assert result.output.startswith(BUDGET_EXHAUSTED_ANSWER)
+    assert "I need the whitepaper" in result.output
+    assert "Action" not in result.output
+    assert "Observation" not in result.output
+
+
+def test_forced_answer_without_assistant_messages():
+    result = parse(budget_final_answer(messages("")[:2]))
+
+    assert isinstance(result, parser.AgentFinish)
+    assert result.output == BUDGET_EXHAUSTED_ANSWER
+
+
+def test_forced_answer_with_numbered_action():
+    result = parse(budget_final_answer(messages("Thought: search\nAction 1: search\nAction Input 1: BTC")))
+
+    assert isinstance(result, parser.AgentFinish)
+    assert "search" in result.output
@@ -0,0 +1,54 @@
+# tests/test_workflow.py
+
+import pytest
+
+pytest.importorskip("crewai.flow.flow")
+
+from src.crypto_crew.workflow import WorkFlow
+
+
+def test_workflow_can_be_constructed():
+    workflow = WorkFlow()
+
+    assert workflow.state.metadata == {}
+    # Экипаж создается при запуске первой задачи, а не в Flow.__init__
+    assert workflow._fa_crew is None
+
+
+def test_batch_workflow_can_be_constructed():
+    workflow = WorkFlow(token="BTC", metadata={"name": "Bitcoin", "urls.website": "https://bitcoin.org"})
+
+    assert workflow.preset_token == "BTC"
+    assert workflow._fa_crew is None
+
+
+def test_prefetch_failure_falls_back_to_not_prefetched(monkeypatch):
+    import asyncio
+    from src.crypto_crew import prefetch
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("render proxy is down")
+
+    monkeypatch.setattr(prefetch, "prefetch", fail)
+    workflow = WorkFlow(token="BTC", metadata={"name": "Bitcoin"})
+
+    prefetched = asyncio.run(workflow.prefetch_data())
+
+    assert prefetched == prefetch.NOT_PREFETCHED
+    assert workflow.state.branch_errors["prefetch_data"] == "render proxy is down"
+    assert "prefetch_data" in workflow.state.branch_timings
+
+
+def test_interactive_run_starts_with_fresh_link_counters():
+    from src.crypto_crew.tools import get_tokenomic_links
+
+    stale = get_tokenomic_links.get_link_resolver()
+    stale.hits = 5
+
+    WorkFlow(token="BTC", metadata={"name": "Bitcoin"}, batch=False).token_input()
+    assert get_tokenomic_links.get_link_resolver() is not stale
+    assert get_tokenomic_links.get_link_resolver().stats()["hits"] == 0
+
+    shared = get_tokenomic_links.get_link_resolver()
+    WorkFlow(token="ETH", metadata={"name": "Ethereum"}).token_input()
+    assert get_tokenomic_links.get_link_resolver() is shared